@@ -0,0 +1,114 @@
+"""Benchmarks for the DsixTools, SMEFTsim and EOS converters.
+
+Usage:
+
+    python benchmarks/bench_converters.py [--number N] [--repeat R] [FILTER]
+
+Every benchmark is run `repeat` times with `number` calls each and the best
+time per call is reported. If `FILTER` is given, only benchmarks whose name
+contains it are run.
+"""
+
+import argparse
+import os
+import timeit
+import numpy as np
+import wcxf
+from wcxf.converters import dsixtools, smeftsim, eos
+
+
+_root = os.path.abspath(os.path.dirname(__file__))
+data_path = os.path.join(_root, '..', 'wcxf', 'data')
+
+
+def _read(filename):
+    with open(os.path.join(data_path, filename), 'r') as f:
+        return f.read()
+
+
+def random_wc(eft, basis, scale, magnitude=1e-8, seed=1):
+    """Return a WC instance with random values for every coefficient of the
+    given basis, respecting the 'real' attribute of each coefficient."""
+    rng = np.random.RandomState(seed)
+    basis_instance = wcxf.Basis[eft, basis]
+    d = {}
+    for sector in basis_instance.sectors.values():
+        for k, v in sector.items():
+            re, im = magnitude * rng.uniform(-1, 1, 2)
+            if v is not None and v.get('real', False):
+                d[k] = re
+            else:
+                d[k] = re + 1j * im
+    return wcxf.WC(eft, basis, scale, wcxf.WC.dict2values(d))
+
+
+def benchmarks():
+    """Return an ordered list of `(name, callable)` tuples."""
+    wcin_lha = _read('WCsInput-CPV-SMEFT.dat')
+    options = _read('Options.dat')
+    smin = _read('SMInput-CPV.dat')
+    wc_fixture = wcxf.WC.load(_read('WCsInput-CPV-SMEFT.json'))
+    wc_warsaw = random_wc('SMEFT', 'Warsaw', 1000)
+    wc_mass = random_wc('SMEFT', 'Warsaw mass', 1000)
+    wc_eos = random_wc('WET', 'EOS', 4.2)
+    dsix_lha = dsixtools.wcxf2dsixtools(wc_warsaw)
+    smeftio = dsixtools.SMEFTio()
+    smeftio.set_initial_wcxf(wc_warsaw)
+    C = smeftio.C_in
+    values_4f = dsixtools.matrix2lha(C['qq1'].real)
+    sm_wcs = eos.get_sm_wcs(data_path)
+
+    def smeftsim_fill(model_set):
+        def f():
+            card = smeftsim.initialize_smeftsim_card(model_set)
+            return smeftsim.smeftsim_card_fill(card, wc_mass, model_set,
+                                               1000, 'alpha')
+        return f
+
+    def smeftsim_text():
+        for model_set in ('A', 'B'):
+            for scheme in ('alpha', 'mw'):
+                smeftsim.smeftsim_card_text(model_set, scheme)
+
+    return [
+        ('dsixtools.wcxf2dsixtools fixture',
+         lambda: dsixtools.wcxf2dsixtools(wc_fixture)),
+        ('dsixtools.wcxf2dsixtools full SMEFT',
+         lambda: dsixtools.wcxf2dsixtools(wc_warsaw)),
+        ('dsixtools.dsixtools2wcxf fixture',
+         lambda: dsixtools.dsixtools2wcxf((wcin_lha, options, smin))),
+        ('dsixtools.dsixtools2wcxf full SMEFT',
+         lambda: dsixtools.dsixtools2wcxf((dsix_lha, options, smin))),
+        ('dsixtools.wc_dict2lha full SMEFT',
+         lambda: dsixtools.wc_dict2lha(C)),
+        ('dsixtools.lha2matrix 4f',
+         lambda: dsixtools.lha2matrix(values_4f, (3, 3, 3, 3))),
+        ('dsixtools.matrix2lha 4f',
+         lambda: dsixtools.matrix2lha(C['qq1'].real)),
+        ('smeftsim.smeftsim_card_fill A', smeftsim_fill('A')),
+        ('smeftsim.smeftsim_card_fill B', smeftsim_fill('B')),
+        ('smeftsim.smeftsim_card_text', smeftsim_text),
+        ('eos.get_sm_wcs', lambda: eos.get_sm_wcs(data_path)),
+        ('eos.wcxf2eos full EOS', lambda: eos.wcxf2eos(wc_eos, sm_wcs)),
+    ]
+
+
+def run(number=10, repeat=3, name_filter=None):
+    """Run all benchmarks and print the best time per call."""
+    for name, f in benchmarks():
+        if name_filter is not None and name_filter not in name:
+            continue
+        t = min(timeit.repeat(f, number=number, repeat=repeat)) / number
+        print("{:<45} {:>10.3f} ms".format(name, 1e3 * t))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the WCxf converters.")
+    parser.add_argument("FILTER", nargs='?', default=None,
+                        help="Only run benchmarks whose name contains FILTER")
+    parser.add_argument("--number", type=int, default=10,
+                        help="Number of calls per repetition (default: 10)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of repetitions (default: 3)")
+    args = parser.parse_args()
+    run(number=args.number, repeat=args.repeat, name_filter=args.FILTER)
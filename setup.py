@@ -13,6 +13,7 @@ setup(name='wcxf',
       long_description=LONG_DESCRIPTION,
       long_description_content_type='text/markdown',
       packages=find_packages(),
+      python_requires='>=3.7',
       package_data={
         'wcxf': ['data/*.yml',
                  'data/*.yaml',
@@ -22,9 +23,11 @@ setup(name='wcxf',
                 ]
       },
       install_requires=['pyyaml', 'ckmutil>=0.3.2', 'pandas',
-                        'wilson'],
+                        'numpy>=1.15', 'wilson'],
       extras_require={
             'testing': ['nose'],
+            'parquet': ['pyarrow'],
+            'msgpack': ['msgpack'],
       },
       entry_points={
         'console_scripts': [
@@ -1,7 +1,20 @@
 from .classes import *
+from .lines import iter_load, dump_many
+from .scan import peek
 from . import matchers
 from . import translators
-from wilson import util
+
+
+def __getattr__(name):
+    # `wcxf.util` is `wilson.util`, which is only imported on first access
+    if name == 'util':
+        from wilson import util
+        return util
+    # `wcxf.Ensemble` needs NumPy, which is only imported on first access
+    if name == 'Ensemble':
+        from .ensemble import Ensemble
+        return Ensemble
+    raise AttributeError("module 'wcxf' has no attribute '{}'".format(name))
 
 # read all EFTs and bases from the wcxf-bases submodule
 
@@ -1,56 +1,530 @@
 import json
 import yaml
+import importlib
 import logging
-from collections import OrderedDict, Counter
+from collections import OrderedDict, Counter, defaultdict
 import tempfile
 import shutil
 import os
+import re
 import subprocess
-from pandas import DataFrame
+import io
+import sys
+import struct
+
+# YAML loader and dumper used for WCxf files. They are based on the
+# libyaml-accelerated safe loader and dumper if available; the
+# representers and constructors below are only registered on them and do
+# not change the behaviour of PyYAML elsewhere in the process.
+try:
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
+
+
+class YAMLLoader(_SafeLoader):
+    """YAML loader for WCxf files, loading mappings as OrderedDicts."""
+
+
+class YAMLDumper(_SafeDumper):
+    """YAML dumper for WCxf files."""
+
 
 # the following is necessary to get pretty representations of
 # OrderedDict and defaultdict instances in YAML
 def _represent_dict_order(self, data):
     return self.represent_mapping('tag:yaml.org,2002:map', data.items())
-yaml.add_representer(OrderedDict, _represent_dict_order)
+YAMLDumper.add_representer(OrderedDict, _represent_dict_order)
+YAMLDumper.add_representer(defaultdict, _represent_dict_order)
+
+# NumPy scalars are represented as the corresponding Python numbers. NumPy
+# is not imported for this: if it has not been imported, there are no NumPy
+# scalars to dump.
+def _represent_other(self, data):
+    numpy = sys.modules.get('numpy')
+    if numpy is not None and isinstance(data, numpy.generic):
+        return self.represent_data(data.item())
+    return self.represent_undefined(data)
+YAMLDumper.add_multi_representer(object, _represent_other)
+
+# tuples are represented as sequences
+def _represent_tuple(self, data):
+    return self.represent_list(data)
+YAMLDumper.add_representer(tuple, _represent_tuple)
 
 # the following is necessary to have Null values be represented by
 # emptyness rather than 'null'
 def represent_none(self, _):
     return self.represent_scalar('tag:yaml.org,2002:null', '')
-yaml.add_representer(type(None), represent_none)
+YAMLDumper.add_representer(type(None), represent_none)
 
 # the following is necessary to load YAML mappings as OrderedDicts
 _mapping_tag = yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG
 def _dict_constructor(loader, node):
     return OrderedDict(loader.construct_pairs(node))
-yaml.add_constructor(_mapping_tag, _dict_constructor)
+YAMLLoader.add_constructor(_mapping_tag, _dict_constructor)
+
+# optional fast JSON libraries, in order of preference
+_fast_json_backends = ('orjson', 'simdjson', 'ujson')
+
+# the selected JSON backend (see `set_json_backend`)
+_json_backend = 'auto'
+
+# cache of imported JSON libraries (None if not installed)
+_json_modules = {'json': json}
 
-def _load_yaml_json(stream, **kwargs):
-    """Load a JSON or YAML file from a string or stream."""
+
+def _json_module(name):
+    """Return the JSON library `name`, or None if it is not installed."""
+    if name not in _json_modules:
+        try:
+            _json_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _json_modules[name] = None
+    return _json_modules[name]
+
+
+def set_json_backend(backend='auto'):
+    """Set the library used to load and dump JSON.
+
+    - 'auto' (default): load with the fastest installed library among
+      orjson, simdjson and ujson, dump with the standard library `json`
+      module (so that the output does not depend on the installed
+      libraries)
+    - 'json': load and dump with the standard library
+    - 'orjson', 'simdjson' or 'ujson': load and dump with that library.
+      simdjson has no serializer, so the standard library is used for
+      dumping. Options that are not supported by the library are handled
+      by the standard library.
+    """
+    global _json_backend
+    if backend not in ('auto', 'json') + _fast_json_backends:
+        raise ValueError("JSON backend {} unknown".format(backend))
+    if _json_module(backend if backend != 'auto' else 'json') is None:
+        raise ValueError("JSON backend {} is not installed".format(backend))
+    _json_backend = backend
+
+
+def _json_load_backend():
+    """Return the name of the library used for loading JSON."""
+    if _json_backend != 'auto':
+        return _json_backend
+    for backend in _fast_json_backends:
+        if _json_module(backend) is not None:
+            return backend
+    return 'json'
+
+
+def _json_loads(s, **kwargs):
+    """Parse a JSON string or bytes object. Keyword arguments are only
+    supported by the standard library."""
+    backend = _json_load_backend()
+    if backend != 'json' and not kwargs:
+        try:
+            return _json_modules[backend].loads(s)
+        except (ValueError, TypeError):
+            # e.g. NaN or big integers; let the standard library decide
+            pass
+    return json.loads(s, **kwargs)
+
+
+def _json_dumps_fast(d, indent=None, **kwargs):
+    """Serialize to a JSON string with the selected fast library. Returns
+    None if no fast library is selected or the arguments or data are not
+    supported by it."""
+    if kwargs:
+        return None
+    try:
+        if _json_backend == 'orjson' and indent in (None, 2):
+            orjson = _json_modules['orjson']
+            option = orjson.OPT_SERIALIZE_NUMPY
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(d, option=option).decode('utf-8')
+        elif _json_backend == 'ujson':
+            return _json_modules['ujson'].dumps(d, indent=indent or 0,
+                                                escape_forward_slashes=False)
+    except (TypeError, OverflowError):
+        pass
+    return None
+
+def _values_to_array(values, index, size):
+    """Fill the Wilson coefficient values of a WCxf `values` mapping into
+    a complex numpy array of length `size` at the positions given by the
+    dictionary `index`. The values are converted with `WC._to_number`.
+    Returns the array, an integer array with the positions of the
+    coefficients present, in the order of `values`, and a boolean array
+    that is True for the values given as Re/Im dicts."""
+    import numpy as np
+    n = len(values)
+    present = np.fromiter((index[k] for k in values), dtype=int, count=n)
+    numbers = np.fromiter((WC._to_number(v) for v in values.values()),
+                          dtype=complex, count=n)
+    is_dict = np.fromiter((isinstance(v, dict) for v in values.values()),
+                          dtype=bool, count=n)
+    array = np.zeros(size, dtype=complex)
+    array[present] = numbers
+    return array, present, is_dict
+
+
+# MessagePack serialization. Complex values are encoded as an extension
+# type with the real and imaginary parts as little-endian doubles, and the
+# names of the Wilson coefficients in `values` can be replaced by their
+# position in `Basis.all_wcs`.
+_MSGPACK_COMPLEX = 1
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("The msgpack format requires the msgpack package")
+    return msgpack
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, complex):
+        msgpack = _import_msgpack()
+        return msgpack.ExtType(_MSGPACK_COMPLEX,
+                               struct.pack('<dd', obj.real, obj.imag))
+    raise TypeError("Cannot serialize {!r}".format(obj))
+
+
+def _msgpack_ext_hook(code, data):
+    if code == _MSGPACK_COMPLEX:
+        re, im = struct.unpack('<dd', data)
+        return {'Re': re, 'Im': im}
+    return _import_msgpack().ExtType(code, data)
+
+
+def _msgpack_value(v):
+    """Return a Re/Im dict of two floats as a complex number, which is
+    encoded natively, and any other value unchanged.
+
+    Only dicts with the keys in the order 'Re', 'Im' are converted, as they
+    are loaded in this order, so that dumping the loaded file again gives
+    identical output."""
+    if (isinstance(v, dict) and list(v) == ['Re', 'Im']
+            and type(v['Re']) is float and type(v['Im']) is float):
+        return complex(v['Re'], v['Im'])
+    return v
+
+
+def _dump_msgpack(d, stream=None, **kwargs):
+    """Dump to a bytes object (if `stream` is None) or binary stream."""
+    msgpack = _import_msgpack()
+    s = msgpack.packb(d, default=_msgpack_default, use_bin_type=True, **kwargs)
+    if stream is None:
+        return s
+    if isinstance(stream, io.TextIOBase):
+        stream.flush()
+        stream = stream.buffer
+    stream.write(s)
+
+
+def _msgpack_loads(s, **kwargs):
+    """Load a msgpack bytes object, replacing the positions of Wilson
+    coefficients in `values` by their names."""
+    msgpack = _import_msgpack()
+    d = msgpack.unpackb(s, ext_hook=_msgpack_ext_hook, raw=False,
+                        strict_map_key=False, **kwargs)
+    values = d.get('values') if isinstance(d, dict) else None
+    if isinstance(values, dict) and any(isinstance(k, int) for k in values):
+        try:
+            all_wcs = Basis[d['eft'], d['basis']].all_wcs
+        except (KeyError, AttributeError):
+            raise ValueError("Basis {} of EFT {} is not defined, cannot resolve"
+                             " coefficient positions".format(d.get('basis'), d.get('eft')))
+        d['values'] = dict((all_wcs[k] if isinstance(k, int) else k, v)
+                           for k, v in values.items())
+    return d
+
+# file name extensions used to determine the format of a stream
+_extensions = {'.json': 'json', '.yml': 'yaml', '.yaml': 'yaml',
+               '.msgpack': 'msgpack'}
+
+_whitespace = re.compile(r'\s*')
+_whitespace_bytes = re.compile(br'\s*')
+
+
+def _sniff_format(s):
+    """Guess the format of a string or bytes object - the beginning of a file
+    - from its first non-whitespace character. Returns 'json' if it is '{'
+    or '[', 'yaml' if it is something else and None if there is none.
+    Bytes starting with a msgpack map header are 'msgpack'."""
+    if isinstance(s, bytes):
+        if s[:1] and (0x80 <= s[0] <= 0x8f or s[0] in (0xde, 0xdf)):
+            return 'msgpack'
+        i = _whitespace_bytes.match(s).end()
+        first = s[i:i+1].decode('ascii', 'replace')
+    else:
+        i = _whitespace.match(s).end()
+        first = s[i:i+1]
+    if not first:
+        return None
+    if first in '{[':
+        return 'json'
+    return 'yaml'
+
+
+def _stream_format(stream):
+    """Return the format of a file object determined from its file name
+    extension (ignoring a compression extension), or None."""
+    name = getattr(stream, 'name', None)
+    if not isinstance(name, str):
+        return None
+    name, ext = os.path.splitext(name)
+    if ext.lower() in _compression_extensions:
+        ext = os.path.splitext(name)[1]
+    return _extensions.get(ext.lower())
+
+
+class _PrefixedStream(object):
+    """Read-only file-like object returning `prefix` (the part of `stream`
+    that has already been read) followed by the rest of `stream`."""
+    def __init__(self, prefix, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size=-1):
+        if self.prefix:
+            if size is None or size < 0:
+                s = self.prefix + self.stream.read()
+                self.prefix = self.prefix[:0]
+            else:
+                s = self.prefix[:size]
+                self.prefix = self.prefix[size:]
+            return s
+        return self.stream.read(size)
+
+
+def _sniff_stream(stream, chunksize=1024):
+    """Read from a file object until its format can be sniffed. Returns a
+    tuple of the format and a file-like object reading from the start."""
+    prefix = stream.read(chunksize)
+    fmt = _sniff_format(prefix)
+    while fmt is None and prefix:
+        chunk = stream.read(chunksize)
+        if not chunk:
+            break
+        prefix += chunk
+        fmt = _sniff_format(prefix)
+    return fmt or 'yaml', _PrefixedStream(prefix, stream)
+
+
+# compressions: file name extensions, magic bytes at the start of the
+# compressed data and the modules implementing them
+_compression_extensions = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz',
+                           '.zst': 'zstd'}
+_compression_magic = [(b'\x1f\x8b', 'gzip'), (b'\xfd7zXZ\x00', 'xz'),
+                      (b'\x28\xb5\x2f\xfd', 'zstd')]
+_compression_modules = {'gzip': 'gzip', 'bz2': 'bz2', 'xz': 'lzma',
+                        'zstd': 'zstandard'}
+
+
+def _compression_module(compression):
+    try:
+        return importlib.import_module(_compression_modules[compression])
+    except ImportError:
+        raise ImportError("Reading and writing {} compressed files requires the"
+                          " {} package".format(compression,
+                                                _compression_modules[compression]))
+
+
+def _name_compression(name):
+    """Return the compression determined from the file name extension of
+    `name`, or None."""
+    if not isinstance(name, str):
+        return None
+    return _compression_extensions.get(os.path.splitext(name)[1].lower())
+
+
+def _sniff_compression(prefix):
+    """Return the compression determined from the magic bytes at the start
+    of the bytes object `prefix`, or None."""
+    if not isinstance(prefix, bytes):
+        return None
+    for magic, compression in _compression_magic:
+        if prefix.startswith(magic):
+            return compression
+    # bzip2: 'BZh' followed by the block size
+    if len(prefix) > 3 and prefix[:3] == b'BZh' and prefix[3:4] in b'123456789':
+        return 'bz2'
+    return None
+
+
+def _decompressing_stream(stream, compression):
+    """Return a binary file object decompressing the binary file object
+    `stream` while reading."""
+    module = _compression_module(compression)
+    if compression == 'zstd':
+        return io.BufferedReader(module.ZstdDecompressor().stream_reader(stream))
+    if compression == 'gzip':
+        return module.GzipFile(fileobj=stream, mode='rb')
+    if compression == 'bz2':
+        return module.BZ2File(stream, mode='rb')
+    return module.LZMAFile(stream, mode='rb')
+
+
+def _compressing_stream(stream, compression):
+    """Return a binary file object compressing to the binary file object
+    `stream` while writing. Closing it does not close `stream`."""
+    module = _compression_module(compression)
+    if compression == 'zstd':
+        return module.ZstdCompressor().stream_writer(stream, closefd=False)
+    if compression == 'gzip':
+        return module.GzipFile(fileobj=stream, mode='wb')
+    if compression == 'bz2':
+        return module.BZ2File(stream, mode='wb')
+    return module.LZMAFile(stream, mode='wb')
+
+
+def _peek(stream, size=6):
+    """Return the first `size` bytes (or characters) of a file object and a
+    file object reading from the start."""
+    if hasattr(stream, 'peek') and not isinstance(stream, io.TextIOBase):
+        return stream.peek(size)[:size], stream
+    prefix = stream.read(size)
+    return prefix, _PrefixedStream(prefix, stream)
+
+
+def _decompressed(stream):
+    """Return a string, bytes object or file object with the decompressed
+    content of `stream`, which can be a string, a bytes object or a file
+    object.
+
+    The compression of bytes objects and binary file objects is determined
+    from their first bytes. Text file objects are only decompressed if their
+    file name has a compression extension and nothing has been read from them
+    yet, i.e. if they have been opened with `open`."""
     if isinstance(stream, str):
+        return stream
+    if isinstance(stream, bytes):
+        compression = _sniff_compression(stream)
+        if compression is None:
+            return stream
+        return _compression_module(compression).decompress(stream)
+    if isinstance(stream, io.TextIOBase):
+        # text files opened by `open_file` are already decompressed
+        if not isinstance(getattr(stream, 'buffer', None), io.BufferedReader):
+            return stream
+        compression = _name_compression(getattr(stream, 'name', None))
+        if compression is None:
+            return stream
+        return _decompressing_stream(stream.buffer, compression)
+    prefix, stream = _peek(stream)
+    compression = _sniff_compression(prefix)
+    if compression is None:
+        return stream
+    return _decompressing_stream(stream, compression)
+
+
+def open_file(filename, mode='r'):
+    """Open a file with transparent (de)compression and return a file
+    object.
+
+    When reading, gzip, bzip2, xz and (if the `zstandard` package is
+    installed) zstd compressed files are recognized by their first bytes.
+    When writing, the compression is determined from the file name extension
+    ('.gz', '.bz2', '.xz' or '.zst'). `mode` should be 'r' or 'w' for text
+    (UTF-8) or 'rb' or 'wb' for binary file objects. The file name '-' stands
+    for standard input or output."""
+    if mode not in ('r', 'w', 'rb', 'wb'):
+        raise ValueError("Mode {} unknown: use 'r', 'w', 'rb' or 'wb'.".format(mode))
+    binary = mode.endswith('b')
+    if filename == '-':
+        std = sys.stdin if mode[0] == 'r' else sys.stdout
+        if mode[0] == 'w':
+            return std.buffer if binary else std
+        stream = _decompressed(std.buffer)
+        if stream is std.buffer and not binary:
+            return std
+    elif mode[0] == 'r':
+        stream = _decompressed(open(filename, 'rb'))
+    else:
+        compression = _name_compression(filename)
+        if compression is None:
+            stream = open(filename, 'wb')
+        else:
+            stream = _compression_module(compression).open(filename, 'wb')
+    if binary:
+        return stream
+    return io.TextIOWrapper(stream, encoding='utf-8')
+
+
+def _compressed_writer(stream):
+    """If `stream` is a text file object opened with `open` whose file name
+    has a compression extension, return a text file object compressing to
+    its binary buffer. Otherwise, return None."""
+    if not isinstance(getattr(stream, 'buffer', None), io.BufferedWriter):
+        return None
+    compression = _name_compression(getattr(stream, 'name', None))
+    if compression is None:
+        return None
+    stream.flush()
+    return io.TextIOWrapper(_compressing_stream(stream.buffer, compression),
+                            encoding='utf-8')
+
+
+def _load_yaml_json(stream, fmt=None, **kwargs):
+    """Load a JSON or YAML file from a string or stream.
+
+    If `fmt` ('json', 'yaml' or 'msgpack') is not given, the format is
+    determined from the file name extension of a stream or otherwise from
+    the first (non-whitespace) character. YAML streams are parsed while reading.
+    Input that is only guessed to be JSON from its first character but
+    cannot be parsed as JSON is parsed as YAML (e.g. a YAML flow mapping);
+    errors in input declared as JSON or named `*.json` are raised.
+    Compressed input is decompressed while reading (see `open_file`)."""
+    stream = _decompressed(stream)
+    if isinstance(stream, (str, bytes)):
         ss = stream
+        sniffed = fmt is None
+        fmt = fmt or _sniff_format(ss)
     else:
+        fmt = fmt or _stream_format(stream)
+        sniffed = fmt is None
+        if sniffed:
+            fmt, stream = _sniff_stream(stream)
+        if fmt == 'yaml':
+            return yaml.load(stream, Loader=YAMLLoader, **kwargs)
         ss = stream.read()
-    try:
-        return json.loads(ss, **kwargs)
-    except ValueError:
-        return yaml.load(ss, **kwargs)
+    if fmt == 'msgpack':
+        return _msgpack_loads(ss, **kwargs)
+    if fmt == 'json':
+        try:
+            return _json_loads(ss, **kwargs)
+        except ValueError as e:
+            if not sniffed:
+                raise
+            try:
+                return yaml.load(ss, Loader=YAMLLoader, **kwargs)
+            except yaml.YAMLError:
+                # report the error of the format that was guessed
+                raise e from None
+    return yaml.load(ss, Loader=YAMLLoader, **kwargs)
 
 def _dump_json(d, stream=None, **kwargs):
     """Dump to a JSON string (if `stream` is None) or stream."""
+    s = _json_dumps_fast(d, **kwargs)
+    if s is None:
+        if stream is not None:
+            return json.dump(d, stream, **kwargs)
+        else:
+            return json.dumps(d, **kwargs)
     if stream is not None:
-        return json.dump(d, stream, **kwargs)
+        stream.write(s)
     else:
-        return json.dumps(d, **kwargs)
+        return s
 
 def _yaml_to_json(stream_in, stream_out, **kwargs):
-    d = yaml.load(stream_in)
+    d = yaml.load(stream_in, Loader=YAMLLoader)
     return _dump_json(d, stream_out, **kwargs)
 
 def _json_to_yaml(stream_in, stream_out, **kwargs):
-    d = json.load(stream_in)
-    return yaml.dump(d, stream_out, **kwargs)
+    d = _json_loads(stream_in.read())
+    Dumper = kwargs.pop('Dumper', YAMLDumper)
+    return yaml.dump(d, stream_out, Dumper=Dumper, **kwargs)
 
 
 def _testtex(s, delete=True):
@@ -159,23 +633,43 @@ class WCxf(object):
 
     @classmethod
     def load(cls, stream, **kwargs):
-        """Load the object data from a JSON or YAML file."""
+        """Load the object data from a JSON or YAML file.
+
+        `stream` can be a string, bytes or a file-like object. The format is
+        detected automatically unless specified as `fmt='json'`,
+        `fmt='yaml'` or `fmt='msgpack'`."""
         wcxf = _load_yaml_json(stream, **kwargs)
         return cls(**wcxf)
 
+    def _public_dict(self):
+        """Return a dictionary with the data to be dumped."""
+        return {k: v for k,v in self.__dict__.items() if k[0] != '_'}
+
     def dump(self, stream=None, fmt='json', **kwargs):
-        """Dump the object data to a JSON or YAML file.
+        """Dump the object data to a JSON, YAML or msgpack file.
 
         Optional arguments:
 
-        - `stream`: if None (default), return a string. Otherwise,
-          should be a writable file-like object
-        - `fmt`: format, should be 'json' (default) or 'yaml'
+        - `stream`: if None (default), return a string (bytes for
+          msgpack). Otherwise, should be a writable file-like object
+        - `fmt`: format, should be 'json' (default), 'yaml' or 'msgpack'
 
-        Additional keyword arguments will be passed to the `json.dump(s)`
-        or `yaml.dump` methods.
+        Additional keyword arguments will be passed to the `json.dump(s)`,
+        `yaml.dump` or `msgpack.packb` methods. The JSON library can be
+        chosen with `set_json_backend`. If `stream` is a text file whose name ends with
+        '.gz', '.bz2', '.xz' or '.zst', the output is compressed accordingly
+        (see also `open_file`).
         """
-        d = {k: v for k,v in self.__dict__.items() if k[0] != '_'}
+        compressed = _compressed_writer(stream)
+        if compressed is not None:
+            try:
+                return self.dump(compressed, fmt=fmt, **kwargs)
+            finally:
+                compressed.close()
+                stream.flush()
+        if fmt.lower() == 'msgpack':
+            return _dump_msgpack(self._msgpack_dict(), stream=stream, **kwargs)
+        d = self._public_dict()
         if fmt.lower() == 'json':
             # set indent=2 unless specified otherwise
             indent = kwargs.pop('indent', 2)
@@ -185,11 +679,18 @@ class WCxf(object):
         elif fmt.lower() == 'yaml':
             # set default_flow_style=False unless specified otherwise
             default_flow_style = kwargs.pop('default_flow_style', False)
+            Dumper = kwargs.pop('Dumper', YAMLDumper)
             return yaml.dump(d, stream,
+                             Dumper=Dumper,
                              default_flow_style=default_flow_style,
                             **kwargs)
         else:
-            raise ValueError("Format {} unknown: use 'json' or 'yaml'.".format(fmt))
+            raise ValueError("Format {} unknown: use 'json', 'yaml' or 'msgpack'."
+                             .format(fmt))
+
+    def _msgpack_dict(self):
+        """Return a dictionary with the data to be dumped as msgpack."""
+        return self._public_dict()
 
 class EFT(WCxf, NamedInstanceClass):
     """Class representing EFT files."""
@@ -209,7 +710,7 @@ class EFT(WCxf, NamedInstanceClass):
     @property
     def known_translators(self):
         """Return a list of known translators between bases of this EFT."""
-        return tuple(t for t in Translator.instances if t[0] == self.eft)
+        return tuple(t for t in Translator.all_instances() if t[0] == self.eft)
 
 
 class Basis(WCxf, NamedInstanceClass):
@@ -230,14 +731,16 @@ class Basis(WCxf, NamedInstanceClass):
         else:
             self.sectors = sectors
         self._all_wcs = None
+        self._wc_index = None
 
     @property
     def known_translators(self):
         """Return a list of known translators to and from this basis."""
         kt = {}
-        kt['from'] = tuple(t for t in Translator.instances
+        instances = Translator.all_instances()
+        kt['from'] = tuple(t for t in instances
                            if t[0] == self.eft and t[1] == self.basis)
-        kt['to'] = tuple(t for t in Translator.instances
+        kt['to'] = tuple(t for t in instances
                          if t[0] == self.eft and t[2] == self.basis)
         return kt
 
@@ -248,6 +751,14 @@ class Basis(WCxf, NamedInstanceClass):
             self._all_wcs = [wc for sector, wcs in self.sectors.items() for wc in wcs]
         return self._all_wcs
 
+    @property
+    def wc_index(self):
+        """Return a dictionary mapping the Wilson coefficient names to their
+        position in `all_wcs`."""
+        if self._wc_index is None:
+            self._wc_index = {wc: i for i, wc in enumerate(self.all_wcs)}
+        return self._wc_index
+
     def validate(self):
         """Validate the basis file."""
         try:
@@ -326,10 +837,128 @@ class WC(WCxf):
         self.values = values
         self._dict = None
         self._df = None
+        # for instances created from an array: the names of the coefficients
+        # the array is aligned with, the positions of the ones present and,
+        # if loaded from a file, which ones were given as Re/Im dicts
+        self._keys = None
+        self._array = None
+        self._present = None
+        self._is_dict = None
         super().__init__()
         for k, v in kwargs.items():
             setattr(self, k, v)
 
+    def __getattr__(self, name):
+        # for instances created from an array, `values` is only built
+        # when it is accessed for the first time
+        if name == 'values' and self.__dict__.get('_array') is not None:
+            self.values = self.dict2values(self.dict)
+            return self.values
+        raise AttributeError("'{}' object has no attribute '{}'"
+                             .format(self.__class__.__name__, name))
+
+    def _public_dict(self):
+        d = {'eft': self.eft, 'basis': self.basis, 'scale': self.scale,
+             'values': self.values}
+        d.update(super()._public_dict())
+        return d
+
+    def _msgpack_dict(self):
+        # coefficient names are replaced by their position in the basis,
+        # complex values are encoded natively
+        d = self._public_dict()
+        try:
+            index = Basis[self.eft, self.basis].wc_index
+        except (AttributeError, KeyError):
+            index = {}
+        d['values'] = OrderedDict((index.get(k, k), _msgpack_value(v))
+                                  for k, v in self.values.items())
+        return d
+
+    def _basis_keys(self):
+        """Return the list of all coefficients of the basis, or of the
+        coefficients present if the basis is not defined."""
+        try:
+            return Basis[self.eft, self.basis].all_wcs
+        except (AttributeError, KeyError):
+            return list(self.values)
+
+    @classmethod
+    def load(cls, stream, array=False, **kwargs):
+        """Load the Wilson coefficient file from a JSON or YAML file.
+
+        If `array` is True, the values are parsed directly into a complex
+        array aligned with the coefficients of the basis (see `to_array`);
+        `dict` and `values` are only built from it when they are accessed.
+        See `WCxf.load` for the other arguments."""
+        return cls._from_dict(_load_yaml_json(stream, **kwargs), array=array)
+
+    @classmethod
+    def _from_dict(cls, d, array=False):
+        """Create an instance from a dictionary as loaded from a file."""
+        if not array:
+            return cls(**d)
+        d = d.copy()
+        values = d.pop('values')
+        wc = cls(values=None, **d)
+        del wc.values
+        try:
+            keys = Basis[wc.eft, wc.basis].all_wcs
+            index = Basis[wc.eft, wc.basis].wc_index
+        except (AttributeError, KeyError):
+            keys = list(values)
+            index = {k: i for i, k in enumerate(keys)}
+        unknown = [k for k in values if k not in index]
+        if unknown:
+            # keep coefficients not defined in the basis after the others
+            keys = keys + unknown
+            index = {k: i for i, k in enumerate(keys)}
+        wc._keys = keys
+        wc._array, wc._present, wc._is_dict = _values_to_array(values, index,
+                                                               len(keys))
+        return wc
+
+    @classmethod
+    def from_array(cls, eft, basis, scale, array, keys=None, **kwargs):
+        """Create a WC instance from a complex array of values of the
+        coefficients `keys` (default: all coefficients of the basis, as
+        returned by `to_array`). Only non-zero coefficients are present
+        in `values`. The array is used without copying it."""
+        import numpy as np
+        wc = cls(eft, basis, scale, None, **kwargs)
+        del wc.values
+        if keys is None:
+            keys = Basis[eft, basis].all_wcs
+        array = np.asarray(array, dtype=complex)
+        if array.shape != (len(keys),):
+            raise ValueError("Array of shape {} does not match {} keys"
+                             .format(array.shape, len(keys)))
+        wc._keys = list(keys)
+        wc._array = array
+        wc._present = np.flatnonzero(array)
+        return wc
+
+    def to_array(self, keys=None):
+        """Return a complex numpy array of the values of the coefficients
+        `keys`, which default to all coefficients of the basis in the order
+        of `Basis.all_wcs` (or to the coefficients present if the basis is not
+        defined). Coefficients that are not present are zero.
+
+        For instances loaded with `array=True` or created with `from_array`,
+        the default array is the one holding the values and must not be
+        modified."""
+        import numpy as np
+        if self._array is not None:
+            if keys is None or keys is self._keys:
+                return self._array
+            index = {k: i for i, k in enumerate(self._keys)}
+            pos = np.array([index.get(k, -1) for k in keys], dtype=int)
+            return np.where(pos >= 0, self._array[pos], 0)
+        if keys is None:
+            keys = self._basis_keys()
+        d = self.dict
+        return np.array([d.get(k, 0) for k in keys], dtype=complex)
+
     @staticmethod
     def _to_number(v):
         """Turn a Wilson coefficient value - that could be a number or a Re/Im
@@ -377,7 +1006,19 @@ class WC(WCxf):
         """Return a dictionary with the Wilson coefficient values.
         The dictionary will be cached when called for the first time."""
         if self._dict is None:
-            self._dict = {k: self._to_number(v) for k, v in self.values.items()}
+            if self._array is not None:
+                keys = self._keys
+                values = self._array[self._present]
+                is_real = values.imag == 0
+                if self._is_dict is not None:
+                    # Re/Im dicts are complex numbers, as for `array=False`
+                    is_real &= ~self._is_dict
+                is_real = is_real.tolist()
+                self._dict = {keys[i]: v.real if r else v
+                              for i, v, r in zip(self._present.tolist(),
+                                                 values.tolist(), is_real)}
+            else:
+                self._dict = {k: self._to_number(v) for k, v in self.values.items()}
         return self._dict
 
     @property
@@ -386,10 +1027,11 @@ class WC(WCxf):
         split by real and imaginary part.
         The DataFrame will be cached when called for the first time."""
         if self._df is None:
-            re = [self.dict[k].real for k in self.values]
-            im = [self.dict[k].imag for k in self.values]
-            self._df = DataFrame({'Re': re, 'Im': im},
-                                 index=self.values,
+            from pandas import DataFrame
+            keys = list(self.dict)
+            values = self.to_array(keys)
+            self._df = DataFrame({'Re': values.real, 'Im': values.imag},
+                                 index=keys,
                                  columns=('Re', 'Im'))
         return self._df
 
@@ -469,6 +1111,20 @@ class WC(WCxf):
         return matcher.match(self, parameters=parameters)
 
 
+def _load_translators(key=None):
+    """Import the modules providing the translator `key`, or all translators
+    if `key` is None (only done on demand)."""
+    from . import translators
+    translators.load(key)
+
+
+def _load_matchers(key=None):
+    """Import the modules providing the matcher `key`, or all matchers if
+    `key` is None (only done on demand)."""
+    from . import matchers
+    matchers.load(key)
+
+
 class Translator(NamedInstanceClass):
     """Class for translating between different bases of the same EFT."""
     def __init__(self, eft, from_basis, to_basis, function):
@@ -479,6 +1135,24 @@ class Translator(NamedInstanceClass):
         self.to_basis = to_basis
         self.function = function
 
+    @classmethod
+    def get_instance(cls, _name):
+        try:
+            return super().get_instance(_name)
+        except (KeyError, AttributeError):
+            # the translator might be provided by a package not imported yet
+            _load_translators(_name)
+            return super().get_instance(_name)
+
+    @classmethod
+    def all_instances(cls):
+        """Return the dictionary of all translator instances, including the
+        ones provided by packages not imported yet."""
+        _load_translators()
+        if not hasattr(cls, 'instances'):
+            cls.instances = OrderedDict()
+        return cls.instances
+
     def translate(self, WC_in, parameters=None, sectors=None):
         r"""Translate a WC object from `from_basis` to `to_basis`.
 
@@ -511,6 +1185,24 @@ class Matcher(NamedInstanceClass):
         self.to_basis = to_basis
         self.function = function
 
+    @classmethod
+    def get_instance(cls, _name):
+        try:
+            return super().get_instance(_name)
+        except (KeyError, AttributeError):
+            # the matcher might be provided by a package not imported yet
+            _load_matchers(_name)
+            return super().get_instance(_name)
+
+    @classmethod
+    def all_instances(cls):
+        """Return the dictionary of all matcher instances, including the
+        ones provided by packages not imported yet."""
+        _load_matchers()
+        if not hasattr(cls, 'instances'):
+            cls.instances = OrderedDict()
+        return cls.instances
+
     def match(self, WC_in, parameters=None):
         """Translate a WC object in EFT `from_eft` and basis `from_basis`
         to EFT `to_eft` and basis `to_basis`."""
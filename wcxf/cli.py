@@ -1,10 +1,31 @@
 import argparse
+import atexit
 import wcxf
 import sys
 import logging
 import os
+import glob
+import json
 import yaml
-import pylha
+
+
+class FileType(object):
+    """Factory for file object arguments like `argparse.FileType`, with
+    transparent (de)compression of gzip, bzip2, xz and zstd files (see
+    `wcxf.open_file`). Files opened for writing are closed at exit, which
+    finishes their compressed stream."""
+
+    def __init__(self, mode='r'):
+        self.mode = mode
+
+    def __call__(self, string):
+        try:
+            f = wcxf.open_file(string, self.mode)
+        except (OSError, ImportError) as e:
+            raise argparse.ArgumentTypeError("can't open '{}': {}".format(string, e))
+        if self.mode[0] == 'w' and string != '-':
+            atexit.register(f.close)
+        return f
 
 
 def wcxf_cli():
@@ -18,13 +39,16 @@ def wcxf_cli():
                                            help="convert between YAML and JSON formats")
     parser_convert.add_argument("FORMAT", type=str,
                                 help="Output format (should be yaml or json)")
-    parser_convert.add_argument("FILE", nargs='?', type=argparse.FileType('r'),
+    parser_convert.add_argument("FILE", nargs='?', type=FileType('r'),
                                 default=sys.stdin,
                                 help="Input file. If \"-\", read from standard input")
     parser_convert.add_argument("--output", nargs='?',
-                                      type=argparse.FileType('w'),
+                                      type=FileType('w'),
                                       default=sys.stdout,
                                       help="Output file. If absent, print to standard output")
+    parser_convert.add_argument("--json-backend", type=str, default='auto',
+                                choices=['auto', 'json', 'orjson', 'simdjson', 'ujson'],
+                                help="JSON library: auto (default), json, orjson, simdjson or ujson")
     parser_convert.set_defaults(func=convert)
 
     # translate
@@ -34,15 +58,17 @@ def wcxf_cli():
                                              help="Translate between different bases")
     parser_translate.add_argument("BASIS", help="Output basis", type=str)
     parser_translate.add_argument("FILE", nargs='?',
-                                  type=argparse.FileType('r'),
+                                  type=FileType('r'),
                                   default=sys.stdin,
                                   help="Input file. If \"-\", read from standard input")
     parser_translate.add_argument("--output", nargs='?',
-                                  type=argparse.FileType('w'), default=sys.stdout,
+                                  type=FileType('w'), default=sys.stdout,
                                   help="Output file. If absent, print to standard output")
     parser_translate.add_argument("--format", type=str,
                                   default="json",
                                   help="Output format (default: json)")
+    parser_translate.add_argument("--lines", action='store_true',
+                                  help="Input and output contain one WCxf file per line (WCxf-lines format)")
     parser_translate.set_defaults(func=translate)
 
     # match
@@ -53,13 +79,15 @@ def wcxf_cli():
     parser_match.add_argument("EFT", help="Output EFT", type=str)
     parser_match.add_argument("BASIS", help="Output basis", type=str)
     parser_match.add_argument("FILE", nargs='?',
-                              type=argparse.FileType('r'), default=sys.stdin,
+                              type=FileType('r'), default=sys.stdin,
                               help="Input file. If \"-\", read from standard input")
     parser_match.add_argument("--output", nargs='?',
-                              type=argparse.FileType('w'), default=sys.stdout,
+                              type=FileType('w'), default=sys.stdout,
                               help="Output file. If absent, print to standard output")
     parser_match.add_argument("--format", type=str, default="json",
                               help="Output format (default: json)")
+    parser_match.add_argument("--lines", action='store_true',
+                              help="Input and output contain one WCxf file per line (WCxf-lines format)")
     parser_match.set_defaults(func=match)
 
     # validate
@@ -70,10 +98,27 @@ def wcxf_cli():
     parser_validate.add_argument("TYPE", type=str,
                                        help="Type of file to validate: should be 'eft', 'basis', or 'wc'")
     parser_validate.add_argument("FILE", nargs='?',
-                                 type=argparse.FileType('r'), default=sys.stdin,
+                                 type=FileType('r'), default=sys.stdin,
                                  help="Input file. If \"-\", read from standard input")
+    parser_validate.add_argument("--lines", action='store_true',
+                                 help="Input contains one Wilson coefficient file per line (WCxf-lines format)")
     parser_validate.set_defaults(func=validate)
 
+    # doctor
+
+    parser_doctor = subparsers.add_parser('doctor',
+                                          description="Command line script for diagnostics of the wcxf installation.",
+                                          help="Diagnose the installation")
+    parser_doctor.add_argument("--startup", action='store_true',
+                               help="Measure time and memory of `import wcxf`")
+    parser_doctor.add_argument("--command", type=str, default=None,
+                               help="Only suggest avoidable parts of the start-up for this subcommand")
+    parser_doctor.add_argument("--no-memory", action='store_true',
+                               help="Do not measure memory (faster)")
+    parser_doctor.add_argument("--json", action='store_true',
+                               help="Print the start-up profile as JSON")
+    parser_doctor.set_defaults(func=doctor)
+
     args = parser.parse_args()
     try:
         args.func(args)
@@ -83,6 +128,12 @@ def wcxf_cli():
 
 def convert(args):
     from wcxf.converters.yamljson import convert_json, convert_yaml
+    try:
+        wcxf.set_json_backend(args.json_backend)
+    except ValueError as e:
+        # library not installed
+        logging.error(str(e))
+        return 1
     if args.FORMAT.lower() == 'json':
         convert_json(args.FILE, args.output)
     if args.FORMAT.lower() == 'yaml':
@@ -90,19 +141,42 @@ def convert(args):
 
 
 def translate(args):
+    if args.lines:
+        wcs_out = (wc.translate(args.BASIS) for wc in wcxf.iter_load(args.FILE))
+        wcxf.dump_many(wcs_out, stream=args.output)
+        return
     wc_in = wcxf.WC.load(args.FILE)
     wc_out = wc_in.translate(args.BASIS)
     wc_out.dump(stream=args.output, fmt=args.format)
 
 
 def match(args):
+    if args.lines:
+        wcs_out = (wc.match(args.EFT, args.BASIS) for wc in wcxf.iter_load(args.FILE))
+        wcxf.dump_many(wcs_out, stream=args.output)
+        return
     wc_in = wcxf.WC.load(args.FILE)
     wc_out = wc_in.match(args.EFT, args.BASIS)
     wc_out.dump(stream=args.output, fmt=args.format)
 
 
 def validate(args):
-    if args.TYPE == 'eft':
+    if args.lines:
+        if args.TYPE != 'wc':
+            logging.error("--lines can only be used with TYPE 'wc'")
+            return 1
+        try:
+            for i, wc in enumerate(wcxf.iter_load(args.FILE)):
+                try:
+                    wc.validate()
+                except (ValueError, AssertionError) as e:
+                    logging.error("Wilson coefficient file {}: {}".format(i + 1, e))
+                    return 1
+        except ValueError as e:
+            # malformed line, the message starts with its number
+            logging.error("Invalid WCxf-lines input: {}".format(e))
+            return 1
+    elif args.TYPE == 'eft':
         eft = wcxf.EFT.load(args.FILE)
     elif args.TYPE == 'basis':
         basis = wcxf.Basis.load(args.FILE)
@@ -117,16 +191,34 @@ def validate(args):
     return 0
 
 
+def doctor(args):
+    from wcxf import doctor
+    if not args.startup:
+        logging.error("No diagnostics selected: use --startup")
+        return 1
+    if args.command is not None and args.command not in doctor.REQUIREMENTS:
+        logging.error("--command should be one of {}".format(', '.join(doctor.REQUIREMENTS)))
+        return 1
+    profile = doctor.profile_startup(memory=not args.no_memory)
+    if args.json:
+        json.dump(profile, sys.stdout, indent=2)
+        print()
+    else:
+        commands = [args.command] if args.command is not None else None
+        print(doctor.startup_report(profile, commands=commands), end='')
+    return 0
+
+
 def eos():
     from wcxf.converters.eos import wcxf2eos, get_sm_wcs
     parser = argparse.ArgumentParser(description="""Command line script to convert a WCxf file to an EOS Wilson coefficient parameter file.""",
                                      formatter_class=argparse.RawTextHelpFormatter)
     parser.add_argument("FILE", nargs='?', help="Input file. If \"-\", read from standard input",
-                        type=argparse.FileType('r'), default=sys.stdin)
+                        type=FileType('r'), default=sys.stdin)
     parser.add_argument("--eosprefix", help="Installation prefix for the EOS installation. Defaults to /usr",
                         default='/usr')
     parser.add_argument("--output", nargs='?', help="Output file. If absent, print to standard output",
-                        type=argparse.FileType('w'), default=sys.stdout)
+                        type=FileType('w'), default=sys.stdout)
     parser.add_argument("--eoshome", help="EOS home directory. If specified, values will be written to EOSHOME/parameters/wcxf.yaml. Cannot be used simultaneously with output",
                         default=None)
     args = parser.parse_args()
@@ -149,17 +241,18 @@ def eos():
     sm_wc_dict = get_sm_wcs(os.path.join(args.eosprefix, 'share/eos', 'parameters'))
     # convert to EOS parameters
     eos_dict = wcxf2eos(wc, sm_wc_dict)
-    yaml.dump(eos_dict, f, default_flow_style=False)
+    yaml.dump(eos_dict, f, Dumper=wcxf.classes.YAMLDumper, default_flow_style=False)
     f.close()
     return 0
 
 
 def smeftsim():
+    import pylha
     from wcxf.converters.smeftsim import initialize_smeftsim_card, smeftsim_card_fill, smeftsim_card_text
     parser = argparse.ArgumentParser(description="""Command line script to convert a WCxf file to a MadGraph param_card file for SMEFTsim.""",
                                      formatter_class=argparse.RawTextHelpFormatter)
     parser.add_argument("FILE", nargs='?', help="Input file. Must be specified.",
-                        type=argparse.FileType('r'), default="{}")
+                        type=FileType('r'), default="{}")
     parser.add_argument("--output", nargs='?', help="Output file. Default is wcxf2smeftsim_param_card.dat.", default="wcxf2smeftsim_param_card.dat")
     parser.add_argument("--input-scheme", nargs='?', help="Input parameters set. Can be either alpha (alpha_ew, m_Z, G_F) or mw (m_W, m_Z, G_F). Default is alpha.", choices=['alpha','mw'], default='alpha')
     parser.add_argument("--cutoff-scale", nargs='?', help="Value of the EFT cutoff scale in GeV. Default is 1 TeV.", type=float, default=1000)
@@ -182,7 +275,7 @@ Press 'i' to ignore this warning or any other key to exit.''')
       key = input()
       if key != 'i' and key != 'I': quit()
 
-    f = open(args.output, 'w')
+    f = wcxf.open_file(args.output, 'w')
 
     # initialize and fill the dictionary for the param_card
     card = initialize_smeftsim_card(args.model_set)
@@ -196,29 +289,131 @@ Press 'i' to ignore this warning or any other key to exit.''')
     return 0
 
 
+def _expand_paths(paths):
+    """Iterate over file names, replacing directories by the files they
+    contain and glob patterns by the matching files."""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                filename = os.path.join(path, name)
+                if os.path.isfile(filename):
+                    yield filename
+        elif not os.path.exists(path) and glob.has_magic(path):
+            for filename in sorted(glob.glob(path)):
+                yield filename
+        else:
+            yield path
+
+
+def _open_files(parser, paths):
+    """Open input files for reading, exiting with an error message if this
+    fails."""
+    try:
+        return [FileType('r')(path) for path in paths]
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+
+def _jobs(string):
+    """Type of the `--jobs` argument: a non-negative integer."""
+    try:
+        n = int(string)
+    except ValueError:
+        n = -1
+    if n < 0:
+        raise argparse.ArgumentTypeError(
+            "invalid number of jobs: '{}' (must be 0 or a positive integer)".format(string))
+    return n
+
+
+def _add_batch_arguments(parser):
+    parser.add_argument("--jobs", type=_jobs, default=1,
+                        help="Number of worker processes for batch conversion (default: 1, 0: one per CPU)")
+    parser.add_argument("--unordered", action='store_true',
+                        help="In batch conversion, return results as soon as they are available instead of in the order of the input")
+
+
+def _batch_results(results, errors):
+    """Iterate over the successful results of a batch conversion, logging
+    the errors and appending them to the list `errors`."""
+    for label, result, error in results:
+        if error is not None:
+            if not isinstance(label, str):
+                label = 'Wilson coefficient file {}'.format(label + 1)
+            logging.error("{}: {}".format(label, error))
+            errors.append(error)
+        else:
+            yield result
+
+
 def wcxf2dsixtools():
     from wcxf.converters import dsixtools
-    parser = argparse.ArgumentParser(description="""Command line script to convert a WCxf file to a DsixTools Wilson coefficient file.""",
+    parser = argparse.ArgumentParser(description="""Command line script to convert a WCxf file to a DsixTools Wilson coefficient file.
+
+With --outdir, many files (or directories and glob patterns) are converted
+to one DsixTools file each.""",
                                      formatter_class=argparse.RawTextHelpFormatter)
-    parser.add_argument("FILE", nargs='?', help="Input file. If \"-\", read from standard input",
-                        type=argparse.FileType('r'), default=sys.stdin)
+    parser.add_argument("FILE", nargs='*', help="Input file(s). If \"-\", read from standard input",
+                        default=['-'])
     parser.add_argument("--output", nargs='?', help="Output file. If absent, print to standard output",
-                        type=argparse.FileType('w'), default=sys.stdout)
+                        type=FileType('w'), default=sys.stdout)
+    parser.add_argument("--outdir", help="Output directory for batch conversion")
+    parser.add_argument("--lines", action='store_true',
+                        help="Input contains one WCxf file per line (WCxf-lines format); requires --outdir")
+    _add_batch_arguments(parser)
     args = parser.parse_args()
-    wc = wcxf.WC.load(args.FILE)
-    wc.validate()
-    dsixtools.wcxf2dsixtools(wc, stream=args.output)
-    return 0
+    if args.outdir is None:
+        if len(args.FILE) > 1 or args.lines:
+            parser.error("several input files and --lines require --outdir")
+        if args.jobs != 1 or args.unordered:
+            parser.error("--jobs and --unordered require --outdir")
+        wc = wcxf.WC.load(_open_files(parser, args.FILE)[0])
+        wc.validate()
+        dsixtools.wcxf2dsixtools(wc, stream=args.output)
+        return 0
+    if args.output is not sys.stdout:
+        parser.error("--output cannot be used with --outdir")
+    if args.lines:
+        inputs = (wc for f in _open_files(parser, args.FILE)
+                  for wc in wcxf.iter_load(f))
+    else:
+        inputs = _expand_paths(args.FILE)
+    results = dsixtools.wcxf2dsixtools_batch(inputs, args.outdir,
+                                             jobs=args.jobs or None,
+                                             ordered=not args.unordered)
+    errors = []
+    for _ in _batch_results(results, errors):
+        pass
+    return 1 if errors else 0
 
 
 def dsixtools2wcxf():
     from wcxf.converters import dsixtools
-    parser = argparse.ArgumentParser(description="""Command line script to convert DsixTools output files to a WCxf file.""",
+    parser = argparse.ArgumentParser(description="""Command line script to convert DsixTools output files to a WCxf file.
+
+With --batch, each input file (or each file in a directory or matching a
+glob pattern) is converted separately together with the --common files, and
+the results are written in the WCxf-lines format.""",
                                      formatter_class=argparse.RawTextHelpFormatter)
-    parser.add_argument("FILE", nargs='+', help="Input file(s).",
-                        type=argparse.FileType('r'), default=sys.stdin)
+    parser.add_argument("FILE", nargs='+', help="Input file(s).")
     parser.add_argument("--output", nargs='?', help="Output file. If absent, print to standard output",
-                        type=argparse.FileType('w'), default=sys.stdout)
+                        type=FileType('w'), default=sys.stdout)
+    parser.add_argument("--batch", action='store_true',
+                        help="Convert each input file separately")
+    parser.add_argument("--common", action='append', default=[],
+                        help="In batch conversion, a file needed for all points, e.g. the\noptions or SM input file (can be repeated)")
+    _add_batch_arguments(parser)
     args = parser.parse_args()
-    dsixtools.dsixtools2wcxf(tuple(f for f in args.FILE), stream=args.output)
-    return 0
+    if not args.batch:
+        if args.jobs != 1 or args.unordered:
+            parser.error("--jobs and --unordered require --batch")
+        files = _open_files(parser, args.FILE + args.common)
+        dsixtools.dsixtools2wcxf(tuple(files), stream=args.output)
+        return 0
+    results = dsixtools.dsixtools2wcxf_batch(_expand_paths(args.FILE),
+                                             common=_open_files(parser, args.common),
+                                             jobs=args.jobs or None,
+                                             ordered=not args.unordered)
+    errors = []
+    wcxf.dump_many(_batch_results(results, errors), stream=args.output)
+    return 1 if errors else 0
@@ -1,5 +1,8 @@
 import numpy as np
-from collections import OrderedDict, defaultdict
+import os
+import multiprocessing
+from collections import OrderedDict
+from itertools import chain
 import pylha
 import json
 import yaml
@@ -7,6 +10,7 @@ from math import sqrt
 import ckmutil
 from wilson.util import smeftutil
 from . import dsixtools_definitions as definitions
+from wcxf.classes import YAMLLoader
 import wilson
 
 
@@ -21,7 +25,7 @@ def load(stream, fmt='lha'):
         else:
             return json.load(stream)
     elif fmt == 'yaml':
-        return yaml.load(stream)
+        return yaml.load(stream, Loader=YAMLLoader)
 
 def lha2matrix(values, shape):
     """Return a matrix given a list of values of the form
@@ -30,17 +34,19 @@ def lha2matrix(values, shape):
     `shape` is the shape of the final matrix. All elements not provided
     will be assumed to be zero. Also works for higher-rank tensors."""
     M = np.zeros(shape)
-    for v in values:
-        M[tuple([int(i-1) for i in v[:-1]])] = v[-1]
+    if len(values) == 0:
+        return M
+    values = np.asarray(values, dtype=float).reshape(len(values), len(shape) + 1)
+    # 1-based indices as one index array per axis
+    indices = values[:, :-1].astype(int) - 1
+    M[tuple(indices.T)] = values[:, -1]
     return M
 
 def matrix2lha(M):
     """Inverse function to lha2matrix: return a LHA-like list given a tensor."""
-    l = []
-    ind = np.indices(M.shape).reshape(M.ndim, M.size).T
-    for i in ind:
-        l.append([j+1 for j in i] + [M[tuple(i)]])
-    return l
+    M = np.asarray(M)
+    ind = np.indices(M.shape).reshape(M.ndim, M.size).T + 1
+    return [i + [v] for i, v in zip(ind.tolist(), M.ravel().tolist())]
 
 def sm_lha2dict(lha):
     """Convert a dictionary returned by pylha from a DSixTools SM input file
@@ -144,62 +150,344 @@ def wc_lha2dict(lha):
             pass
     return C
 
+def _lha_values(C, shape, indices=None, flags=None):
+    """Return a LHA-like list of elements of the flattened real array `C`
+    of a tensor of shape `shape`: either the elements at the flat indices
+    `indices`, or the non-zero elements selected by the flat boolean array
+    `flags`. In the latter case, the work is proportional to the number of
+    non-zero elements."""
+    if indices is None:
+        indices = C.nonzero()[0]
+        indices = indices[flags[indices]]
+    if not len(indices):
+        return []
+    values = C[indices]
+    ind = np.array(np.unravel_index(indices, shape)).T + 1
+    return [i + [v] for i, v in zip(ind.tolist(), values.tolist())]
+
+def _wc_lha_blocks(wc, skip_redundant=True, skip_zero=True):
+    """Iterate over the names and LHA-like lists of values of the non-empty
+    blocks of a DSixTools WC output file for the dictionary of Wilson
+    coefficients `wc`."""
+    blocks = OrderedDict()
+    for name, (block, i) in WC_dict_0f.items():
+        if wc[name] != 0:
+            blocks.setdefault(block, []).append([i, wc[name].real])
+    for block, values in blocks.items():
+        yield block, values
+    for name in smeftutil.WC_keys_2f + smeftutil.WC_keys_4f:
+        C = np.asarray(wc[name])
+        if skip_zero and not C.any():
+            continue
+        shape = C.shape
+        C = C.ravel()
+        if skip_zero:
+            if skip_redundant:
+                # skip redundant elements and Im parts that have to vanish
+                re = {'flags': definitions.nonredundant_flags[name]}
+                im = {'flags': definitions.nonredundant_im_flags[name]}
+            else:
+                re = {'flags': definitions.all_flags[name]}
+                im = {'flags': definitions.im_flags[name]}
+        elif skip_redundant:
+            re = {'indices': definitions.nonredundant_indices[name]}
+            im = {'indices': definitions.nonredundant_im_indices[name]}
+        else:
+            re = {'indices': definitions.all_indices[name]}
+            im = {'indices': definitions.im_indices[name]}
+        values = _lha_values(C.real, shape, **re)
+        if values:
+            yield 'WC' + name.upper(), values
+        values = _lha_values(C.imag, shape, **im)
+        if values:
+            yield 'IMWC' + name.upper(), values
+
 def wc_dict2lha(wc, skip_redundant=True, skip_zero=True):
     """Convert a a dictionary of Wilson coefficients into
     a dictionary that pylha can convert into a DSixTools WC output file."""
     d = OrderedDict()
-    for name, (block, i) in WC_dict_0f.items():
-        if block not in d:
-            d[block] = defaultdict(list)
-        if wc[name] != 0:
-            d[block]['values'].append([i, wc[name].real])
-    for name in smeftutil.WC_keys_2f:
-        reblock = 'WC'+name.upper()
-        imblock = 'IMWC'+name.upper()
-        if reblock not in d:
-            d[reblock] = defaultdict(list)
-        if imblock not in d:
-            d[imblock] = defaultdict(list)
-        for i in range(3):
-            for j in range(3):
-                if (i, j) in definitions.redundant_elements[name] and skip_redundant:
-                    # skip redundant elements
-                    continue
-                if wc[name][i, j].real != 0 or not skip_zero:
-                    d[reblock]['values'].append([i+1, j+1, float(wc[name][i, j].real)])
-                if wc[name][i, j].imag != 0 or not skip_zero:
-                    # omit Im parts that have to vanish by symmetry
-                    if (i, j) not in definitions.vanishing_im_parts[name]:
-                        d[imblock]['values'].append([i+1, j+1, float(wc[name][i, j].imag)])
-    for name in smeftutil.WC_keys_4f:
-        reblock = 'WC'+name.upper()
-        imblock = 'IMWC'+name.upper()
-        if reblock not in d:
-            d[reblock] = defaultdict(list)
-        if imblock not in d:
-            d[imblock] = defaultdict(list)
-        for i in range(3):
-            for j in range(3):
-                for k in range(3):
-                    for l in range(3):
-                        if (i, j, k, l) in definitions.redundant_elements[name] and skip_redundant:
-                            # skip redundant elements
-                            continue
-                        if wc[name][i, j, k, l].real != 0 or not skip_zero:
-                            d[reblock]['values'].append([i+1, j+1, k+1, l+1, float(wc[name][i, j, k, l].real)])
-                        if wc[name][i, j, k, l].imag != 0 or not skip_zero:
-                            # omit Im parts that have to vanish by symmetry
-                            if (i, j, k, l) not in definitions.vanishing_im_parts[name]:
-                                d[imblock]['values'].append([i+1, j+1, k+1, l+1, float(wc[name][i, j, k, l].imag)])
-    # remove empty blocks
-    empty = []
-    for block in d:
-        if d[block] == {}:
-            empty.append(block)
-    for block in empty:
-        del d[block]
+    for block, values in _wc_lha_blocks(wc, skip_redundant=skip_redundant,
+                                        skip_zero=skip_zero):
+        d[block] = {'values': values}
     return {'BLOCK': d}
 
+def dump_lha(blocks, stream=None):
+    """Write an iterable of block names and LHA-like lists of values in the
+    SLHA-like format written by `pylha.dump`, one block at a time.
+
+    If `stream` is None, return the produced string instead."""
+    chunks = []
+    for block, values in blocks:
+        s = 'BLOCK {}\n'.format(block) + ''.join(
+            '    ' + '    '.join(str(e) for e in value) + '\n'
+            for value in values)
+        if stream is None:
+            chunks.append(s)
+        else:
+            stream.write(s)
+    if stream is None:
+        return ''.join(chunks)
+
+
+# blocks of DSixTools input files that are read into tensors, mapping the
+# block name to the key of the tensor and to whether it is the imaginary part
+_lha_tensor_blocks = OrderedDict()
+for _k in smeftutil.WC_keys_2f + smeftutil.WC_keys_4f:
+    _lha_tensor_blocks['WC' + _k.upper()] = (_k, False)
+    _lha_tensor_blocks['IMWC' + _k.upper()] = (_k, True)
+for _k in ('Gu', 'Gd', 'Ge'):
+    _lha_tensor_blocks[_k.upper()] = (_k, False)
+    _lha_tensor_blocks['IM' + _k.upper()] = (_k, True)
+_lha_tensor_shapes = dict(smeftutil.C_keys_shape, Gu=(3, 3), Gd=(3, 3), Ge=(3, 3))
+
+
+def _lha_number(s):
+    """Convert a number in a LHA file, possibly with a Fortran exponent."""
+    try:
+        return float(s)
+    except ValueError:
+        return float(s.replace('D', 'E').replace('d', 'e'))
+
+def read_lha(streams):
+    """Read DSixTools input files in SLHA-like format line by line.
+
+    `streams` should be an iterable of strings or file-like objects. The
+    blocks of Wilson coefficients with 2 and 4 fermions and of the Yukawa
+    matrices (`WC...`/`IMWC...`, `GU`/`IMGU` etc.) are written directly into
+    preallocated complex arrays; all other blocks with a single index are
+    collected as dictionaries. As in `pylha.load` followed by merging the
+    files, a block that occurs again replaces the previous one.
+
+    Return a tuple of dictionaries with the arrays, the other blocks and the
+    set of names of all blocks found."""
+    tensors = {k: np.zeros(shape, dtype=complex)
+               for k, shape in _lha_tensor_shapes.items()}
+    scalars = {}
+    found = set()
+    for stream in streams:
+        if isinstance(stream, str):
+            stream = stream.splitlines()
+        target = None
+        inblock = False
+        for line in stream:
+            tokens = line.split('#', 1)[0].split()
+            if not tokens:
+                continue
+            if line[:1].isalpha():
+                # new block (or another LHA entry, e.g. DECAY, which is ignored)
+                inblock = True
+                target = None
+                if tokens[0].upper() != 'BLOCK' or len(tokens) < 2:
+                    continue
+                block = tokens[1].upper()
+                found.add(block)
+                if block in _lha_tensor_blocks:
+                    k, imag = _lha_tensor_blocks[block]
+                    target = tensors[k].imag if imag else tensors[k].real
+                    target[...] = 0
+                else:
+                    target = scalars[block] = {}
+                continue
+            if not inblock:
+                raise ValueError("Found value outside block!")
+            if target is None:
+                continue
+            value = _lha_number(tokens[-1])
+            if isinstance(target, dict):
+                if len(tokens) == 2:
+                    target[int(tokens[0])] = value
+            else:
+                target[tuple(int(i) - 1 for i in tokens[:-1])] = value
+        if not inblock:
+            raise ValueError("No BLOCK found")
+    return tensors, scalars, found
+
+def _lha_tensor(tensors, found, k, block):
+    """Return the tensor `k` read from the blocks `block` and `'IM' + block`,
+    which is real if the latter is absent."""
+    if 'IM' + block in found:
+        return tensors[k]
+    return tensors[k].real
+
+
+# powers of the high scale by which the dimensionful WCxf coefficients
+# differ from the dimensionless DsixTools ones
+_scaling_powers = {k: 2 for k in smeftutil.WC_keys_0f + smeftutil.WC_keys_2f
+                   + smeftutil.WC_keys_4f}
+_scaling_powers['llphiphi'] = 1
+_basis_scaling_powers = None
+
+
+def _basis_powers():
+    """Return an array with the power of the high scale of each coefficient
+    of the WCxf SMEFT Warsaw basis, in the order of `Basis.all_wcs`. It is
+    only computed once."""
+    global _basis_scaling_powers
+    if _basis_scaling_powers is None:
+        import wcxf
+        keys = wcxf.Basis['SMEFT', 'Warsaw'].all_wcs
+        _basis_scaling_powers = np.array([_scaling_powers.get(k.split('_')[0], 0)
+                                          for k in keys])
+    return _basis_scaling_powers
+
+def _basis_array(d):
+    """Return the values of the dictionary `d` as an array in the order of
+    the WCxf SMEFT Warsaw basis, omitting keys not in the basis."""
+    import wcxf
+    basis = wcxf.Basis['SMEFT', 'Warsaw']
+    index = basis.wc_index
+    positions = [index.get(k, -1) for k in d]
+    # the last element collects the keys not in the basis
+    values = np.zeros(len(basis.all_wcs) + 1, dtype=complex)
+    values[positions] = list(d.values())
+    return values[:-1]
+
+# symmetry classes of `smeftutil.symmetrize` that are real or left alone
+_symmetric_real = set(smeftutil.C_symm_keys[0])
+_symmetric_any = set(smeftutil.C_symm_keys[1] + smeftutil.C_symm_keys[3])
+
+
+def _symmetrize_array(name, a):
+    """Symmetrize the array `a` of the coefficient `name`, which can have
+    leading axes (e.g. of points) in front of the flavour indices."""
+    shape = smeftutil.C_keys_shape[name]
+    a = np.asarray(a)
+    lead = a.shape[:a.ndim - len(shape)]
+    maps = definitions.symmetrization_maps[name]
+    if maps is None:
+        # `smeftutil.symmetrize` only indexes the leading (flavour) axes,
+        # so it symmetrizes all points at once if they are at the end
+        a = np.moveaxis(a.reshape((-1,) + shape), 0, -1)
+        a = smeftutil.symmetrize({name: a})[name]
+        return np.moveaxis(a, -1, 0).reshape(lead + shape)
+    index, negate = maps
+    n = 2 * int(np.prod(shape))
+    # real and imaginary parts, followed by a zero
+    x = np.zeros(lead + (n + 1,))
+    x[..., :-1] = np.asarray(a, dtype=complex).reshape(lead + (-1,)).view(float)
+    y = x.take(index, axis=-1)
+    y[..., negate] *= -1
+    return y.view(complex).reshape(lead + shape)
+
+def _symmetrize(C):
+    """Symmetrize the Wilson coefficient arrays like `smeftutil.symmetrize`
+    with the cached maps of `definitions.symmetrization_maps`. The arrays
+    can have a leading axis of points."""
+    C_symm = {}
+    for k, v in C.items():
+        if k in _symmetric_real:
+            C_symm[k] = v.real
+        elif k in _symmetric_any:
+            C_symm[k] = v  # nothing to do
+        elif k in smeftutil.C_keys_shape:
+            C_symm[k] = _symmetrize_array(k, v)
+    return C_symm
+
+
+# flavour rotations of the Wilson coefficients with 2 and 4 fermions as in
+# `smeftutil.flavor_rotation`: for each index, the field whose rotation
+# matrix U is applied, with "*" if it is conjugated, i.e.
+# C'_{ab...} = U1_{ia} U2_{jb} ... C_{ij...}
+_flavor_rotations = OrderedDict()
+for _k in ['ephi', 'eW', 'eB']:
+    _flavor_rotations[_k] = ('l*', 'e')
+for _k in ['uphi', 'uW', 'uB', 'uG']:
+    _flavor_rotations[_k] = ('q*', 'u')
+for _k in ['dphi', 'dW', 'dB', 'dG']:
+    _flavor_rotations[_k] = ('q*', 'd')
+_flavor_rotations.update([
+    ('phil1', ('l*', 'l')), ('phil3', ('l*', 'l')),
+    ('phiq1', ('q*', 'q')), ('phiq3', ('q*', 'q')),
+    ('llphiphi', ('l', 'l')),
+    ('phie', ('e*', 'e')), ('phiu', ('u*', 'u')), ('phid', ('d*', 'd')),
+    ('phiud', ('u*', 'd')),
+    ('ll', ('l*', 'l', 'l*', 'l')), ('ee', ('e*', 'e', 'e*', 'e')),
+    ('le', ('l*', 'l', 'e*', 'e')),
+    ('qq1', ('q*', 'q', 'q*', 'q')), ('qq3', ('q*', 'q', 'q*', 'q')),
+    ('dd', ('d*', 'd', 'd*', 'd')), ('uu', ('u*', 'u', 'u*', 'u')),
+    ('ud8', ('u*', 'u', 'd*', 'd')), ('ud1', ('u*', 'u', 'd*', 'd')),
+    ('qu1', ('q*', 'q', 'u*', 'u')), ('qu8', ('q*', 'q', 'u*', 'u')),
+    ('qd1', ('q*', 'q', 'd*', 'd')), ('qd8', ('q*', 'q', 'd*', 'd')),
+    ('quqd1', ('q*', 'u', 'q*', 'd')), ('quqd8', ('q*', 'u', 'q*', 'd')),
+    ('lq1', ('l*', 'l', 'q*', 'q')), ('lq3', ('l*', 'l', 'q*', 'q')),
+    ('ld', ('l*', 'l', 'd*', 'd')), ('lu', ('l*', 'l', 'u*', 'u')),
+    ('qe', ('q*', 'q', 'e*', 'e')), ('ed', ('e*', 'e', 'd*', 'd')),
+    ('eu', ('e*', 'e', 'u*', 'u')),
+    ('ledq', ('l*', 'e', 'd*', 'q')),
+    ('lequ1', ('l*', 'e', 'q*', 'u')), ('lequ3', ('l*', 'e', 'q*', 'u')),
+    ('duql', ('d', 'u', 'q', 'l')), ('qque', ('q', 'q', 'u', 'e')),
+    ('qqql', ('q', 'q', 'q', 'l')), ('duue', ('d', 'u', 'u', 'e')),
+])
+
+
+def _msvd_stacked(m):
+    """Stacked version of `ckmutil.diag.msvd`."""
+    u, s, vdgr = np.linalg.svd(m)
+    order = s.argsort(axis=-1)
+    s = np.take_along_axis(s, order, axis=-1)
+    u = np.take_along_axis(u, order[..., None, :], axis=-1)
+    vdgr = np.take_along_axis(vdgr, order[..., :, None], axis=-2)
+    return u, s, vdgr.conj().swapaxes(-1, -2)
+
+def _mtakfac_stacked(m):
+    """Stacked version of `ckmutil.diag.mtakfac`.
+
+    The square root of the unitary matrix `z2` is taken elementwise where
+    it is diagonal and from its eigendecomposition otherwise, which is the
+    principal square root computed by `fractional_matrix_power`."""
+    u, s, v = _msvd_stacked(np.asarray(m, dtype=complex))
+    z2 = u.conj().swapaxes(-1, -2) @ v.conj()
+    offdiag = z2 * (1 - np.eye(3))
+    z = np.sqrt(z2)
+    nondiagonal = ~np.all(np.abs(offdiag) < 1e-14, axis=(-2, -1))
+    if nondiagonal.any():
+        w, W = np.linalg.eig(z2[nondiagonal])
+        z[nondiagonal] = (W * np.sqrt(w)[..., None, :]) @ np.linalg.inv(W)
+    return v @ z, s
+
+def _rephase_stacked(Ul, Ur):
+    """Return the diagonals of the rephasing matrices of
+    `ckmutil.phases.rephase_standard` for stacked left-handed up- and
+    down-type rotation matrices.
+
+    The phases are those of `ckmutil.phases.mixing_phases` for generic
+    mixing matrices; the special cases with a vanishing sine or cosine of
+    a mixing angle are left to `mixing_phases`."""
+    K = Ul.conj().swapaxes(-1, -2) @ Ur
+    a = np.abs(K)
+    s13 = np.minimum(a[:, 0, 2], 1)
+    c13 = np.sqrt(1 - s13**2)
+    t12 = np.arctan2(a[:, 0, 1], a[:, 0, 0])
+    t23 = np.arctan2(a[:, 1, 2], a[:, 2, 2])
+    s12, c12, s23, c23 = np.sin(t12), np.cos(t12), np.sin(t23), np.cos(t23)
+    special = np.any(np.abs([s12, c12, s13, c13, s23, c23]) < 1e-7, axis=0)
+    # avoid dividing by zero for the special cases, which are replaced below
+    s12, c12, s13, c13, s23, c23 = (np.where(special, 1, x)
+                                    for x in (s12, c12, s13, c13, s23, c23))
+    delta = -np.angle((K[:, 0, 0].conj() * K[:, 0, 2] * K[:, 2, 0] * K[:, 2, 2].conj()
+                       / (c12 * c13**2 * c23 * s13) + c12 * c23 * s13) / (s12 * s23))
+    delta1 = np.angle(np.exp(1j * delta) * K[:, 0, 2])
+    delta2 = np.angle(K[:, 1, 2])
+    delta3 = np.angle(K[:, 2, 2])
+    phi1 = 2 * np.angle(np.exp(1j * delta1) * K[:, 0, 0].conj())
+    phi2 = 2 * np.angle(np.exp(1j * delta1) * K[:, 0, 1].conj())
+    for i in np.flatnonzero(special):
+        f = ckmutil.phases.mixing_phases(K[i])
+        delta1[i], delta2[i], delta3[i] = f['delta1'], f['delta2'], f['delta3']
+        phi1[i], phi2[i] = f['phi1'], f['phi2']
+    Fdelta = np.exp(1j * np.stack([delta1, delta2, delta3], axis=-1))
+    Fphi = np.exp(-1j / 2 * np.stack([phi1, phi2, np.zeros_like(phi1)], axis=-1))
+    return Fdelta, Fphi
+
+def _rotate_stacked(C, matrices):
+    """Rotate the flavour axes of the stacked tensor `C` with the stacked
+    matrices `matrices`, one per axis: C'_{ab...} = M1_{ia} M2_{jb} ... C_{ij...}."""
+    ndim = len(matrices)
+    for axis, M in enumerate(matrices, start=1):
+        M = M.reshape(M.shape[:1] + (1,) * (ndim - 2) + (3, 3))
+        C = np.moveaxis(np.moveaxis(C, axis, -1) @ M, -1, axis)
+    return C
+
 
 class SMEFTio(object):
 
@@ -222,19 +510,30 @@ class SMEFTio(object):
         one or several files.
 
         `streams` should be a tuple of file-like objects strings."""
-        d = {}
-        for stream in streams:
-            s = load(stream)
-            if 'BLOCK' not in s:
-                raise ValueError("No BLOCK found")
-            d.update(s['BLOCK'])
-        d = {'BLOCK': d}
-        C = wc_lha2dict(d)
-        sm = sm_lha2dict(d)
-        self.scale_high = lha2scale(d)
-        self.scale_in = lha2scale(d)
-        C.update(sm)
-        C = smeftutil.symmetrize(C)
+        tensors, scalars, found = read_lha(streams)
+        C = OrderedDict()
+        # WCs with 0, 2, or 4 fermions default to zero
+        for k, (block, i) in WC_dict_0f.items():
+            C[k] = scalars.get(block, {}).get(i, 0)
+        for k in smeftutil.WC_keys_2f + smeftutil.WC_keys_4f:
+            C[k] = _lha_tensor(tensors, found, k, 'WC' + k.upper())
+        C['g'] = scalars['GAUGE'][1]
+        C['gp'] = scalars['GAUGE'][2]
+        C['gs'] = scalars['GAUGE'][3]
+        C['Lambda'] = scalars['SCALAR'][1]
+        C['m2'] = scalars['SCALAR'][2]
+        for k in ('Gu', 'Gd', 'Ge'):
+            if k.upper() not in found:
+                raise KeyError(k.upper())
+            C[k] = _lha_tensor(tensors, found, k, k.upper())
+        # thetas default to 0
+        theta = scalars.get('THETA', {})
+        C['Theta'] = theta.get(1, 0)
+        C['Thetap'] = theta.get(2, 0)
+        C['Thetas'] = theta.get(3, 0)
+        self.scale_high = scalars['SCALES'][1]
+        self.scale_in = scalars['SCALES'][1]
+        C = _symmetrize(C)
         self.C_in = C
 
     def set_initial_wcxf(self, wc, scale_high=None):
@@ -258,17 +557,12 @@ class SMEFTio(object):
             self.scale_high = scale_high
         elif self.scale_high is None:
             self.scale_high = wc.scale
-        C = smeftutil.wcxf2arrays(wc.dict)
-        keys_dim5 = ['llphiphi']
-        keys_dim6 = list(set(smeftutil.WC_keys_0f + smeftutil.WC_keys_2f + smeftutil.WC_keys_4f) - set(keys_dim5))
         self.scale_in = wc.scale
-        for k in keys_dim5:
-            if k in C:
-                C[k] = C[k]*self.scale_high
-        for k in keys_dim6:
-            if k in C:
-                C[k] = C[k]*self.scale_high**2
-        C = smeftutil.symmetrize(C)
+        keys = wcxf.Basis['SMEFT', 'Warsaw'].all_wcs
+        values = _basis_array(wc.dict) * self.scale_high**_basis_powers()
+        C = smeftutil.wcxf2arrays({keys[i]: values[i]
+                                   for i in values.nonzero()[0].tolist()})
+        C = _symmetrize(C)
         # fill in zeros for missing WCs
         for k, s in smeftutil.C_keys_shape.items():
             if k not in C and k not in smeftutil.SM_keys:
@@ -281,6 +575,71 @@ class SMEFTio(object):
         else:
             self.C_in.update(C)
 
+    def set_initial_ensemble(self, ensemble, scale_high=None):
+        """Load the initial values for Wilson coefficients of many points at
+        once from a `wcxf.Ensemble` or an iterable of wcxf.WC instances.
+
+        The Wilson coefficients are then stacked arrays with a leading axis
+        of points, e.g. `C_in['qq1']` has the shape (N, 3, 3, 3, 3), and
+        `scale_in` is the array of the scales of the points. The rescaling
+        and symmetrization are done for all points at once.
+
+        Parameters:
+
+        - `scale_high`: the high scale in GeV as in `set_initial_wcxf`, which
+          can also be an array with one value per point. If None (default),
+          either a previously defined value will be used, or the scales of
+          the points will be used.
+        """
+        from wcxf.ensemble import Ensemble
+        if not isinstance(ensemble, Ensemble):
+            ensemble = Ensemble.from_wcs(list(ensemble))
+        if ensemble.eft != 'SMEFT':
+            raise ValueError("Wilson coefficients use wrong EFT.")
+        if ensemble.basis != 'Warsaw':
+            raise ValueError("Wilson coefficients use wrong basis.")
+        if scale_high is not None:
+            self.scale_high = scale_high
+        elif self.scale_high is None:
+            self.scale_high = ensemble.scales
+        self.scale_in = ensemble.scales
+        n = len(ensemble)
+        # columns of the ensemble and flat indices of each coefficient
+        columns = OrderedDict()
+        for col, key in enumerate(ensemble.keys):
+            name, _, ind = key.partition('_')
+            cols, flat = columns.setdefault(name, ([], []))
+            cols.append(col)
+            if ind:
+                shape = smeftutil.C_keys_shape[name]
+                flat.append(np.ravel_multi_index([int(i) - 1 for i in ind], shape))
+        scale_high = np.asarray(self.scale_high, dtype=float)
+        C = {}
+        for name, (cols, flat) in columns.items():
+            shape = smeftutil.C_keys_shape[name]
+            if shape == 1:
+                C[name] = ensemble.values[:, cols[0]]
+                factor = scale_high
+            else:
+                a = np.zeros((n, np.prod(shape)), dtype=complex)
+                a[:, flat] = ensemble.values[:, cols]
+                C[name] = a.reshape((n,) + shape)
+                # broadcast one scale per point over the flavour indices
+                factor = scale_high.reshape(scale_high.shape + (1,) * len(shape))
+            C[name] = C[name] * factor**_scaling_powers.get(name, 0)
+        C = _symmetrize(C)
+        # fill in zeros for missing WCs
+        for k, s in smeftutil.C_keys_shape.items():
+            if k not in C and k not in smeftutil.SM_keys:
+                if s == 1:
+                    C[k] = np.zeros(n)
+                else:
+                    C[k] = np.zeros((n,) + s)
+        if self.C_in is None:
+            self.C_in = C
+        else:
+            self.C_in.update(C)
+
     def load_wcxf(self, stream):
         """Load the initial values for Wilson coefficients from
         a file-like object or a string in WCxf format.
@@ -299,15 +658,19 @@ class SMEFTio(object):
         specified, export it to a file. `fmt` defaults to `lha` (the SLHA-like
         DSixTools format), but can also be `json` or `yaml` (see the
         pylha documentation)."""
-        C = OrderedDict()
         if scale_out is not None:
-            C['SCALES'] = {'values': [[1, self.scale_high], [2, scale_out]]}
+            scales = [[1, self.scale_high], [2, scale_out]]
         else:
-            C['SCALES'] = {'values': [[1, self.scale_high]]}
+            scales = [[1, self.scale_high]]
         # sm = sm_dict2lha(C_out)['BLOCK']
-        # C.update(sm)
-        wc = wc_dict2lha(C_out, skip_redundant=skip_redundant)['BLOCK']
-        C.update(wc)
+        blocks = _wc_lha_blocks(C_out, skip_redundant=skip_redundant)
+        if fmt == 'lha':
+            # write the blocks directly without an intermediate dictionary
+            return dump_lha(chain([('SCALES', scales)], blocks), stream=stream)
+        C = OrderedDict()
+        C['SCALES'] = {'values': scales}
+        for block, values in blocks:
+            C[block] = {'values': values}
         return pylha.dump({'BLOCK': C}, fmt=fmt, stream=stream)
 
     def get_wcxf(self, C_out, scale_out):
@@ -320,18 +683,13 @@ class SMEFTio(object):
         # C = self.rotate_defaultbasis(C_out)
         C = C_out.copy()  # FIXME
         d = smeftutil.arrays2wcxf(C)
-        basis = wcxf.Basis['SMEFT', 'Warsaw']
-        d = {k: v for k, v in d.items() if k in basis.all_wcs and v != 0}
-        keys_dim5 = ['llphiphi']
-        keys_dim6 = list(set(smeftutil.WC_keys_0f + smeftutil.WC_keys_2f
-                             + smeftutil.WC_keys_4f) - set(keys_dim5))
-        for k in d:
-            if k.split('_')[0] in keys_dim5:
-                d[k] = d[k] / self.scale_high
-        for k in d:
-            if k.split('_')[0] in keys_dim6:
-                d[k] = d[k] / self.scale_high**2
-        # d = {k: v for k, v in d.items() if v != 0}
+        keys = wcxf.Basis['SMEFT', 'Warsaw'].all_wcs
+        values = _basis_array(d)
+        # divide the real and imaginary parts separately as for real numbers
+        scaling = self.scale_high**_basis_powers()
+        values.real /= scaling
+        values.imag /= scaling
+        d = {keys[i]: values[i] for i in values.nonzero()[0].tolist()}
         d = wcxf.WC.dict2values(d)
         wc = wcxf.WC('SMEFT', 'Warsaw', scale_out, d)
         return wc
@@ -367,6 +725,47 @@ class SMEFTio(object):
         return smeftutil.flavor_rotation(C, Uq=UdL, Uu=UuR, Ud=UdR, Ul=UeL, Ue=UeR)
 
 
+    def rotate_defaultbasis_ensemble(self, C):
+        """Stacked version of `rotate_defaultbasis` for many points at once.
+
+        `C` is a dictionary of stacked arrays with a leading axis of points,
+        as set by `set_initial_ensemble`; parameters without this axis (e.g.
+        SM parameters set for all points) are used for all points, and
+        `scale_high` can be an array with one value per point. The
+        diagonalizations, the extraction of the mixing phases and the
+        flavour rotations are done for all points at once."""
+        v = 246.22
+        scale_high = np.asarray(self.scale_high, dtype=float)
+        scale_high = scale_high.reshape(scale_high.shape + (1, 1))
+        Mep = v/sqrt(2) * (C['Ge'] - C['ephi'] * v**2/scale_high**2/2)
+        Mup = v/sqrt(2) * (C['Gu'] - C['uphi'] * v**2/scale_high**2/2)
+        Mdp = v/sqrt(2) * (C['Gd'] - C['dphi'] * v**2/scale_high**2/2)
+        Mnup = -v**2 * np.asarray(C['llphiphi'])
+        Mep, Mup, Mdp, Mnup = (M.reshape(-1, 3, 3) for M in
+                               np.broadcast_arrays(Mep, Mup, Mdp, Mnup))
+        n = len(Mep)
+        UeL, Me, UeR = _msvd_stacked(Mep)
+        UuL, Mu, UuR = _msvd_stacked(Mup)
+        UdL, Md, UdR = _msvd_stacked(Mdp)
+        Unu, Mnu = _mtakfac_stacked(Mnup)
+        # right-multiplying with a diagonal matrix rescales the columns
+        Fdelta, Fphi = _rephase_stacked(UuL, UdL)
+        UuL, UuR = UuL * Fdelta[:, None, :], UuR * Fdelta[:, None, :]
+        UdL, UdR = UdL * Fphi.conj()[:, None, :], UdR * Fphi.conj()[:, None, :]
+        Fdelta, _ = _rephase_stacked(UeL, Unu)
+        UeL, UeR = UeL * Fdelta[:, None, :], UeR * Fdelta[:, None, :]
+        U = {'q': UdL, 'u': UuR, 'd': UdR, 'l': UeL, 'e': UeR}
+        U.update({f + '*': M.conj() for f, M in U.items()})
+        C_out = {}
+        for k in smeftutil.WC_keys_0f:
+            if k in C:
+                C_out[k] = C[k]
+        for k, fields in _flavor_rotations.items():
+            if k in C:
+                a = np.broadcast_to(C[k], (n,) + smeftutil.C_keys_shape[k])
+                C_out[k] = _rotate_stacked(a, [U[f] for f in fields])
+        return C_out
+
 def wcxf2dsixtools(wc, stream=None):
     smeftio = SMEFTio()
     smeftio.set_initial_wcxf(wc)
@@ -376,3 +775,122 @@ def dsixtools2wcxf(streams, stream=None):
     smeftio = SMEFTio()
     smeftio.load_initial(streams)
     return smeftio.dump_wcxf(smeftio.C_in, smeftio.scale_in, stream=stream)
+
+
+def _init_worker():
+    """Compute the symmetry tables used by the conversion, so that this
+    is done only once per worker process."""
+    for name in smeftutil.WC_keys_2f + smeftutil.WC_keys_4f:
+        definitions.nonredundant_flags[name]
+        definitions.nonredundant_im_flags[name]
+
+def _map(function, tasks, jobs=1, ordered=True):
+    """Iterate over the results of `function` applied to `tasks`, in `jobs`
+    worker processes if `jobs` is not 1 (None means one per CPU). Results are
+    yielded in the order of the tasks if `ordered` is True, otherwise as soon
+    as they are available."""
+    _init_worker()
+    if jobs == 1:
+        for task in tasks:
+            yield function(task)
+        return
+    with multiprocessing.Pool(jobs, initializer=_init_worker) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        for result in imap(function, tasks, chunksize=4):
+            yield result
+
+def _error(e):
+    return '{}: {}'.format(type(e).__name__, e)
+
+def _wcxf2dsixtools_task(task):
+    """Convert a WCxf file or `WC` instance to a DsixTools file."""
+    from wcxf.classes import WC, open_file
+    label, wc, outfile = task
+    try:
+        if not isinstance(wc, WC):
+            with open_file(wc) as f:
+                wc = WC.load(f)
+        wc.validate()
+        with open_file(outfile, 'w') as f:
+            wcxf2dsixtools(wc, stream=f)
+    except Exception as e:
+        return label, None, _error(e)
+    return label, outfile, None
+
+def _dsixtools2wcxf_task(task):
+    """Convert a DsixTools WC file together with common files to a `WC`
+    instance."""
+    from wcxf.classes import open_file
+    filename, common = task
+    try:
+        with open_file(filename) as f:
+            smeftio = SMEFTio()
+            smeftio.load_initial((f,) + common)
+            wc = smeftio.get_wcxf(smeftio.C_in, smeftio.scale_in)
+    except Exception as e:
+        return filename, None, _error(e)
+    return filename, wc, None
+
+def wcxf2dsixtools_batch(inputs, outdir, jobs=1, ordered=True):
+    """Convert many WCxf files to DsixTools Wilson coefficient files in the
+    directory `outdir`.
+
+    `inputs` is an iterable of file names or `WC` instances (e.g. from
+    `wcxf.iter_load`). The output for the file `point.json` (or
+    `point.json.gz` etc.) is `outdir/point.dat`, the one for the `i`-th `WC`
+    instance (counting from 0) `outdir/000i.dat`. If this name has already
+    been used for a previous input (e.g. for `a/point.json` and
+    `b/point.json`), a suffix `-1`, `-2`, ... is appended to it. The
+    conversions are run in `jobs` worker processes (see `_map`), each of
+    which sets up the conversion only once.
+
+    Yields a tuple of the input file name (or the position of the `WC`
+    instance), the output file name and an error message for each input.
+    The output file name is None and the error message describes the
+    problem if the conversion failed; otherwise the error is None."""
+    from wcxf.classes import _name_compression
+
+    def tasks():
+        used = set()
+        for i, wc in enumerate(inputs):
+            if isinstance(wc, str):
+                name = os.path.basename(wc)
+                if _name_compression(name):
+                    name = os.path.splitext(name)[0]
+                name = os.path.splitext(name)[0]
+                label = wc
+            else:
+                name = '{:05d}'.format(i)
+                label = i
+            unique, n = name, 0
+            while unique in used:
+                n += 1
+                unique = '{}-{}'.format(name, n)
+            used.add(unique)
+            yield label, wc, os.path.join(outdir, unique + '.dat')
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    return _map(_wcxf2dsixtools_task, tasks(), jobs=jobs, ordered=ordered)
+
+def dsixtools2wcxf_batch(inputs, common=(), jobs=1, ordered=True):
+    """Convert many DsixTools Wilson coefficient files to `WC` instances.
+
+    `inputs` is an iterable of file names, each containing one point.
+    `common` are the file names or file-like objects of the other files
+    needed for the conversion, which are the same for all points (typically
+    the options and SM input files); they are only read once. The conversions are run in `jobs` worker processes
+    (see `_map`).
+
+    Yields a tuple of the input file name, the `WC` instance (or None if the
+    conversion failed) and None (or an error message) for each input."""
+    from wcxf.classes import open_file
+    contents = []
+    for f in common:
+        if isinstance(f, str):
+            with open_file(f) as stream:
+                f = stream.read()
+        else:
+            f = f.read()
+        contents.append(f)
+    tasks = ((filename, tuple(contents)) for filename in inputs)
+    return _map(_dsixtools2wcxf_task, tasks, jobs=jobs, ordered=ordered)
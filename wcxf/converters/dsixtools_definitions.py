@@ -1,1175 +1,124 @@
+"""Symmetry tables of the SMEFT Wilson coefficients with 2 and 4 fermions
+used by the DsixTools converter.
 
-# elements that are redundant and can thus be omitted in the input/output
-redundant_elements = {'G': [],
- 'Gd': [],
- 'Ge': [],
- 'Gtilde': [],
- 'Gu': [],
- 'Lambda': [],
- 'Theta': [],
- 'Thetap': [],
- 'Thetas': [],
- 'W': [],
- 'Wtilde': [],
- 'dB': [],
- 'dG': [],
- 'dW': [],
- 'dd': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (0, 1, 0, 0),
-  (0, 2, 0, 0),
-  (0, 2, 0, 1),
-  (0, 2, 1, 0),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 0, 1),
-  (1, 1, 0, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (1, 2, 0, 0),
-  (1, 2, 0, 1),
-  (1, 2, 0, 2),
-  (1, 2, 1, 0),
-  (1, 2, 1, 1),
-  (1, 2, 2, 0),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 0, 0),
-  (2, 2, 0, 1),
-  (2, 2, 0, 2),
-  (2, 2, 1, 0),
-  (2, 2, 1, 1),
-  (2, 2, 1, 2),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'dphi': [],
- 'duql': [],
- 'duue': [],
- 'eB': [],
- 'eW': [],
- 'ed': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'ee': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (0, 1, 0, 0),
-  (0, 1, 1, 0),
-  (0, 1, 2, 0),
-  (0, 2, 0, 0),
-  (0, 2, 0, 1),
-  (0, 2, 1, 0),
-  (0, 2, 1, 1),
-  (0, 2, 2, 0),
-  (0, 2, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 0, 1),
-  (1, 1, 0, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (1, 2, 0, 0),
-  (1, 2, 0, 1),
-  (1, 2, 0, 2),
-  (1, 2, 1, 0),
-  (1, 2, 1, 1),
-  (1, 2, 2, 0),
-  (1, 2, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 0, 0),
-  (2, 2, 0, 1),
-  (2, 2, 0, 2),
-  (2, 2, 1, 0),
-  (2, 2, 1, 1),
-  (2, 2, 1, 2),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'ephi': [],
- 'eu': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'g': [],
- 'gp': [],
- 'gs': [],
- 'ld': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'le': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'ledq': [],
- 'lequ1': [],
- 'lequ3': [],
- 'll': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (0, 1, 0, 0),
-  (0, 2, 0, 0),
-  (0, 2, 0, 1),
-  (0, 2, 1, 0),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 0, 1),
-  (1, 1, 0, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (1, 2, 0, 0),
-  (1, 2, 0, 1),
-  (1, 2, 0, 2),
-  (1, 2, 1, 0),
-  (1, 2, 1, 1),
-  (1, 2, 2, 0),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 0, 0),
-  (2, 2, 0, 1),
-  (2, 2, 0, 2),
-  (2, 2, 1, 0),
-  (2, 2, 1, 1),
-  (2, 2, 1, 2),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'llphiphi': [(1, 0), (2, 0), (2, 1)],
- 'lq1': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'lq3': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'lu': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'm2': [],
- 'phi': [],
- 'phiB': [],
- 'phiBox': [],
- 'phiBtilde': [],
- 'phiD': [],
- 'phiG': [],
- 'phiGtilde': [],
- 'phiW': [],
- 'phiWB': [],
- 'phiWtilde': [],
- 'phiWtildeB': [],
- 'phid': [(1, 0), (2, 0), (2, 1)],
- 'phie': [(1, 0), (2, 0), (2, 1)],
- 'phil1': [(1, 0), (2, 0), (2, 1)],
- 'phil3': [(1, 0), (2, 0), (2, 1)],
- 'phiq1': [(1, 0), (2, 0), (2, 1)],
- 'phiq3': [(1, 0), (2, 0), (2, 1)],
- 'phiu': [(1, 0), (2, 0), (2, 1)],
- 'phiud': [],
- 'qd1': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'qd8': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'qe': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'qq1': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (0, 1, 0, 0),
-  (0, 2, 0, 0),
-  (0, 2, 0, 1),
-  (0, 2, 1, 0),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 0, 1),
-  (1, 1, 0, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (1, 2, 0, 0),
-  (1, 2, 0, 1),
-  (1, 2, 0, 2),
-  (1, 2, 1, 0),
-  (1, 2, 1, 1),
-  (1, 2, 2, 0),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 0, 0),
-  (2, 2, 0, 1),
-  (2, 2, 0, 2),
-  (2, 2, 1, 0),
-  (2, 2, 1, 1),
-  (2, 2, 1, 2),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'qq3': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (0, 1, 0, 0),
-  (0, 2, 0, 0),
-  (0, 2, 0, 1),
-  (0, 2, 1, 0),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 0, 1),
-  (1, 1, 0, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (1, 2, 0, 0),
-  (1, 2, 0, 1),
-  (1, 2, 0, 2),
-  (1, 2, 1, 0),
-  (1, 2, 1, 1),
-  (1, 2, 2, 0),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 0, 0),
-  (2, 2, 0, 1),
-  (2, 2, 0, 2),
-  (2, 2, 1, 0),
-  (2, 2, 1, 1),
-  (2, 2, 1, 2),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'qqql': [(1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 1, 0, 0),
-  (1, 1, 0, 1),
-  (1, 1, 0, 2),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 2, 0, 0),
-  (2, 2, 0, 1),
-  (2, 2, 0, 2),
-  (2, 2, 1, 0),
-  (2, 2, 1, 1),
-  (2, 2, 1, 2)],
- 'qque': [(1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2)],
- 'qu1': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'qu8': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'quqd1': [],
- 'quqd8': [],
- 'uB': [],
- 'uG': [],
- 'uW': [],
- 'ud1': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'ud8': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 1, 0),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)],
- 'uphi': [],
- 'uu': [(0, 0, 1, 0),
-  (0, 0, 2, 0),
-  (0, 0, 2, 1),
-  (0, 1, 0, 0),
-  (0, 2, 0, 0),
-  (0, 2, 0, 1),
-  (0, 2, 1, 0),
-  (1, 0, 0, 0),
-  (1, 0, 0, 1),
-  (1, 0, 0, 2),
-  (1, 0, 1, 0),
-  (1, 0, 1, 1),
-  (1, 0, 1, 2),
-  (1, 0, 2, 0),
-  (1, 0, 2, 1),
-  (1, 0, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 0, 1),
-  (1, 1, 0, 2),
-  (1, 1, 1, 0),
-  (1, 1, 2, 0),
-  (1, 1, 2, 1),
-  (1, 2, 0, 0),
-  (1, 2, 0, 1),
-  (1, 2, 0, 2),
-  (1, 2, 1, 0),
-  (1, 2, 1, 1),
-  (1, 2, 2, 0),
-  (2, 0, 0, 0),
-  (2, 0, 0, 1),
-  (2, 0, 0, 2),
-  (2, 0, 1, 0),
-  (2, 0, 1, 1),
-  (2, 0, 1, 2),
-  (2, 0, 2, 0),
-  (2, 0, 2, 1),
-  (2, 0, 2, 2),
-  (2, 1, 0, 0),
-  (2, 1, 0, 1),
-  (2, 1, 0, 2),
-  (2, 1, 1, 0),
-  (2, 1, 1, 1),
-  (2, 1, 1, 2),
-  (2, 1, 2, 0),
-  (2, 1, 2, 1),
-  (2, 1, 2, 2),
-  (2, 2, 0, 0),
-  (2, 2, 0, 1),
-  (2, 2, 0, 2),
-  (2, 2, 1, 0),
-  (2, 2, 1, 1),
-  (2, 2, 1, 2),
-  (2, 2, 2, 0),
-  (2, 2, 2, 1)]}
+The tables are derived from the index symmetries implemented in
+`wilson.util.smeftutil.symmetrize`: an element is redundant if
+symmetrization overwrites it with a combination of other elements, and
+the imaginary part of a non-redundant element vanishes by symmetry if
+symmetrization changes it. They are only computed when they are first
+accessed and then cached.
 
-# elements where the imaginary part must be zero and which can thus
-# be omitted in the input/output
-vanishing_im_parts = {'G': [],
- 'Gd': [],
- 'Ge': [],
- 'Gtilde': [],
- 'Gu': [],
- 'Lambda': [],
- 'Theta': [],
- 'Thetap': [],
- 'Thetas': [],
- 'W': [],
- 'Wtilde': [],
- 'dB': [],
- 'dG': [],
- 'dW': [],
- 'dd': [(1, 1, 2, 2),
-  (2, 2, 2, 2),
-  (1, 2, 2, 1),
-  (1, 1, 1, 1),
-  (0, 2, 2, 0),
-  (0, 1, 1, 0),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2)],
- 'dphi': [],
- 'duql': [],
- 'duue': [],
- 'eB': [],
- 'eW': [],
- 'ed': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'ee': [(1, 1, 2, 2),
-  (2, 2, 2, 2),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2)],
- 'ephi': [],
- 'eu': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'g': [],
- 'gp': [],
- 'gs': [],
- 'ld': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'le': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'ledq': [],
- 'lequ1': [],
- 'lequ3': [],
- 'll': [(1, 1, 2, 2),
-  (2, 2, 2, 2),
-  (1, 2, 2, 1),
-  (1, 1, 1, 1),
-  (0, 2, 2, 0),
-  (0, 1, 1, 0),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2)],
- 'llphiphi': [],
- 'lq1': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'lq3': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'lu': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'm2': [],
- 'phi': [],
- 'phiB': [],
- 'phiBox': [],
- 'phiBtilde': [],
- 'phiD': [],
- 'phiG': [],
- 'phiGtilde': [],
- 'phiW': [],
- 'phiWB': [],
- 'phiWtilde': [],
- 'phiWtildeB': [],
- 'phid': [(0, 0), (1, 1), (2, 2)],
- 'phie': [(0, 0), (1, 1), (2, 2)],
- 'phil1': [(0, 0), (1, 1), (2, 2)],
- 'phil3': [(0, 0), (1, 1), (2, 2)],
- 'phiq1': [(0, 0), (1, 1), (2, 2)],
- 'phiq3': [(0, 0), (1, 1), (2, 2)],
- 'phiu': [(0, 0), (1, 1), (2, 2)],
- 'phiud': [],
- 'qd1': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'qd8': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'qe': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'qq1': [(1, 1, 2, 2),
-  (2, 2, 2, 2),
-  (1, 2, 2, 1),
-  (1, 1, 1, 1),
-  (0, 2, 2, 0),
-  (0, 1, 1, 0),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2)],
- 'qq3': [(1, 1, 2, 2),
-  (2, 2, 2, 2),
-  (1, 2, 2, 1),
-  (1, 1, 1, 1),
-  (0, 2, 2, 0),
-  (0, 1, 1, 0),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2)],
- 'qqql': [],
- 'qque': [],
- 'qu1': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'qu8': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'quqd1': [],
- 'quqd8': [],
- 'uB': [],
- 'uG': [],
- 'uW': [],
- 'ud1': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'ud8': [(1, 1, 2, 2),
-  (2, 2, 1, 1),
-  (2, 2, 2, 2),
-  (1, 1, 0, 0),
-  (1, 1, 1, 1),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2),
-  (2, 2, 0, 0)],
- 'uphi': [],
- 'uu': [(1, 1, 2, 2),
-  (2, 2, 2, 2),
-  (1, 2, 2, 1),
-  (1, 1, 1, 1),
-  (0, 2, 2, 0),
-  (0, 1, 1, 0),
-  (0, 0, 0, 0),
-  (0, 0, 1, 1),
-  (0, 0, 2, 2)]}
+The following mappings from coefficient names to tables are defined:
+
+- `redundant_mask`, `vanishing_im_mask`: boolean arrays of the shape of
+  the coefficient
+- `redundant_elements`, `vanishing_im_parts`: the same as lists of index
+  tuples
+- `all_indices`, `nonredundant_indices`: flat (C order) indices of all and
+  of the non-redundant elements
+- `im_indices`, `nonredundant_im_indices`: flat indices of all and of the
+  non-redundant elements whose imaginary part does not vanish by symmetry
+- `all_flags`, `nonredundant_flags`, `im_flags`, `nonredundant_im_flags`:
+  the same selections as flat boolean arrays, to filter the non-zero
+  elements of a coefficient
+- `symmetrization_maps`: the symmetrization as a gather from the real and
+  imaginary parts (see `_symmetrization_map`), or None if it is not a
+  gather
+"""
+
+import numpy as np
+from wilson.util import smeftutil
+
+
+class _Tables(dict):
+    """Dictionary computing the value for a coefficient name with
+    `function` when it is first accessed."""
+
+    def __init__(self, function):
+        super().__init__()
+        self.function = function
+
+    def __missing__(self, name):
+        value = self.function(name)
+        self[name] = value
+        return value
+
+
+# scalar SM parameters of DsixTools that are not known to smeftutil
+_theta_keys = ('Theta', 'Thetap', 'Thetas')
+
+
+def _masks(name):
+    """Return boolean arrays of the redundant elements and of the
+    non-redundant elements with vanishing imaginary part."""
+    if name in _theta_keys:
+        shape = 1
+    else:
+        shape = smeftutil.C_keys_shape[name]
+    if shape == 1:
+        return np.zeros((), dtype=bool), np.zeros((), dtype=bool)
+    # generic values, so that no linear combination of other elements
+    # accidentally reproduces the value of an element
+    rng = np.random.RandomState(0)
+    re = rng.uniform(1, 2, shape)
+    im = rng.uniform(1, 2, shape)
+    symmetrized = smeftutil.symmetrize({name: re + 1j * im})[name]
+    redundant = symmetrized.real != re
+    vanishing_im = ~redundant & (symmetrized.imag != im)
+    return redundant, vanishing_im
+
+
+def _indices(mask):
+    """Return the flat indices where `mask` is True."""
+    return np.flatnonzero(mask)
+
+
+_all_masks = _Tables(_masks)
+redundant_mask = _Tables(lambda name: _all_masks[name][0])
+vanishing_im_mask = _Tables(lambda name: _all_masks[name][1])
+redundant_elements = _Tables(
+    lambda name: [tuple(i) for i in np.argwhere(redundant_mask[name]).tolist()])
+vanishing_im_parts = _Tables(
+    lambda name: [tuple(i) for i in np.argwhere(vanishing_im_mask[name]).tolist()])
+all_flags = _Tables(lambda name: np.ones(redundant_mask[name].size, dtype=bool))
+nonredundant_flags = _Tables(lambda name: ~redundant_mask[name].ravel())
+im_flags = _Tables(lambda name: ~vanishing_im_mask[name].ravel())
+nonredundant_im_flags = _Tables(
+    lambda name: nonredundant_flags[name] & im_flags[name])
+all_indices = _Tables(lambda name: _indices(all_flags[name]))
+nonredundant_indices = _Tables(lambda name: _indices(nonredundant_flags[name]))
+im_indices = _Tables(lambda name: _indices(im_flags[name]))
+nonredundant_im_indices = _Tables(
+    lambda name: _indices(nonredundant_im_flags[name]))
+
+
+def _symmetrization_map(name):
+    """Return the symmetrization of the coefficient `name` as a tuple of an
+    index and a negation array acting on the flattened real and imaginary
+    parts `x` (as `a.view(float)` of a flat complex array `a` of size n),
+    such that the symmetrized parts are `y = x_ext[index]` with
+    `y[negate] *= -1`, where `x_ext` is `x` with a zero appended.
+
+    Return None if the symmetrization of the coefficient is not of this
+    form, i.e. if it involves sums of elements."""
+    shape = smeftutil.C_keys_shape[name]
+    n = int(np.prod(shape))
+    # symmetrize all unit vectors at once, as the last axis is left alone
+    units = np.zeros((n, 2 * n), dtype=complex)
+    units[:, 0::2] = np.eye(n)
+    units[:, 1::2] = 1j * np.eye(n)
+    symmetrized = smeftutil.symmetrize({name: units.reshape(shape + (2 * n,))})[name]
+    symmetrized = np.asarray(symmetrized, dtype=complex).reshape(n, 2 * n)
+    # matrix from the input to the output parts
+    M = np.empty((2 * n, 2 * n))
+    M[0::2] = symmetrized.real
+    M[1::2] = symmetrized.imag
+    nonzero = M != 0
+    if np.any(nonzero.sum(axis=1) > 1) or np.any(np.abs(M[nonzero]) != 1):
+        return None
+    index = np.where(nonzero.any(axis=1), np.abs(M).argmax(axis=1), 2 * n)
+    negate = np.flatnonzero(M.min(axis=1) < 0)
+    return index, negate
+
+
+symmetrization_maps = _Tables(_symmetrization_map)
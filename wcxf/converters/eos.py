@@ -5,6 +5,7 @@ import yaml
 import glob
 import os
 import re
+from wcxf.classes import YAMLLoader
 
 
 def get_sm_wcs(eos_parameter_dir):
@@ -14,7 +15,7 @@ def get_sm_wcs(eos_parameter_dir):
     yamlfiles = glob.glob(os.path.join(eos_parameter_dir, '*.yaml'))
     for yamlfile in yamlfiles:
         with open(yamlfile, 'r') as f:
-            wcs = yaml.load(f)
+            wcs = yaml.load(f, Loader=YAMLLoader)
         meta = wcs.get('@metadata@', {})
         if 'wcxf-relevant' in meta and meta['wcxf-relevant']:
             del wcs['@metadata@']
@@ -1,8 +1,13 @@
 import unittest
+import io
+import numpy as np
+import numpy.testing as npt
 import wcxf
 from wcxf.converters import dsixtools
 import os
 import subprocess
+import tempfile
+import shutil
 
 
 my_path = os.path.dirname(os.path.realpath(__file__))
@@ -22,12 +27,213 @@ with open(os.path.join(data_path, 'WCsInput-CPV-SMEFT.yaml'), 'r') as f:
 
 
 class TestDsixTools(unittest.TestCase):
+    def test_lha2matrix(self):
+        M = np.arange(1, 82).reshape(3, 3, 3, 3) / 7
+        l = dsixtools.matrix2lha(M)
+        self.assertEqual(len(l), 81)
+        self.assertEqual(l[5], [1, 1, 2, 3, M[0, 0, 1, 2]])
+        self.assertIsInstance(l[5][0], int)
+        npt.assert_array_equal(dsixtools.lha2matrix(l, (3, 3, 3, 3)), M)
+        npt.assert_array_equal(dsixtools.lha2matrix([[2, 3, 1.5]], (3, 3)),
+                               [[0, 0, 0], [0, 0, 1.5], [0, 0, 0]])
+        npt.assert_array_equal(dsixtools.lha2matrix([], (3, 3)), np.zeros((3, 3)))
+
+    def test_definitions(self):
+        # the symmetry tables agree with the non-redundant WCxf basis
+        definitions = dsixtools.definitions
+        basis = wcxf.Basis['SMEFT', 'Warsaw']
+        sectors = {}
+        for sector in basis.sectors.values():
+            sectors.update(sector)
+        for name in dsixtools.smeftutil.WC_keys_2f + dsixtools.smeftutil.WC_keys_4f:
+            redundant = definitions.redundant_mask[name]
+            vanishing_im = definitions.vanishing_im_mask[name]
+            for idx in np.ndindex(redundant.shape):
+                key = name + '_' + ''.join(str(i + 1) for i in idx)
+                self.assertEqual(redundant[idx], key not in sectors, msg=key)
+                real = key in sectors and (sectors[key] or {}).get('real', False)
+                self.assertEqual(vanishing_im[idx], real, msg=key)
+        # all keys of the former literal tables, including the SM parameters
+        # that are not known to smeftutil
+        keys = list(dsixtools.smeftutil.C_keys_shape) + ['Theta', 'Thetap', 'Thetas']
+        for name in keys:
+            shape = dsixtools.smeftutil.C_keys_shape.get(name, 1)
+            for table in (definitions.redundant_elements,
+                          definitions.vanishing_im_parts):
+                self.assertIsInstance(table[name], list, msg=name)
+                if shape == 1:
+                    self.assertEqual(table[name], [], msg=name)
+                else:
+                    self.assertTrue(all(len(i) == len(shape) for i in table[name]),
+                                    msg=name)
+        self.assertEqual(definitions.redundant_elements['ll'][:2],
+                         [(0, 0, 1, 0), (0, 0, 2, 0)])
+        self.assertEqual(definitions.vanishing_im_parts['phiq1'],
+                         [(0, 0), (1, 1), (2, 2)])
+
+    def test_symmetrize(self):
+        smeftutil = dsixtools.smeftutil
+        rng = np.random.RandomState(1)
+        points = [{k: rng.randn(*s) + 1j * rng.randn(*s) if s != 1
+                   else rng.randn() + 1j * rng.randn()
+                   for k, s in smeftutil.C_keys_shape.items()}
+                  for i in range(3)]
+        self.assertIsNone(dsixtools.definitions.symmetrization_maps['qqql'])
+        self.assertIsNotNone(dsixtools.definitions.symmetrization_maps['qq1'])
+        stacked = dsixtools._symmetrize({k: np.array([C[k] for C in points])
+                                         for k in points[0]})
+        for i, C in enumerate(points):
+            expected = smeftutil.symmetrize(C)
+            C = dsixtools._symmetrize(C)
+            self.assertEqual(set(C), set(expected))
+            for k, v in expected.items():
+                npt.assert_array_equal(C[k], v, err_msg="Failed for {}".format(k))
+                npt.assert_array_equal(stacked[k][i], v, err_msg="Failed for {}".format(k))
+
+    def test_wc_dict2lha(self):
+        definitions = dsixtools.definitions
+        self.assertEqual(definitions.redundant_mask['qq1'].sum(),
+                         len(definitions.redundant_elements['qq1']))
+        smeftio = dsixtools.SMEFTio()
+        smeftio.load_initial((wcin_lha, options, smin))
+        C = smeftio.C_in
+        d = dsixtools.wc_dict2lha(C)['BLOCK']
+        names = [k for k in dsixtools.smeftutil.WC_keys_4f if 'WC' + k.upper() in d]
+        self.assertTrue(names)
+        for name in names:
+            values = d['WC' + name.upper()]['values']
+            self.assertLessEqual(len(values),
+                                 81 - len(definitions.redundant_elements[name]))
+            for i, j, k, l, v in values:
+                self.assertEqual(v, C[name][i - 1, j - 1, k - 1, l - 1].real)
+                self.assertNotEqual(v, 0)
+                self.assertNotIn((i - 1, j - 1, k - 1, l - 1),
+                                 definitions.redundant_elements[name])
+        d = dsixtools.wc_dict2lha(C, skip_redundant=False, skip_zero=False)['BLOCK']
+        self.assertEqual(len(d['WCQQ1']['values']), 81)
+        self.assertEqual(len(d['IMWCQQ1']['values']),
+                         81 - len(definitions.vanishing_im_parts['qq1']))
+
+    def test_dump_lha(self):
+        wc = wcxf.WC('SMEFT', 'Warsaw', 1000,
+                     {'lq1_1123': 1e-8, 'G': 1e-7,
+                      'phiq1_12': {'Re': 1e-9, 'Im': -2e-9}})
+        smeftio = dsixtools.SMEFTio()
+        smeftio.set_initial_wcxf(wc)
+        d = dsixtools.wc_dict2lha(smeftio.C_in)
+        # only the non-zero, non-redundant elements are written
+        self.assertEqual(len(d['BLOCK']['WCLQ1']['values']), 1)
+        self.assertEqual(len(d['BLOCK']['WCPHIQ1']['values']), 1)
+        self.assertEqual(len(d['BLOCK']['IMWCPHIQ1']['values']), 1)
+        self.assertNotIn('WCQQ1', d['BLOCK'])
+        s = dsixtools.dump_lha((k, v['values']) for k, v in d['BLOCK'].items())
+        self.assertEqual(s, dsixtools.pylha.dump(d, fmt='lha'))
+        # streaming
+        stream = io.StringIO()
+        smeftio.dump(smeftio.C_in, stream=stream)
+        self.assertEqual(stream.getvalue(), smeftio.dump(smeftio.C_in))
+        self.assertEqual(dsixtools.pylha.load(stream.getvalue())['BLOCK']['WCLQ1'],
+                         d['BLOCK']['WCLQ1'])
+
     def test_smeftio(self):
         smeftio = dsixtools.SMEFTio()
         smeftio.load_wcxf(wcin_json)
         smeftio.load_wcxf(wcin_yaml)
         smeftio.load_initial((wcin_lha, options, smin))
 
+    def test_scaling(self):
+        basis = wcxf.Basis['SMEFT', 'Warsaw']
+        powers = dsixtools._basis_powers()
+        self.assertEqual(len(powers), len(basis.all_wcs))
+        self.assertEqual(powers[basis.wc_index['llphiphi_12']], 1)
+        self.assertEqual(powers[basis.wc_index['G']], 2)
+        self.assertEqual(powers[basis.wc_index['lq1_1123']], 2)
+        wc = wcxf.WC('SMEFT', 'Warsaw', 1000,
+                     {'lq1_1123': 1e-8, 'G': 1e-7,
+                      'llphiphi_12': {'Re': 1e-15, 'Im': 2e-15}})
+        smeftio = dsixtools.SMEFTio()
+        smeftio.set_initial_wcxf(wc, scale_high=1e4)
+        self.assertAlmostEqual(smeftio.C_in['G'], 10, delta=1e-12)
+        self.assertAlmostEqual(smeftio.C_in['llphiphi'][0, 1], 1e-11 + 2e-11j,
+                               delta=1e-24)
+        d = smeftio.get_wcxf(smeftio.C_in, 1000).dict
+        self.assertEqual(set(d), set(wc.dict))
+        for k, v in wc.dict.items():
+            self.assertAlmostEqual(d[k], v, delta=abs(v) * 1e-14)
+
+    def test_set_initial_ensemble(self):
+        wcs = [wcxf.WC.load(wcin_json)]
+        wcs.append(wcxf.WC('SMEFT', 'Warsaw', 2000,
+                           {'lq1_1123': 1e-8, 'G': 1e-7,
+                            'llphiphi_12': {'Re': 1e-15, 'Im': 2e-15}}))
+        smeftio = dsixtools.SMEFTio()
+        smeftio.set_initial_ensemble(wcs, scale_high=[1e4, 5e3])
+        npt.assert_array_equal(smeftio.scale_in, [wcs[0].scale, 2000])
+        self.assertEqual(smeftio.C_in['qq1'].shape, (2, 3, 3, 3, 3))
+        self.assertEqual(smeftio.C_in['G'].shape, (2,))
+        for i, wc in enumerate(wcs):
+            single = dsixtools.SMEFTio()
+            single.set_initial_wcxf(wc, scale_high=[1e4, 5e3][i])
+            self.assertEqual(set(single.C_in), set(smeftio.C_in))
+            for k, v in single.C_in.items():
+                npt.assert_allclose(smeftio.C_in[k][i], v, rtol=1e-14,
+                                    err_msg="Failed for {}".format(k))
+        with self.assertRaises(ValueError):
+            smeftio.set_initial_ensemble([wcxf.WC('WET', 'flavio', 160, {})])
+
+    def test_rotate_defaultbasis_ensemble(self):
+        smeftio = dsixtools.SMEFTio()
+        smeftio.load_initial((wcin_lha, options, smin))
+        points = []
+        rng = np.random.RandomState(2)
+        for i in range(3):
+            C = {k: np.asarray(v) * (1 + i) for k, v in smeftio.C_in.items()}
+            C['Gd'] = smeftio.C_in['Gd']
+            # generic symmetric neutrino mass matrix, whose Takagi
+            # factorization needs a matrix square root
+            m = 1e-3 * (rng.randn(3, 3) + 1j * rng.randn(3, 3))
+            C['llphiphi'] = C['llphiphi'] + m + m.T
+            points.append(C)
+        stacked = {k: np.array([C[k] for C in points]) for k in points[0]}
+        # SM parameters can be shared by all points
+        stacked['Gd'] = smeftio.C_in['Gd']
+        scales = [1e4, 2e4, 5e3]
+        smeftio.scale_high = np.array(scales)
+        rotated = smeftio.rotate_defaultbasis_ensemble(stacked)
+        self.assertEqual(rotated['qq1'].shape, (3, 3, 3, 3, 3))
+        for i, C in enumerate(points):
+            smeftio.scale_high = scales[i]
+            single = smeftio.rotate_defaultbasis(C)
+            self.assertEqual(set(single), set(rotated))
+            for k, v in single.items():
+                npt.assert_allclose(rotated[k][i], v, rtol=1e-12, atol=1e-15,
+                                    err_msg="Failed for {}".format(k))
+
+    def test_read_lha(self):
+        tensors, scalars, found = dsixtools.read_lha((wcin_lha, options, smin))
+        d = {'BLOCK': {}}
+        for s in (wcin_lha, options, smin):
+            d['BLOCK'].update(dsixtools.load(s)['BLOCK'])
+        C = dsixtools.wc_lha2dict(d)
+        npt.assert_array_equal(tensors['dphi'], C['dphi'])
+        npt.assert_array_equal(tensors['dd'], C['dd'])
+        npt.assert_array_equal(tensors['Gu'], dsixtools.sm_lha2dict(d)['Gu'])
+        self.assertEqual(scalars['SCALES'][1], 10000)
+        self.assertEqual(scalars['WC4'], {6: 1})
+        self.assertIn('IMWCDPHI', found)
+        self.assertNotIn('IMWCDD', found)
+        # Fortran exponents and repeated blocks
+        tensors, scalars, found = dsixtools.read_lha((
+            'BLOCK WCDD\n 1 1 1 1 1.0\nBLOCK SCALES\n 1 1.5D+03 # comment\n',
+            'Block WCDD\n 2 3 2 3 2.0\n'))
+        self.assertEqual(scalars['SCALES'][1], 1500)
+        self.assertEqual(tensors['dd'][0, 0, 0, 0], 0)
+        self.assertEqual(tensors['dd'][1, 2, 1, 2], 2)
+        with self.assertRaises(ValueError):
+            dsixtools.read_lha(('1 1 1.0\nBLOCK WCDD\n',))
+        with self.assertRaises(ValueError):
+            dsixtools.read_lha(('# no blocks\n',))
+
     def test_wcxf2dsixtools(self):
         wc = wcxf.WC.load(wcin_json)
         d1 = dsixtools.load(dsixtools.wcxf2dsixtools(wc))
@@ -71,3 +277,94 @@ class TestDsixTools(unittest.TestCase):
         s = res.stdout.decode('utf-8')
         d2 = wcxf.WC.load(s).dict
         self.assertDictEqual(d1, d2)
+
+    def test_batch(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            wc = wcxf.WC.load(wcin_json)
+            with open(os.path.join(tmpdir, 'p.json'), 'w') as f:
+                wc.dump(fmt='json', stream=f)
+            outdir = os.path.join(tmpdir, 'out')
+            results = list(dsixtools.wcxf2dsixtools_batch(
+                [os.path.join(tmpdir, 'p.json'), wc, wc,
+                 os.path.join(tmpdir, 'missing.json')], outdir, jobs=2))
+            self.assertEqual([r[0] for r in results[1:3]], [1, 2])
+            self.assertEqual([r[1] for r in results[:3]],
+                             [os.path.join(outdir, f)
+                              for f in ('p.dat', '00001.dat', '00002.dat')])
+            self.assertIsNone(results[0][2])
+            self.assertIsNone(results[3][1])
+            self.assertIn('missing.json', results[3][2])
+            with open(results[0][1]) as f:
+                self.assertEqual(f.read(), dsixtools.wcxf2dsixtools(wc))
+            common = [os.path.join(data_path, 'SMInput-CPV.dat'),
+                      os.path.join(data_path, 'Options.dat')]
+            results = list(dsixtools.dsixtools2wcxf_batch(
+                [os.path.join(data_path, 'WCsInput-CPV-SMEFT.dat'),
+                 results[1][1], os.path.join(tmpdir, 'missing.dat')],
+                common=common))
+            d = wcxf.WC.load(wcin_yaml).dict
+            self.assertEqual(results[0][1].dict, d)
+            self.assertEqual(results[1][1].dict.keys(), d.keys())
+            self.assertIsNone(results[2][1])
+            self.assertIsNotNone(results[2][2])
+            # command line
+            res = subprocess.run(['dsixtools2wcxf', '--batch', '--jobs', '2',
+                                  '--common', common[0], '--common', common[1],
+                                  os.path.join(data_path, 'WCsInput-CPV-SMEFT.dat'),
+                                  outdir],
+                                 stdout=subprocess.PIPE)
+            self.assertEqual(res.returncode, 0)
+            wcs = list(wcxf.iter_load(res.stdout.decode('utf-8')))
+            self.assertEqual(len(wcs), 4)
+            self.assertEqual(wcs[0].dict, d)
+            lines = os.path.join(tmpdir, 'lines.json')
+            with open(lines, 'w') as f:
+                wcxf.dump_many(wcs, f)
+            res = subprocess.run(['wcxf2dsixtools', '--lines', '--outdir',
+                                  os.path.join(tmpdir, 'lines'), lines])
+            self.assertEqual(res.returncode, 0)
+            self.assertEqual(len(os.listdir(os.path.join(tmpdir, 'lines'))), 4)
+            for jobs in ('-1', 'x'):
+                res = subprocess.run(['wcxf2dsixtools', '--jobs', jobs,
+                                      '--outdir', outdir, lines],
+                                     stderr=subprocess.PIPE)
+                self.assertEqual(res.returncode, 2)
+                self.assertIn('invalid number of jobs',
+                              res.stderr.decode('utf-8'))
+            # options that would be ignored are rejected
+            for args in (['wcxf2dsixtools', '--output',
+                          os.path.join(tmpdir, 'out.dat'), '--outdir', outdir, lines],
+                         ['wcxf2dsixtools', '--jobs', '2', lines],
+                         ['dsixtools2wcxf', '--unordered', lines]):
+                res = subprocess.run(args, stderr=subprocess.PIPE)
+                self.assertEqual(res.returncode, 2)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_batch_names(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            wc = wcxf.WC.load(wcin_json)
+            inputs = []
+            for name in ('a/p.json', 'b/p.json', 'p.json.gz', '00001.json'):
+                path = os.path.join(tmpdir, name)
+                if not os.path.isdir(os.path.dirname(path)):
+                    os.makedirs(os.path.dirname(path))
+                with wcxf.open_file(path, 'w') as f:
+                    wc.dump(fmt='json', stream=f)
+                inputs.append(path)
+            outdir = os.path.join(tmpdir, 'out')
+            results = list(dsixtools.wcxf2dsixtools_batch(
+                inputs + [wc], outdir, jobs=2))
+            self.assertEqual([r[2] for r in results], [None] * 5)
+            self.assertEqual([os.path.basename(r[1]) for r in results],
+                             ['p.dat', 'p-1.dat', 'p-2.dat', '00001.dat',
+                              '00004.dat'])
+            self.assertEqual(len(os.listdir(outdir)), 5)
+            results = list(dsixtools.wcxf2dsixtools_batch(
+                [inputs[3], wc], outdir))
+            self.assertEqual([os.path.basename(r[1]) for r in results],
+                             ['00001.dat', '00001-1.dat'])
+        finally:
+            shutil.rmtree(tmpdir)
@@ -0,0 +1,244 @@
+"""Diagnostics of the cost of importing the wcxf package.
+
+The start-up profile is measured in a fresh Python interpreter, since
+everything of interest is cached after the first import in the current
+process. The child process times (and optionally traces the memory of)
+the import of the heavy dependencies, the globbing and parsing of each
+EFT and basis file, the discovery of plugins and the registration of
+translators and matchers.
+"""
+
+from collections import OrderedDict
+import json
+import os
+import subprocess
+import sys
+
+
+# top-level modules whose first import is timed, and the component of the
+# start-up they are attributed to
+TRACKED_MODULES = OrderedDict([
+    ('wcxf', 'wcxf'),
+    ('wcxf.classes', 'wcxf'),
+    ('wcxf.translators', 'wcxf'),
+    ('wcxf.matchers', 'wcxf'),
+    ('wcxf.plugins', 'wcxf'),
+    ('yaml', 'yaml'),
+    ('pandas', 'pandas'),
+    ('ckmutil', 'ckmutil'),
+    ('wilson', 'wilson'),
+])
+
+# components of the start-up that are actually used by each subcommand
+REQUIREMENTS = OrderedDict([
+    ('convert', ('wcxf', 'yaml')),
+    ('validate', ('wcxf', 'yaml', 'bases')),
+    ('translate', ('wcxf', 'yaml', 'bases', 'plugins', 'wilson', 'ckmutil')),
+    ('match', ('wcxf', 'yaml', 'bases', 'plugins', 'wilson', 'ckmutil')),
+])
+
+
+# script executed in the child interpreter. It prints a JSON list of steps
+# to standard output.
+_PROBE = r'''
+import sys
+import time
+import json
+import os
+import glob
+import importlib.abc
+
+TRACKED_MODULES = {tracked}
+TRACK_MEMORY = {track_memory}
+
+if TRACK_MEMORY:
+    import tracemalloc
+    tracemalloc.start()
+
+def _memory():
+    if TRACK_MEMORY:
+        return tracemalloc.get_traced_memory()[0]
+    return 0
+
+steps = []
+_stack = [[0, 0]]
+
+def _timed(name, component, func, *args, **kwargs):
+    t0 = time.perf_counter()
+    m0 = _memory()
+    _stack.append([0, 0])
+    try:
+        return func(*args, **kwargs)
+    finally:
+        dt = time.perf_counter() - t0
+        dm = _memory() - m0
+        children = _stack.pop()
+        _stack[-1][0] += dt
+        _stack[-1][1] += dm
+        steps.append({{'name': name, 'component': component,
+                       'time': dt - children[0], 'memory': dm - children[1],
+                       'deferred': _deferred}})
+
+_deferred = False
+
+
+def _patch_classes(module):
+    # attribute the parsing of every EFT and basis file
+    load = module.WCxf.load.__func__
+    def timed_load(cls, stream, **kwargs):
+        name = os.path.basename(getattr(stream, 'name', '<string>'))
+        return _timed('parse ' + name, 'bases', load, cls, stream, **kwargs)
+    module.WCxf.load = classmethod(timed_load)
+
+
+class _TimingLoader(importlib.abc.Loader):
+    def __init__(self, loader, fullname):
+        self.loader = loader
+        self.fullname = fullname
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        _timed('import ' + self.fullname, TRACKED_MODULES[self.fullname],
+               self.loader.exec_module, module)
+        if self.fullname == 'wcxf.classes':
+            _patch_classes(module)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in TRACKED_MODULES:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None:
+            spec.loader = _TimingLoader(spec.loader, fullname)
+        return spec
+
+
+_glob = glob.glob
+def _timed_glob(pattern, *args, **kwargs):
+    return _timed('glob ' + os.path.basename(pattern), 'bases',
+                  _glob, pattern, *args, **kwargs)
+
+sys.meta_path.insert(0, _TimingFinder())
+glob.glob = _timed_glob
+t0 = time.perf_counter()
+m0 = _memory()
+import wcxf
+total = {{'time': time.perf_counter() - t0, 'memory': _memory() - m0}}
+glob.glob = _glob
+# import what has been deferred by `import wcxf`
+_deferred = True
+for name in TRACKED_MODULES:
+    if name not in sys.modules:
+        __import__(name)
+for group in ('wcxf.translators', 'wcxf.matchers'):
+    _timed('discover ' + group, 'plugins', wcxf.plugins.entry_points, group)
+json.dump({{'total': total, 'steps': steps}}, sys.stdout)
+'''
+
+
+def _run_probe(track_memory=False, python=None):
+    """Run the probe script in a fresh interpreter and return the decoded
+    result."""
+    script = _PROBE.format(tracked=repr(dict(TRACKED_MODULES)),
+                           track_memory=repr(track_memory))
+    env = os.environ.copy()
+    # make sure the child imports the same wcxf as the parent
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([root] + [p for p in
+                                         env.get('PYTHONPATH', '').split(os.pathsep)
+                                         if p])
+    res = subprocess.run([python or sys.executable, '-c', script],
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                         env=env)
+    if res.returncode != 0:
+        raise RuntimeError("Start-up probe failed:\n"
+                           + res.stderr.decode('utf-8', 'replace'))
+    return json.loads(res.stdout.decode('utf-8'))
+
+
+def profile_startup(memory=True, python=None):
+    """Measure the time and memory of `import wcxf` in a fresh interpreter.
+
+    Returns a dictionary with keys 'total' (a dictionary with keys 'time' in
+    seconds and 'memory' in bytes) and 'steps', a list of dictionaries
+    with keys 'name', 'component', 'time', 'memory' and 'deferred'. Times and
+    memory of the steps exclude nested steps. Deferred steps have not been
+    executed by `import wcxf` but only when the corresponding module was
+    imported afterwards; they do not contribute to the total.
+
+    Since tracing memory allocations slows down the import considerably,
+    the memory is measured in a second run if `memory` is True (default)."""
+    res = _run_probe(track_memory=False, python=python)
+    for step in res['steps']:
+        step['memory'] = None
+    res['total']['memory'] = None
+    if memory:
+        res_mem = _run_probe(track_memory=True, python=python)
+        # the steps of both runs come in the same order
+        for step, step_mem in zip(res['steps'], res_mem['steps']):
+            if step['name'] == step_mem['name']:
+                step['memory'] = step_mem['memory']
+        res['total']['memory'] = res_mem['total']['memory']
+    return res
+
+
+def avoidable(profile, command):
+    """Return a dictionary mapping the components of the start-up that are
+    not needed by the subcommand `command` to their total time in seconds."""
+    needed = REQUIREMENTS[command]
+    d = OrderedDict()
+    for step in profile['steps']:
+        if step['deferred'] or step['component'] in needed:
+            continue
+        d[step['component']] = d.get(step['component'], 0) + step['time']
+    return d
+
+
+def _format_memory(m):
+    if m is None:
+        return ''
+    return '{:.2f}'.format(m / 1024**2)
+
+
+def startup_report(profile, commands=None):
+    """Return a plain text report of a start-up profile returned by
+    `profile_startup`, with suggestions which components could be avoided
+    for the subcommands `commands` (default: all)."""
+    total = profile['total']
+    s = "Start-up profile of `import wcxf`: {:.1f} ms".format(1e3 * total['time'])
+    if total['memory'] is not None:
+        s += ", {} MB".format(_format_memory(total['memory']))
+    s += "\n\n"
+    s += "{:<45} {:<10} {:>10} {:>12}\n".format('step', 'component',
+                                               'time [ms]', 'memory [MB]')
+    for step in profile['steps']:
+        name = step['name']
+        if step['deferred']:
+            name += ' (deferred)'
+        s += "{:<45} {:<10} {:>10.1f} {:>12}\n".format(name, step['component'],
+                                                       1e3 * step['time'],
+                                                       _format_memory(step['memory']))
+    s += "\nComponents that are not needed by the subcommands:\n\n"
+    for command in commands or REQUIREMENTS:
+        d = avoidable(profile, command)
+        if not d:
+            s += "- {}: none\n".format(command)
+            continue
+        s += "- {}: {} ({:.1f} ms in total)\n".format(
+            command,
+            ', '.join('{} ({:.1f} ms)'.format(k, 1e3 * v) for k, v in d.items()),
+            1e3 * sum(d.values()))
+    return s
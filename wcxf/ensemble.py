@@ -0,0 +1,318 @@
+"""Ensembles of Wilson coefficient points and their columnar export.
+
+An ensemble holds many points in the same EFT and basis as a complex
+matrix with one row per point and one column per coefficient. It can be
+written to and read from
+
+- Parquet files (`.parquet`) or Arrow IPC files (`.arrow`, `.feather`),
+  which require pyarrow, and
+- NumPy `.npz` files, which do not need anything beyond NumPy.
+
+Two table layouts are supported: the 'wide' layout has a `scale` column and
+one real (`<name>.Re`) and one imaginary (`<name>.Im`) column per
+coefficient; the 'long' layout only stores the non-zero coefficients, with
+the columns `point`, `coefficient`, `re` and `im`, and the scales in a
+separate table (Parquet/Arrow metadata) or array (`.npz`). The EFT, basis,
+layout and coefficient order are stored as JSON metadata.
+"""
+
+import json
+import os
+import numpy as np
+from .classes import WC, Basis
+
+
+# file name extensions and the corresponding formats
+_extensions = {'.parquet': 'parquet', '.pq': 'parquet',
+               '.arrow': 'arrow', '.feather': 'arrow',
+               '.npz': 'npz'}
+
+# key of the WCxf metadata in the Parquet/Arrow schema metadata
+_metadata_key = b'wcxf'
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet and Arrow files require the pyarrow package."
+                          " Use the .npz format instead.")
+    return pyarrow
+
+
+def _format(path, fmt):
+    """Determine the format from `fmt` or the file name extension."""
+    if fmt is not None:
+        fmt = fmt.lower()
+    else:
+        fmt = _extensions.get(os.path.splitext(str(path))[1].lower())
+    if fmt not in ('parquet', 'arrow', 'npz'):
+        raise ValueError("Format {} unknown: use 'parquet', 'arrow' or 'npz'."
+                         .format(fmt))
+    return fmt
+
+
+def _table_metadata(schema):
+    """Return the WCxf metadata of a Parquet/Arrow schema."""
+    return json.loads(schema.metadata[_metadata_key].decode('utf-8'))
+
+
+def _wide_values(table, keys):
+    """Return the scales and values of a table (or record batch) in the
+    wide layout."""
+    scales = table.column('scale').to_numpy()
+    values = np.empty((len(scales), len(keys)), dtype=complex)
+    for i, k in enumerate(keys):
+        values[:, i].real = table.column(k + '.Re').to_numpy()
+        values[:, i].imag = table.column(k + '.Im').to_numpy()
+    return scales, values
+
+
+def _long_entries(table, keys):
+    """Return the point and coefficient indices and the values of a table
+    (or record batch) in the long layout."""
+    coefficient = table.column('coefficient')
+    if hasattr(coefficient, 'combine_chunks'):
+        coefficient = coefficient.combine_chunks()
+    # map the dictionary of the file to the stored key order
+    index = {k: i for i, k in enumerate(keys)}
+    mapping = np.array([index[k] for k in coefficient.dictionary.to_pylist()],
+                       dtype=int)
+    columns = mapping[coefficient.indices.to_numpy()]
+    points = table.column('point').to_numpy()
+    values = table.column('re').to_numpy() + 1j * table.column('im').to_numpy()
+    return points, columns, values
+
+
+def _iter_batches(path, fmt):
+    """Return the WCxf metadata and an iterator over the record batches of a
+    Parquet or Arrow file, which are only read when they are requested."""
+    pa = _import_pyarrow()
+    if fmt == 'parquet':
+        import pyarrow.parquet
+        f = pyarrow.parquet.ParquetFile(path)
+        return _table_metadata(f.schema_arrow), f.iter_batches()
+    reader = pa.ipc.open_file(pa.memory_map(path))
+    batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    return _table_metadata(reader.schema), batches
+
+
+def _iter_long(eft, basis, keys, scales, batches):
+    """Iterate over the points of the long layout, whose entries are ordered
+    by point, collecting the entries of each point from the batches."""
+    current = 0
+    values = np.zeros(len(keys), dtype=complex)
+    for batch in batches:
+        points, columns, entries = _long_entries(batch, keys)
+        for point in np.unique(points):
+            while current < point:
+                yield WC.from_array(eft, basis, scales[current], values, keys=keys)
+                values = np.zeros(len(keys), dtype=complex)
+                current += 1
+            selected = points == point
+            values[columns[selected]] = entries[selected]
+    while current < len(scales):
+        yield WC.from_array(eft, basis, scales[current], values, keys=keys)
+        values = np.zeros(len(keys), dtype=complex)
+        current += 1
+
+
+class Ensemble(object):
+    """Class representing a set of Wilson coefficient points in the same EFT
+    and basis.
+
+    Attributes:
+
+    - `eft`, `basis`: EFT and basis names
+    - `keys`: list of coefficient names (the columns of `values`)
+    - `scales`: float array of shape (N,) with the scale of every point
+    - `values`: complex array of shape (N, len(keys))
+    """
+
+    def __init__(self, eft, basis, scales, values, keys=None):
+        """Instantiate the ensemble. `keys` defaults to all coefficients of
+        the basis."""
+        self.eft = eft
+        self.basis = basis
+        if keys is None:
+            keys = Basis[eft, basis].all_wcs
+        self.keys = list(keys)
+        self.values = np.asarray(values, dtype=complex)
+        self.scales = np.broadcast_to(np.asarray(scales, dtype=float),
+                                      (len(self.values),)).copy()
+        if self.values.shape != (len(self.scales), len(self.keys)):
+            raise ValueError("Values of shape {} do not match {} points and {} keys"
+                             .format(self.values.shape, len(self.scales), len(self.keys)))
+
+    @classmethod
+    def from_wcs(cls, wcs, keys=None):
+        """Create an ensemble from an iterable of `WC` instances in the same
+        EFT and basis. `keys` defaults to the coefficients present in any
+        of the points, in the order of the basis if it is defined."""
+        wcs = list(wcs)
+        if not wcs:
+            raise ValueError("No Wilson coefficients given")
+        eft, basis = wcs[0].eft, wcs[0].basis
+        for wc in wcs:
+            if (wc.eft, wc.basis) != (eft, basis):
+                raise ValueError("All points must be in the same EFT and basis")
+        if keys is None:
+            present = set(k for wc in wcs for k in wc.dict)
+            try:
+                keys = [k for k in Basis[eft, basis].all_wcs if k in present]
+            except (AttributeError, KeyError):
+                keys = []
+            known = set(keys)
+            for wc in wcs:
+                keys += [k for k in wc.dict if k not in known]
+                known.update(wc.dict)
+        values = np.array([wc.to_array(keys) for wc in wcs])
+        scales = [wc.scale for wc in wcs]
+        return cls(eft, basis, scales, values.reshape(len(wcs), len(keys)), keys)
+
+    def __len__(self):
+        return len(self.scales)
+
+    def __getitem__(self, i):
+        """Return the `i`-th point as a `WC` instance."""
+        return WC.from_array(self.eft, self.basis, self.scales[i],
+                             self.values[i], keys=self.keys)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return ("wcxf.Ensemble(eft='{}', basis='{}', {} points, {} keys)"
+                .format(self.eft, self.basis, len(self), len(self.keys)))
+
+    def _metadata(self, layout):
+        return {'eft': self.eft, 'basis': self.basis, 'layout': layout,
+                'keys': self.keys}
+
+    def _long(self):
+        """Return the point and coefficient indices and the values of the
+        non-zero entries."""
+        point, coefficient = np.nonzero(self.values)
+        return point, coefficient, self.values[point, coefficient]
+
+    def to_table(self, layout='wide'):
+        """Return a `pyarrow.Table` in the layout `layout` ('wide' or
+        'long'). The scales of the long layout are stored in the schema
+        metadata."""
+        pa = _import_pyarrow()
+        metadata = self._metadata(layout)
+        if layout == 'wide':
+            columns = {'scale': self.scales}
+            for i, k in enumerate(self.keys):
+                columns[k + '.Re'] = self.values[:, i].real
+                columns[k + '.Im'] = self.values[:, i].imag
+            table = pa.table(columns)
+        elif layout == 'long':
+            point, coefficient, values = self._long()
+            coefficient = pa.DictionaryArray.from_arrays(
+                pa.array(coefficient.astype(np.int32)), pa.array(self.keys))
+            table = pa.table({'point': point, 'coefficient': coefficient,
+                              're': values.real, 'im': values.imag})
+            metadata['scales'] = self.scales.tolist()
+        else:
+            raise ValueError("Layout {} unknown: use 'wide' or 'long'.".format(layout))
+        return table.replace_schema_metadata({_metadata_key: json.dumps(metadata)})
+
+    @classmethod
+    def from_table(cls, table):
+        """Create an ensemble from a `pyarrow.Table` written by `to_table`."""
+        metadata = _table_metadata(table.schema)
+        keys = metadata['keys']
+        if metadata['layout'] == 'wide':
+            scales, values = _wide_values(table, keys)
+        else:
+            scales = np.array(metadata['scales'], dtype=float)
+            points, columns, entries = _long_entries(table, keys)
+            values = np.zeros((len(scales), len(keys)), dtype=complex)
+            values[points, columns] = entries
+        return cls(metadata['eft'], metadata['basis'], scales, values, keys)
+
+    def dump(self, path, fmt=None, layout='wide'):
+        """Write the ensemble to the file `path`.
+
+        The format `fmt` ('parquet', 'arrow' or 'npz') is determined from the
+        file name extension if not given. `layout` should be 'wide'
+        (default) or 'long' (for sparse points)."""
+        fmt = _format(path, fmt)
+        if fmt == 'npz':
+            self._dump_npz(path, layout)
+            return
+        _import_pyarrow()
+        table = self.to_table(layout)
+        if fmt == 'parquet':
+            import pyarrow.parquet
+            pyarrow.parquet.write_table(table, path)
+        else:
+            import pyarrow.feather
+            pyarrow.feather.write_feather(table, path)
+
+    def _dump_npz(self, path, layout):
+        metadata = json.dumps(self._metadata(layout))
+        if layout == 'wide':
+            arrays = {'values': self.values}
+        elif layout == 'long':
+            point, coefficient, values = self._long()
+            arrays = {'point': point, 'coefficient': coefficient, 'values': values}
+        else:
+            raise ValueError("Layout {} unknown: use 'wide' or 'long'.".format(layout))
+        # with a file object, NumPy does not append `.npz` to the name
+        with open(path, 'wb') as f:
+            np.savez(f, metadata=metadata, scales=self.scales, **arrays)
+
+    @classmethod
+    def load(cls, path, fmt=None):
+        """Read an ensemble from the file `path` written by `dump`."""
+        fmt = _format(path, fmt)
+        if fmt == 'npz':
+            return cls._load_npz(path)
+        _import_pyarrow()
+        if fmt == 'parquet':
+            import pyarrow.parquet
+            table = pyarrow.parquet.read_table(path)
+        else:
+            import pyarrow.feather
+            table = pyarrow.feather.read_table(path)
+        return cls.from_table(table)
+
+    @classmethod
+    def _load_npz(cls, path):
+        with np.load(path) as f:
+            metadata = json.loads(str(f['metadata']))
+            keys = metadata['keys']
+            scales = f['scales']
+            if metadata['layout'] == 'wide':
+                values = f['values']
+            else:
+                values = np.zeros((len(scales), len(keys)), dtype=complex)
+                values[f['point'], f['coefficient']] = f['values']
+        return cls(metadata['eft'], metadata['basis'], scales, values, keys)
+
+
+def iter_load(path, fmt=None):
+    """Iterate over the points of an ensemble file, yielding `WC`
+    instances.
+
+    Parquet files are read by record batch and Arrow files by record batch
+    of the memory-mapped file, so only one batch is held in memory at a
+    time (plus the scales of the long layout). The arrays of `.npz` files
+    cannot be read in parts, so these files are loaded at once."""
+    fmt = _format(path, fmt)
+    if fmt == 'npz':
+        yield from Ensemble.load(path, fmt=fmt)
+        return
+    metadata, batches = _iter_batches(path, fmt)
+    eft, basis, keys = metadata['eft'], metadata['basis'], metadata['keys']
+    if metadata['layout'] == 'wide':
+        for batch in batches:
+            scales, values = _wide_values(batch, keys)
+            for scale, row in zip(scales, values):
+                yield WC.from_array(eft, basis, scale, row, keys=keys)
+    else:
+        scales = np.array(metadata['scales'], dtype=float)
+        yield from _iter_long(eft, basis, keys, scales, batches)
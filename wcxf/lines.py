@@ -0,0 +1,81 @@
+"""Reading and writing many Wilson coefficient files in one stream.
+
+In the WCxf-lines format, every line contains one Wilson coefficient file
+as compact JSON. A line without `values` is a header: its keys (typically
+`eft` and `basis`) apply to all following lines that do not specify them
+themselves, until the next header. Empty lines are ignored. For example:
+
+    {"eft":"SMEFT","basis":"Warsaw"}
+    {"scale":1000.0,"values":{"lq1_1123":1e-08}}
+    {"scale":1000.0,"values":{"lq1_1123":2e-08}}
+"""
+
+import json
+from .classes import WC, _json_loads, _json_dumps_fast
+
+
+# keys that are written to the header line if `header` is True
+HEADER_KEYS = ('eft', 'basis')
+
+
+def iter_load(stream, array=False):
+    """Iterate over the Wilson coefficient files in a stream (or string) in
+    the WCxf-lines format, yielding `WC` instances.
+
+    Lines are only read when the next instance is requested, so streams of
+    any length can be processed in constant memory. If `array` is True, the
+    values are loaded into arrays (see `WC.load`)."""
+    if isinstance(stream, (str, bytes)):
+        stream = stream.splitlines()
+    header = {}
+    for i, line in enumerate(stream):
+        if not line.strip():
+            continue
+        try:
+            d = _json_loads(line)
+        except ValueError as e:
+            raise ValueError("Line {}: {}".format(i + 1, e))
+        if not isinstance(d, dict):
+            raise ValueError("Line {}: expected a JSON object".format(i + 1))
+        if 'values' not in d:
+            header = d
+            continue
+        if header:
+            d = dict(header, **d)
+        try:
+            wc = WC._from_dict(d, array=array)
+        except TypeError as e:
+            # missing or unexpected fields
+            raise ValueError("Line {}: {}".format(i + 1, e))
+        yield wc
+
+
+def _dumps_line(d):
+    s = _json_dumps_fast(d)
+    if s is None:
+        s = json.dumps(d, separators=(',', ':'))
+    return s + '\n'
+
+
+def dump_many(wcs, stream=None, header=True):
+    """Dump an iterable of `WC` instances in the WCxf-lines format to a
+    writable file-like object or, if `stream` is None (default), return a
+    string.
+
+    If `header` is True (default), the EFT and basis are written to a header
+    line, which is repeated whenever they change, instead of to every line.
+    Instances are only requested from the iterable when the previous one
+    has been written."""
+    lines = []
+    write = stream.write if stream is not None else lines.append
+    current = None
+    for wc in wcs:
+        d = wc._public_dict()
+        if header:
+            h = {k: d.pop(k) for k in HEADER_KEYS}
+            if h != current:
+                write(_dumps_line(h))
+                current = h
+        write(_dumps_line(d))
+    if stream is None:
+        return ''.join(lines)
@@ -1,3 +1,50 @@
-# Import matchers from the wilson package
+# Matchers are registered when the modules defining them are imported.
+# Since this is expensive, it is only done by `load`, which is called on the
+# first lookup of a matcher that is not registered yet:
+#
+# - modules declared in the `wcxf.matchers` entry point group (see
+#   `wcxf.plugins`) are imported only for the keys they declare;
+# - the matchers of the wilson package, which declares no entry points, are
+#   listed in `WILSON` and registered with a placeholder function that only
+#   imports `wilson.match` when it is called (see `plugins.lazy_function`);
+# - for any other key, wilson is imported, since it might be provided by a
+#   wilson version newer than `WILSON` (`test_wcxf.py` checks `WILSON`
+#   against the matchers registered by the installed wilson);
+# - if all matchers are requested, all entry points and wilson are imported.
 
-import wilson
+from wcxf import plugins
+
+
+# keys of the matchers defined in the module `wilson.match`
+WILSON = [
+    ('SMEFT', 'Warsaw up', 'WET', 'JMS'),
+    ('SMEFT', 'Warsaw', 'WET', 'JMS'),
+    ('SMEFT', 'Warsaw', 'WET', 'flavio'),
+    ('SMEFT', 'Warsaw up', 'WET', 'flavio'),
+    ('SMEFT', 'Warsaw', 'WET', 'EOS'),
+    ('SMEFT', 'Warsaw', 'WET', 'Bern'),
+    ('WET', 'flavio', 'WET-4', 'flavio'),
+    ('WET-4', 'flavio', 'WET-3', 'flavio'),
+    ('WET', 'Bern', 'WET-4', 'Bern'),
+    ('WET-4', 'Bern', 'WET-3', 'Bern'),
+    ('WET', 'JMS', 'WET-4', 'JMS'),
+    ('WET-4', 'JMS', 'WET-3', 'JMS'),
+    ('WET-3', 'JMS', 'WET-2', 'JMS'),
+]
+
+
+def load(key=None):
+    """Import the modules providing the matcher with the key
+    `(from_eft, from_basis, to_eft, to_basis)`, or all matchers if `key` is
+    None."""
+    if key is None:
+        plugins.load_all('wcxf.matchers')
+        import wilson
+    elif plugins.load('wcxf.matchers', key):
+        pass
+    elif tuple(key) in WILSON:
+        from wcxf.classes import Matcher
+        key = tuple(key)
+        Matcher(*key, plugins.lazy_function(Matcher, key, 'wilson.match'))
+    else:
+        import wilson
@@ -0,0 +1,117 @@
+"""Lazy loading of translators and matchers provided by other packages.
+
+A package can provide translators (matchers) by declaring entry points in
+the group `wcxf.translators` (`wcxf.matchers`). The name of each entry
+point is the key of a translator, `EFT/from_basis/to_basis`, (of a matcher,
+`from_EFT/from_basis/to_EFT/to_basis`) and its value is the module that
+registers it with the `wcxf.translator` (`wcxf.matcher`) decorator, e.g.
+in `setup.py`:
+
+```python
+entry_points={
+    'wcxf.translators': [
+        'SMEFT/Warsaw/My basis = mypackage.translate',
+    ],
+}
+```
+
+The module is only imported on the first lookup of one of the keys it
+declares.
+
+Packages that declare no entry points, like wilson, can be listed in static
+tables instead (see `wcxf.translators` and `wcxf.matchers`). Their keys are
+registered with a placeholder function (see `lazy_function`), so that the
+package is only imported when the translator (matcher) is actually used.
+"""
+
+import importlib
+
+
+# separator of the EFT and basis names in entry point names
+SEPARATOR = '/'
+
+# cache of the entry points, mapping group names to dictionaries that map
+# keys to lists of entry points
+_entry_points = {}
+
+# entry points that have already been loaded
+_loaded = set()
+
+
+def _iter_entry_points(group):
+    """Iterate over all installed entry points of the group `group`."""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python < 3.8
+        import pkg_resources
+        return pkg_resources.iter_entry_points(group)
+    eps = entry_points()
+    if hasattr(eps, 'select'):  # Python >= 3.10
+        return eps.select(group=group)
+    return eps.get(group, [])
+
+
+def entry_points(group):
+    """Return a dictionary mapping the keys (tuples of EFT and basis names)
+    declared in the entry point group `group` to lists of entry points.
+
+    The installed distributions are only scanned once per group."""
+    if group not in _entry_points:
+        d = {}
+        for ep in _iter_entry_points(group):
+            key = tuple(k.strip() for k in ep.name.split(SEPARATOR))
+            d.setdefault(key, []).append(ep)
+        _entry_points[group] = d
+    return _entry_points[group]
+
+
+def _load_entry_point(ep):
+    name = (ep.name, ep.value if hasattr(ep, 'value') else str(ep))
+    if name not in _loaded:
+        ep.load()
+        _loaded.add(name)
+
+
+def load(group, key):
+    """Import the modules declaring the key `key` in the entry point group
+    `group`. Returns False if no module declares it, True otherwise."""
+    eps = entry_points(group).get(tuple(key))
+    if not eps:
+        return False
+    for ep in eps:
+        _load_entry_point(ep)
+    return True
+
+
+def load_all(group):
+    """Import all modules declared in the entry point group `group`."""
+    for eps in entry_points(group).values():
+        for ep in eps:
+            _load_entry_point(ep)
+
+
+def lazy_function(cls, key, module):
+    """Return a function for the instance of `cls` (`Translator` or
+    `Matcher`) with the key `key` that imports `module` and calls the
+    function of the instance registered by it.
+
+    If the module does not register an instance with this key (e.g. since
+    a static table is out of date), the placeholder instance is removed and
+    a ValueError is raised, like `WC.translate` and `WC.match` do for
+    unknown keys."""
+    def function(*args, **kwargs):
+        importlib.import_module(module)
+        instance = cls.instances.get(key)
+        if instance is None or instance.function is function:
+            if instance is not None:
+                del cls.instances[key]
+            raise ValueError("No {} {} found: {} does not provide it.".format(
+                cls.__name__.lower(), key, module))
+        return instance.function(*args, **kwargs)
+    return function
+
+
+def clear_cache():
+    """Forget the entry points found so far, e.g. after installing a
+    package providing translators or matchers."""
+    _entry_points.clear()
@@ -0,0 +1,270 @@
+"""Fast scanning of the header of Wilson coefficient files.
+
+`peek` returns the EFT, basis and scale (and optionally the metadata) of a
+Wilson coefficient file without parsing its values, e.g. to index large
+archives of files. JSON and msgpack files are scanned key by key and the
+`values` are skipped without being decoded; YAML files are scanned line by
+line, only parsing the top-level entries of interest. Reading stops as soon
+as all requested entries have been found.
+"""
+
+import codecs
+import json
+import re
+import yaml
+from .classes import (YAMLLoader, _decompressed, _stream_format, _sniff_format,
+                      _sniff_stream, _load_yaml_json, _import_msgpack,
+                      _msgpack_ext_hook)
+
+
+# top-level entries returned by `peek`
+HEADER_KEYS = ('eft', 'basis', 'scale')
+
+_chunksize = 65536
+
+_decoder = json.JSONDecoder()
+_json_whitespace = re.compile(r'[ \t\n\r]*')
+# characters relevant for skipping a JSON object or array
+_json_structure = re.compile(r'["{}\[\]]')
+# the rest of a JSON string after the opening quote
+_json_string_end = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+# a top-level key of a YAML mapping in block style
+_yaml_key = re.compile(r'''(?:([A-Za-z_][\w-]*)|"([^"]*)"|'([^']*)')\s*:(?:\s|$)''')
+
+
+class _Incomplete(Exception):
+    """Raised when more input is needed."""
+
+
+class _JSONScanner(object):
+    """Scanner for the top-level entries of a JSON object read from a
+    stream in chunks. Parts of the input that have been scanned are
+    discarded."""
+
+    def __init__(self, stream, text=''):
+        self.stream = stream
+        self.buf = text
+        self.pos = 0
+        self.eof = stream is None
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def more(self):
+        """Read the next chunk. Raises ValueError at the end of the input."""
+        if self.eof:
+            raise ValueError("Unexpected end of JSON input")
+        chunk = self.stream.read(_chunksize)
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+    def _whitespace(self):
+        self.pos = _json_whitespace.match(self.buf, self.pos).end()
+        if self.pos == len(self.buf):
+            raise _Incomplete
+
+    def _decode(self):
+        """Decode the JSON value at the current position."""
+        value, end = _decoder.raw_decode(self.buf, self.pos)
+        # a number could continue in the next chunk
+        if not self.eof and (end == len(self.buf)
+                             or self.buf[end] in '0123456789.eE+-'):
+            raise _Incomplete
+        self.pos = end
+        return value
+
+    def _skip(self, state):
+        """Skip the JSON object or array at the current position. `state`
+        is a list with the nesting depth, so that skipping can be continued
+        after reading more input."""
+        buf = self.buf
+        while True:
+            m = _json_structure.search(buf, self.pos)
+            if m is None:
+                self.pos = len(buf)
+                raise _Incomplete
+            c = m.group()
+            if c == '"':
+                m_string = _json_string_end.match(buf, m.end())
+                if m_string is None:
+                    self.pos = m.start()
+                    raise _Incomplete
+                self.pos = m_string.end()
+                continue
+            self.pos = m.end()
+            state[0] += 1 if c in '{[' else -1
+            if state[0] == 0:
+                return
+
+    def _step(self, step, *args):
+        """Call `step` until it does not need more input."""
+        while True:
+            start = self.pos
+            try:
+                return step(*args)
+            except _Incomplete:
+                # skipping keeps its position, everything else restarts
+                if step != self._skip:
+                    self.pos = start
+                self.more()
+            except ValueError:
+                if self.eof:
+                    raise
+                self.pos = start
+                self.more()
+
+    def _expect(self, chars):
+        self._step(self._whitespace)
+        c = self.buf[self.pos]
+        if c not in chars:
+            raise ValueError("Expected one of {!r} in JSON input, found {!r}"
+                             .format(chars, c))
+        self.pos += 1
+        return c
+
+    def scan(self, keys):
+        """Return a dictionary with the top-level entries `keys`, stopping
+        as soon as all of them have been found."""
+        d = {}
+        self._expect('{')
+        self._step(self._whitespace)
+        if self.buf[self.pos] == '}':
+            return d
+        while True:
+            self._step(self._whitespace)
+            key = self._step(self._decode)
+            self._expect(':')
+            self._step(self._whitespace)
+            if key in keys:
+                d[key] = self._step(self._decode)
+                if len(d) == len(keys):
+                    return d
+            elif self.buf[self.pos] in '{[':
+                self._step(self._skip, [0])
+            else:
+                self._step(self._decode)
+            if self._expect(',}') == '}':
+                return d
+
+
+def _iter_lines(stream, text=''):
+    """Iterate over the lines of a string and a stream read in chunks."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buf = text
+    while True:
+        lines = buf.split('\n')
+        for line in lines[:-1]:
+            yield line + '\n'
+        buf = lines[-1]
+        chunk = stream.read(_chunksize) if stream is not None else ''
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            break
+        buf += chunk
+    if buf:
+        yield buf
+
+
+def _scan_yaml(lines, keys):
+    """Tolerant scan of the top-level entries `keys` of a YAML mapping in
+    block style. Other entries are skipped without being parsed."""
+    d = {}
+    block = None
+
+    def finish(block):
+        try:
+            value = yaml.load(''.join(block[1]), Loader=YAMLLoader)
+            d[block[0]] = value[block[0]]
+        except (yaml.YAMLError, TypeError, KeyError):
+            pass
+
+    for line in lines:
+        if line[:1] in (' ', '\t', '\r', '\n', '#', '-', ''):
+            # part of the current entry
+            if block is not None:
+                block[1].append(line)
+            continue
+        if block is not None:
+            finish(block)
+            block = None
+            if len(d) == len(keys):
+                return d
+        m = _yaml_key.match(line)
+        if m is None:
+            continue
+        key = m.group(1) or m.group(2) or m.group(3)
+        if key in keys:
+            block = (key, [line])
+    if block is not None:
+        finish(block)
+    return d
+
+
+def _scan_msgpack(stream, keys):
+    msgpack = _import_msgpack()
+    unpacker = msgpack.Unpacker(stream if not isinstance(stream, bytes) else None,
+                                raw=False, strict_map_key=False,
+                                ext_hook=_msgpack_ext_hook)
+    if isinstance(stream, bytes):
+        unpacker.feed(stream)
+    d = {}
+    for _ in range(unpacker.read_map_header()):
+        key = unpacker.unpack()
+        if key in keys:
+            d[key] = unpacker.unpack()
+            if len(d) == len(keys):
+                break
+        else:
+            unpacker.skip()
+    return d
+
+
+def peek(stream, metadata=False, fmt=None):
+    """Return a dictionary with the EFT, basis and scale of a Wilson
+    coefficient file without parsing its values.
+
+    `stream` can be a string, bytes or a file-like object as for `WC.load`,
+    including compressed files. If `metadata` is True, the metadata is
+    included if present; since it is usually stored after the values, this
+    means that the whole file is scanned. Entries that are not found are
+    missing from the dictionary. Only the part of a stream up to the last
+    requested entry is read, so the stream should not be used afterwards.
+
+    The format is determined as in `WC.load` unless given as `fmt`. YAML
+    files are scanned line by line, which assumes that the top-level mapping
+    is in block style; if a file cannot be scanned, it is loaded completely
+    instead."""
+    keys = HEADER_KEYS + (('metadata',) if metadata else ())
+    stream = _decompressed(stream)
+    declared = fmt
+    if isinstance(stream, (str, bytes)):
+        text, stream = stream, None
+        fmt = fmt or _sniff_format(text)
+    else:
+        fmt = fmt or _stream_format(stream)
+        if fmt is None:
+            fmt, stream = _sniff_stream(stream)
+        text = ''
+    try:
+        if fmt == 'msgpack':
+            d = _scan_msgpack(text if stream is None else stream, keys)
+        else:
+            if isinstance(text, bytes):
+                text = text.decode('utf-8')
+            if fmt == 'json':
+                d = _JSONScanner(stream, text).scan(keys)
+            else:
+                d = _scan_yaml(_iter_lines(stream, text), keys)
+    except ValueError:
+        if stream is not None:
+            # the stream has been partially read
+            raise
+        # a guessed format is guessed again, with the fallback to YAML
+        d = _load_yaml_json(text, fmt=declared)
+        d = {k: d[k] for k in keys if k in d}
+    if 'scale' in d:
+        d['scale'] = float(d['scale'])
+    return d
@@ -0,0 +1,479 @@
+"""On-disk stores of Wilson coefficient points.
+
+An `EnsembleStore` is a directory containing
+
+- `header.json` with the EFT, basis, coefficient order, chunk size and
+  number of points, and
+- chunks of points: `values-00000.npy` etc., complex arrays of shape
+  (points in the chunk, number of coefficients), and `scales-00000.npy`
+  etc., float arrays of shape (points in the chunk,). A chunk holds at most
+  the chunk size of points; the last chunk grows as points are appended.
+
+The chunks are opened as memory maps, so single points can be read without
+reading the whole store, and the store can grow by appending new chunks
+without rewriting existing ones.
+
+A `Catalogue` is an SQLite database of points in any EFT and basis that can
+be queried by EFT, basis, scale, content hash and non-zero coefficients.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import numpy as np
+from .classes import WC, Basis, open_file
+
+
+_header = 'header.json'
+
+
+class EnsembleStore(object):
+    """Memory-mapped store of Wilson coefficient points in the same EFT and
+    basis, with random access by point index.
+
+    Use `EnsembleStore.create` to create a new store and
+    `EnsembleStore(path)` to open an existing one. `store[i]` returns the
+    `i`-th point as a `WC` instance and `store[i:j]` the points as a
+    `wcxf.Ensemble`."""
+
+    def __init__(self, path, mode='r'):
+        """Open the existing store in the directory `path`. `mode` is 'r'
+        (default) for read-only access or 'r+' to allow appending."""
+        if mode not in ('r', 'r+'):
+            raise ValueError("Mode {} unknown: use 'r' or 'r+'.".format(mode))
+        self.path = path
+        self.mode = mode
+        with open(os.path.join(path, _header), 'r') as f:
+            header = json.load(f)
+        self.eft = header['eft']
+        self.basis = header['basis']
+        self.keys = header['keys']
+        self.chunk_size = header['chunk_size']
+        self._size = header['size']
+        self._chunks = {}
+
+    @classmethod
+    def create(cls, path, eft, basis, keys=None, chunk_size=1000):
+        """Create an empty store in the directory `path`, which must not
+        contain a store yet, and return it opened for appending.
+
+        `keys` defaults to all coefficients of the basis. `chunk_size` is the
+        maximum number of points per chunk file.
+
+        Every point takes 16 bytes per coefficient and 8 bytes for the scale
+        on disk, e.g. about 26 kB for all coefficients of the Warsaw basis,
+        so a full chunk of the default 1000 such points takes about 26 MB.
+        The last chunk only grows as points are appended, by at most a
+        factor of two at a time."""
+        if keys is None:
+            keys = Basis[eft, basis].all_wcs
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        if os.path.exists(os.path.join(path, _header)):
+            raise ValueError("{} already contains a store".format(path))
+        cls._write_header(path, {'eft': eft, 'basis': basis, 'keys': list(keys),
+                                 'chunk_size': int(chunk_size), 'size': 0})
+        return cls(path, mode='r+')
+
+    @staticmethod
+    def _write_header(path, header):
+        # write to a temporary file first, so readers never see a partial header
+        tmp = os.path.join(path, _header + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(header, f, indent=2)
+        os.replace(tmp, os.path.join(path, _header))
+
+    def _chunk_file(self, prefix, n):
+        return os.path.join(self.path, '{}-{:05d}.npy'.format(prefix, n))
+
+    def _chunk(self, n, rows=0):
+        """Return the memory-mapped scales and values of chunk `n`. If
+        `rows` is given, the chunk is created or grown to hold at least
+        `rows` points."""
+        if n not in self._chunks:
+            scales_file = self._chunk_file('scales', n)
+            values_file = self._chunk_file('values', n)
+            if os.path.exists(values_file):
+                self._chunks[n] = (np.load(scales_file, mmap_mode=self.mode),
+                                   np.load(values_file, mmap_mode=self.mode))
+            elif self.mode == 'r' or not rows:
+                raise IOError("Chunk {} of {} is missing".format(n, self.path))
+        if rows and (n not in self._chunks or len(self._chunks[n][0]) < rows):
+            self._grow(n, rows)
+        return self._chunks[n]
+
+    def _grow(self, n, rows):
+        """Resize chunk `n` to hold at least `rows` points, keeping its
+        points."""
+        old = self._chunks.pop(n, ())
+        # grow geometrically, so that appending points one by one does not
+        # copy the chunk every time
+        size = min(self.chunk_size, max(rows, 2 * len(old[0]) if old else 0))
+        shapes = ((size,), (size, len(self.keys)))
+        dtypes = (float, complex)
+        for k, prefix in enumerate(('scales', 'values')):
+            chunk_file = self._chunk_file(prefix, n)
+            array = np.lib.format.open_memmap(chunk_file + '.tmp', mode='w+',
+                                              dtype=dtypes[k], shape=shapes[k])
+            if old:
+                array[:len(old[k])] = old[k]
+            array.flush()
+            del array
+            os.replace(chunk_file + '.tmp', chunk_file)
+        del old
+        self._chunks[n] = (np.load(self._chunk_file('scales', n), mmap_mode='r+'),
+                           np.load(self._chunk_file('values', n), mmap_mode='r+'))
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return ("wcxf.store.EnsembleStore('{}', eft='{}', basis='{}', {} points)"
+                .format(self.path, self.eft, self.basis, len(self)))
+
+    def _index(self, i):
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("Point {} out of range".format(i))
+        return divmod(i, self.chunk_size)
+
+    def get_array(self, i):
+        """Return the scale and a copy of the complex array of values of the
+        `i`-th point."""
+        n, j = self._index(i)
+        scales, values = self._chunk(n)
+        return float(scales[j]), np.array(values[j])
+
+    def __getitem__(self, i):
+        """Return the `i`-th point as a `WC` instance, or the points of a
+        slice as a `wcxf.Ensemble`."""
+        if isinstance(i, slice):
+            from .ensemble import Ensemble
+            indices = range(*i.indices(self._size))
+            scales = np.empty(len(indices))
+            values = np.empty((len(indices), len(self.keys)), dtype=complex)
+            for k, m in enumerate(indices):
+                scales[k], values[k] = self.get_array(m)
+            return Ensemble(self.eft, self.basis, scales, values, self.keys)
+        scale, array = self.get_array(i)
+        return WC.from_array(self.eft, self.basis, scale, array, keys=self.keys)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def append_array(self, scales, values):
+        """Append points given as an array of scales of shape (N,) (or a
+        single scale for all points) and a complex array of values of shape
+        (N, number of coefficients)."""
+        if self.mode == 'r':
+            raise IOError("Store {} is opened read-only".format(self.path))
+        values = np.asarray(values, dtype=complex).reshape(-1, len(self.keys))
+        scales = np.broadcast_to(np.asarray(scales, dtype=float), (len(values),))
+        done = 0
+        while done < len(values):
+            n, j = divmod(self._size, self.chunk_size)
+            k = min(self.chunk_size - j, len(values) - done)
+            chunk_scales, chunk_values = self._chunk(n, rows=j + k)
+            chunk_scales[j:j + k] = scales[done:done + k]
+            chunk_values[j:j + k] = values[done:done + k]
+            done += k
+            self._size += k
+        self.flush()
+
+    def extend(self, wcs):
+        """Append an iterable of `WC` instances in the EFT and basis of the
+        store."""
+        scales = []
+        values = []
+        known = set(self.keys)
+        for wc in wcs:
+            if (wc.eft, wc.basis) != (self.eft, self.basis):
+                raise ValueError("Expected a point in EFT {} and basis {}, found {} and {}"
+                                 .format(self.eft, self.basis, wc.eft, wc.basis))
+            unknown = set(wc.dict) - known
+            if unknown:
+                raise ValueError("Coefficients not in the store: {}"
+                                 .format(', '.join(sorted(unknown))))
+            scales.append(wc.scale)
+            values.append(wc.to_array(self.keys))
+        if values:
+            self.append_array(scales, values)
+
+    def append(self, wc):
+        """Append a `WC` instance in the EFT and basis of the store."""
+        self.extend([wc])
+
+    def flush(self):
+        """Write the appended points and the header to disk."""
+        if self.mode == 'r':
+            return
+        for scales, values in self._chunks.values():
+            scales.flush()
+            values.flush()
+        self._write_header(self.path, {'eft': self.eft, 'basis': self.basis,
+                                       'keys': self.keys,
+                                       'chunk_size': self.chunk_size,
+                                       'size': self._size})
+
+    def close(self):
+        """Flush the store and release the memory maps."""
+        self.flush()
+        self._chunks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+_schema = """
+CREATE TABLE IF NOT EXISTS points (
+    id INTEGER PRIMARY KEY,
+    eft TEXT NOT NULL,
+    basis TEXT NOT NULL,
+    scale REAL NOT NULL,
+    hash TEXT NOT NULL,
+    present BLOB NOT NULL,
+    vals BLOB NOT NULL,
+    extra TEXT,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS points_eft_basis_scale ON points (eft, basis, scale);
+CREATE INDEX IF NOT EXISTS points_scale ON points (scale);
+CREATE INDEX IF NOT EXISTS points_hash ON points (hash);
+CREATE TABLE IF NOT EXISTS coefficients (
+    eft TEXT NOT NULL,
+    basis TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (eft, basis, name)
+);
+CREATE INDEX IF NOT EXISTS coefficients_name ON coefficients (name);
+CREATE TABLE IF NOT EXISTS nonzero (
+    point_id INTEGER NOT NULL REFERENCES points (id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (point_id, position)
+);
+CREATE INDEX IF NOT EXISTS nonzero_position ON nonzero (position, point_id);
+"""
+
+# dtypes of the packed positions and values
+_position_dtype = np.dtype('<i4')
+_value_dtype = np.dtype('<c16')
+
+
+def content_hash(wc):
+    """Return a hash of the EFT, basis, scale and non-zero values of a `WC`
+    instance, which does not depend on the order of the values or on how
+    they are written in the file."""
+    items = sorted((k, v.real, v.imag) for k, v in wc.dict.items() if v != 0)
+    s = json.dumps([wc.eft, wc.basis, float(wc.scale), items])
+    return hashlib.sha256(s.encode('utf-8')).hexdigest()
+
+
+class Catalogue(object):
+    """SQLite-backed catalogue of Wilson coefficient points.
+
+    The EFT, basis, scale and content hash of every point are indexed, and
+    the non-zero values are stored as packed arrays of positions and complex
+    values. The positions of the non-zero values are also stored in an
+    indexed table, so that points with a given non-zero coefficient are
+    found without scanning all points. The positions refer to the coefficients of each basis in the
+    order of `Basis.all_wcs`, followed by any other coefficients in the order
+    they were first added. Coefficients with value zero are not stored.
+
+    Example:
+
+    ```python
+    cat = Catalogue('points.sqlite')
+    cat.extend(glob.glob('scan/*.json'))
+    for wc in cat.query(basis='Warsaw', scale=1000, nonzero='lq1_1123'):
+        ...
+    ```
+    """
+
+    def __init__(self, path=':memory:'):
+        """Open (or create) the catalogue in the SQLite database file
+        `path` (default: in memory)."""
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_schema)
+        self._positions = {}
+
+    def close(self):
+        """Commit pending changes and close the database."""
+        self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM points').fetchone()[0]
+
+    def __repr__(self):
+        return "wcxf.store.Catalogue('{}', {} points)".format(self.path, len(self))
+
+    def _coefficient_positions(self, eft, basis):
+        """Return the dictionary mapping coefficient names of an EFT and basis
+        to their positions, initializing it with the basis if needed."""
+        key = (eft, basis)
+        if key not in self._positions:
+            rows = self.connection.execute(
+                'SELECT name, position FROM coefficients WHERE eft = ? AND basis = ?',
+                key)
+            positions = dict(rows)
+            if not positions:
+                try:
+                    positions = dict(Basis[eft, basis].wc_index)
+                except (AttributeError, KeyError):
+                    positions = {}
+                self._insert_coefficients(eft, basis, positions.items())
+            self._positions[key] = positions
+        return self._positions[key]
+
+    def _insert_coefficients(self, eft, basis, items):
+        self.connection.executemany(
+            'INSERT INTO coefficients (eft, basis, name, position) VALUES (?, ?, ?, ?)',
+            ((eft, basis, name, position) for name, position in items))
+
+    def _row(self, wc, source=None):
+        """Return the database row of a `WC` instance."""
+        positions = self._coefficient_positions(wc.eft, wc.basis)
+        d = {k: v for k, v in wc.dict.items() if v != 0}
+        new = [k for k in d if k not in positions]
+        if new:
+            n = len(positions)
+            items = [(k, n + i) for i, k in enumerate(new)]
+            self._insert_coefficients(wc.eft, wc.basis, items)
+            positions.update(items)
+        present = np.fromiter((positions[k] for k in d), dtype=_position_dtype,
+                              count=len(d))
+        values = np.fromiter(d.values(), dtype=complex, count=len(d))
+        order = np.argsort(present)
+        extra = {k: v for k, v in wc._public_dict().items()
+                 if k not in ('eft', 'basis', 'scale', 'values')}
+        return (wc.eft, wc.basis, float(wc.scale), content_hash(wc),
+                present[order].tobytes(),
+                values[order].astype(_value_dtype).tobytes(),
+                json.dumps(extra) if extra else None, source)
+
+    def _rows(self, items, skip_duplicates):
+        hashes = set()
+        for item in items:
+            source = None
+            if isinstance(item, str):
+                source = item
+                with open_file(item) as f:
+                    item = WC.load(f)
+            row = self._row(item, source)
+            if skip_duplicates:
+                if row[3] in hashes or self.contains_hash(row[3]):
+                    continue
+                hashes.add(row[3])
+            yield row
+
+    def extend(self, items, skip_duplicates=False):
+        """Add an iterable of `WC` instances or file names of Wilson
+        coefficient files in a single transaction. Returns the number of
+        points added.
+
+        If `skip_duplicates` is True, points with the same content hash as a
+        point in the catalogue are skipped."""
+        n = 0
+        with self.connection:
+            cursor = self.connection.cursor()
+            for row in self._rows(items, skip_duplicates):
+                cursor.execute(
+                    'INSERT INTO points (eft, basis, scale, hash, present, vals, extra, source)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)', row)
+                point_id = cursor.lastrowid
+                positions = np.frombuffer(row[4], dtype=_position_dtype)
+                cursor.executemany(
+                    'INSERT INTO nonzero (point_id, position) VALUES (?, ?)',
+                    ((point_id, int(i)) for i in positions))
+                n += 1
+        return n
+
+    def add(self, item, skip_duplicates=False):
+        """Add a `WC` instance or a Wilson coefficient file name."""
+        return self.extend([item], skip_duplicates=skip_duplicates)
+
+    def contains_hash(self, h):
+        """Return True if a point with the content hash `h` is in the
+        catalogue."""
+        row = self.connection.execute('SELECT 1 FROM points WHERE hash = ? LIMIT 1',
+                                      (h,)).fetchone()
+        return row is not None
+
+    def _where(self, eft=None, basis=None, scale=None, scale_range=None,
+               hash=None, nonzero=None):
+        conditions = []
+        parameters = []
+        for column, value in (('eft', eft), ('basis', basis), ('hash', hash)):
+            if value is not None:
+                conditions.append('{} = ?'.format(column))
+                parameters.append(value)
+        if scale is not None:
+            conditions.append('scale = ?')
+            parameters.append(float(scale))
+        if scale_range is not None:
+            conditions.append('scale BETWEEN ? AND ?')
+            parameters += [float(scale_range[0]), float(scale_range[1])]
+        if isinstance(nonzero, str):
+            nonzero = [nonzero]
+        for name in nonzero or []:
+            # CROSS JOIN fixes the order of the joins in SQLite, so that the
+            # points are looked up by the index on the positions
+            conditions.append('id IN (SELECT n.point_id FROM coefficients c'
+                              ' CROSS JOIN nonzero n ON n.position = c.position'
+                              ' CROSS JOIN points p ON p.id = n.point_id'
+                              ' WHERE c.name = ? AND p.eft = c.eft AND p.basis = c.basis)')
+            parameters.append(name)
+        where = ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+        return where, parameters
+
+    def count(self, **kwargs):
+        """Return the number of points matching a query (see `query`)."""
+        where, parameters = self._where(**kwargs)
+        return self.connection.execute('SELECT COUNT(*) FROM points' + where,
+                                       parameters).fetchone()[0]
+
+    def query(self, eft=None, basis=None, scale=None, scale_range=None,
+              hash=None, nonzero=None):
+        """Iterate over the points matching all given conditions, yielding
+        `WC` instances. The rows are fetched while iterating.
+
+        - `eft`, `basis`, `hash`: EFT, basis or content hash (see
+          `content_hash`)
+        - `scale`: scale in GeV, `scale_range`: tuple of minimum and maximum
+          scale
+        - `nonzero`: name or list of names of coefficients that must be
+          non-zero
+        """
+        where, parameters = self._where(eft=eft, basis=basis, scale=scale,
+                                        scale_range=scale_range, hash=hash,
+                                        nonzero=nonzero)
+        cursor = self.connection.execute(
+            'SELECT eft, basis, scale, present, vals, extra FROM points'
+            + where + ' ORDER BY id', parameters)
+        names = {}
+        for eft_, basis_, scale_, present, values, extra in cursor:
+            key = (eft_, basis_)
+            if key not in names:
+                positions = self._coefficient_positions(eft_, basis_)
+                names[key] = np.empty(len(positions), dtype=object)
+                for k, i in positions.items():
+                    names[key][i] = k
+            present = np.frombuffer(present, dtype=_position_dtype)
+            kwargs = json.loads(extra) if extra else {}
+            yield WC.from_array(eft_, basis_, scale_,
+                                np.frombuffer(values, dtype=_value_dtype).astype(complex),
+                                keys=list(names[key][present]), **kwargs)
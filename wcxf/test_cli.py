@@ -8,6 +8,8 @@ import wcxf
 import subprocess
 import tempfile
 import os
+import gzip
+import bz2
 
 def _del_files(fs):
     """Delete files if they exist"""
@@ -20,7 +22,7 @@ def _del_files(fs):
 class TestCLI(unittest.TestCase):
     def test_convert(self):
         yml1 = pkgutil.get_data('wcxf', 'data/test.basis1.yml').decode('utf-8')
-        d_yml1 = yaml.load(yml1)
+        d_yml1 = yaml.load(yml1, Loader=wcxf.classes.YAMLLoader)
         # YAML stdin -> JSON stdout
         res = subprocess.run(['wcxf', 'convert', 'json', '-'],
                              input=yml1.encode(),
@@ -33,7 +35,7 @@ class TestCLI(unittest.TestCase):
                              input=json1.encode(),
                              stdout=subprocess.PIPE)
         yml2 = res.stdout.decode('utf-8')
-        d_yml2 = yaml.load(yml2)
+        d_yml2 = yaml.load(yml2, Loader=wcxf.classes.YAMLLoader)
         self.assertDictEqual(d_json1, d_yml2)
         # YAML file -> JSON file
         _, fin = tempfile.mkstemp()
@@ -54,10 +56,48 @@ class TestCLI(unittest.TestCase):
         res = subprocess.run(['wcxf', 'convert', 'yaml', fin, '--output', fout])
         with open(fout, 'r') as f:
             yml3 = f.read()
-        d_yml3 = yaml.load(yml3)
+        d_yml3 = yaml.load(yml3, Loader=wcxf.classes.YAMLLoader)
         self.assertDictEqual(d_yml3, d_json1)
         # delete temp files
         _del_files([fin, fout])
+        # unknown JSON backend
+        res = subprocess.run(['wcxf', 'convert', '--json-backend', 'nonexistent', 'json', '-'],
+                             input=yml1.encode(),
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.assertEqual(res.returncode, 2)
+        self.assertIn("invalid choice", res.stderr.decode('utf-8'))
+        # JSON backend that is not installed
+        for backend in ('orjson', 'simdjson', 'ujson'):
+            if wcxf.classes._json_module(backend) is None:
+                res = subprocess.run(['wcxf', 'convert', '--json-backend', backend, 'json', '-'],
+                                     input=yml1.encode(),
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                self.assertEqual(res.stdout.decode('utf-8'), "")
+                err = res.stderr.decode('utf-8')
+                self.assertIn("is not installed", err)
+                self.assertNotIn("Traceback", err)
+
+    def test_compression(self):
+        yml1 = pkgutil.get_data('wcxf', 'data/test.basis1.yml')
+        d_yml1 = yaml.load(yml1, Loader=wcxf.classes.YAMLLoader)
+        tmpd = tempfile.mkdtemp()
+        fin = os.path.join(tmpd, 'basis.yml.gz')
+        fout = os.path.join(tmpd, 'basis.json.bz2')
+        with gzip.open(fin, 'wb') as f:
+            f.write(yml1)
+        # compressed YAML file -> compressed JSON file
+        subprocess.run(['wcxf', 'convert', 'json', fin, '--output', fout])
+        with bz2.open(fout, 'rt') as f:
+            self.assertDictEqual(json.load(f), d_yml1)
+        # compressed JSON stdin -> YAML stdout
+        with open(fout, 'rb') as f:
+            res = subprocess.run(['wcxf', 'convert', 'yaml', '-'],
+                                 input=f.read(), stdout=subprocess.PIPE)
+        d_yml2 = yaml.load(res.stdout.decode('utf-8'), Loader=wcxf.classes.YAMLLoader)
+        self.assertDictEqual(json.loads(json.dumps(d_yml2)),
+                             json.loads(json.dumps(d_yml1)))
+        _del_files([fin, fout])
+        os.rmdir(tmpd)
 
     def test_validate(self):
         _root = os.path.abspath(os.path.dirname(__file__))
@@ -0,0 +1,43 @@
+import unittest
+import subprocess
+from wcxf import doctor
+
+
+class TestDoctor(unittest.TestCase):
+    def test_profile_startup(self):
+        profile = doctor.profile_startup(memory=False)
+        self.assertGreater(profile['total']['time'], 0)
+        names = [s['name'] for s in profile['steps']]
+        self.assertIn('import wcxf', names)
+        self.assertIn('import yaml', names)
+        self.assertTrue(any(n.startswith('parse ') for n in names))
+        for step in profile['steps']:
+            self.assertIsNone(step['memory'])
+        report = doctor.startup_report(profile, commands=['convert'])
+        self.assertIn('- convert:', report)
+        self.assertNotIn('- translate:', report)
+
+    def test_avoidable(self):
+        profile = {'total': {'time': 3, 'memory': None},
+                   'steps': [
+                       {'name': 'import pandas', 'component': 'pandas',
+                        'time': 1, 'memory': None, 'deferred': False},
+                       {'name': 'import wilson', 'component': 'wilson',
+                        'time': 1, 'memory': None, 'deferred': True},
+                       {'name': 'parse a.basis.json', 'component': 'bases',
+                        'time': 0.5, 'memory': None, 'deferred': False},
+                       {'name': 'parse b.basis.json', 'component': 'bases',
+                        'time': 0.5, 'memory': None, 'deferred': False},
+                   ]}
+        self.assertDictEqual(dict(doctor.avoidable(profile, 'convert')),
+                             {'pandas': 1, 'bases': 1})
+        self.assertDictEqual(dict(doctor.avoidable(profile, 'validate')),
+                             {'pandas': 1})
+
+    def test_cli(self):
+        res = subprocess.run(['wcxf', 'doctor', '--startup', '--no-memory',
+                              '--command', 'validate'],
+                             stdout=subprocess.PIPE)
+        res = res.stdout.decode('utf-8')
+        self.assertIn("Start-up profile of `import wcxf`", res)
+        self.assertIn("- validate:", res)
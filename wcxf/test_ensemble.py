@@ -0,0 +1,101 @@
+import unittest
+import os
+import tempfile
+import shutil
+import numpy as np
+import wcxf
+from wcxf.ensemble import Ensemble, iter_load
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestEnsemble(unittest.TestCase):
+    def setUp(self):
+        self.wcs = [wcxf.WC('SMEFT', 'Warsaw', 1000 + i,
+                            {'lq1_1123': 1e-8 * i,
+                             'phiq1_12': {'Re': 1e-9, 'Im': -2e-9 * i}})
+                    for i in range(1, 4)]
+        self.wcs[0].values['G'] = 3e-7
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def assertRoundtrip(self, ensemble, filename, **kwargs):
+        path = os.path.join(self.dir, filename)
+        ensemble.dump(path, **kwargs)
+        loaded = Ensemble.load(path)
+        self.assertEqual(loaded.eft, 'SMEFT')
+        self.assertEqual(loaded.basis, 'Warsaw')
+        self.assertEqual(loaded.keys, ensemble.keys)
+        np.testing.assert_array_equal(loaded.scales, ensemble.scales)
+        np.testing.assert_array_equal(loaded.values, ensemble.values)
+        for wc_in, wc_out in zip(self.wcs, loaded):
+            self.assertEqual(wc_in.scale, wc_out.scale)
+            self.assertEqual(wc_in.dict, wc_out.dict)
+
+    def test_from_wcs(self):
+        ensemble = Ensemble.from_wcs(self.wcs)
+        self.assertIs(wcxf.Ensemble, Ensemble)
+        self.assertEqual(len(ensemble), 3)
+        # basis order
+        self.assertEqual(ensemble.keys, ['G', 'phiq1_12', 'lq1_1123'])
+        self.assertEqual(ensemble.values.shape, (3, 3))
+        self.assertEqual(ensemble.values[1, 1], 1e-9 - 4e-9j)
+        self.assertEqual(ensemble[2].dict, self.wcs[2].dict)
+        with self.assertRaises(ValueError):
+            Ensemble.from_wcs(self.wcs + [wcxf.WC('WET', 'flavio', 4.8, {})])
+        with self.assertRaises(ValueError):
+            Ensemble('SMEFT', 'Warsaw', [1, 2], np.zeros((3, 2)), ['G', 'W'])
+
+    def test_npz(self):
+        ensemble = Ensemble.from_wcs(self.wcs)
+        self.assertRoundtrip(ensemble, 'wide.npz')
+        self.assertRoundtrip(ensemble, 'long.npz', layout='long')
+        with self.assertRaises(ValueError):
+            ensemble.dump(os.path.join(self.dir, 'points.txt'))
+        # no extension is appended to the file name
+        path = os.path.join(self.dir, 'points')
+        ensemble.dump(path, fmt='npz')
+        np.testing.assert_array_equal(Ensemble.load(path, fmt='npz').values,
+                                      ensemble.values)
+        self.assertEqual([wc.dict for wc in iter_load(path, fmt='npz')],
+                         [wc.dict for wc in self.wcs])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_arrow(self):
+        ensemble = Ensemble.from_wcs(self.wcs)
+        self.assertRoundtrip(ensemble, 'wide.parquet')
+        self.assertRoundtrip(ensemble, 'long.parquet', layout='long')
+        self.assertRoundtrip(ensemble, 'wide.arrow')
+        self.assertRoundtrip(ensemble, 'long.feather', layout='long')
+        table = ensemble.to_table()
+        self.assertEqual(table.column_names[:3], ['scale', 'G.Re', 'G.Im'])
+        table = ensemble.to_table(layout='long')
+        # G is only non-zero in the first point
+        self.assertEqual(table.num_rows, 7)
+        self.assertEqual(table.column_names, ['point', 'coefficient', 're', 'im'])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_iter_load(self):
+        import pyarrow.parquet
+        import pyarrow.feather
+        # a point without non-zero values in the middle
+        self.wcs.insert(1, wcxf.WC('SMEFT', 'Warsaw', 500, {}))
+        ensemble = Ensemble.from_wcs(self.wcs)
+        for layout in ('wide', 'long'):
+            table = ensemble.to_table(layout)
+            # small row groups and batches, so that points span several
+            path = os.path.join(self.dir, layout + '.parquet')
+            pyarrow.parquet.write_table(table, path, row_group_size=2)
+            self.assertGreater(pyarrow.parquet.ParquetFile(path).num_row_groups, 1)
+            wcs = list(iter_load(path))
+            self.assertEqual([wc.scale for wc in wcs], [wc.scale for wc in self.wcs])
+            self.assertEqual([wc.dict for wc in wcs], [wc.dict for wc in self.wcs])
+            path = os.path.join(self.dir, layout + '.arrow')
+            pyarrow.feather.write_feather(table, path, chunksize=2)
+            wcs = list(iter_load(path))
+            self.assertEqual([wc.dict for wc in wcs], [wc.dict for wc in self.wcs])
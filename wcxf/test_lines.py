@@ -0,0 +1,66 @@
+import unittest
+import io
+import subprocess
+import wcxf
+
+
+class TestLines(unittest.TestCase):
+    def setUp(self):
+        self.wcs = [wcxf.WC('SMEFT', 'Warsaw', 1000, {'lq1_1123': 1e-8 * i,
+                                                      'phiq1_12': {'Re': 1e-9,
+                                                                   'Im': -2e-9 * i}})
+                    for i in range(1, 4)]
+        self.wcs.append(wcxf.WC('WET', 'flavio', 4.8, {'C9_bsmumu': 0.5}))
+
+    def test_roundtrip(self):
+        s = wcxf.dump_many(iter(self.wcs))
+        lines = s.splitlines()
+        # 4 WCs and 2 headers
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[0], '{"eft":"SMEFT","basis":"Warsaw"}')
+        wcs = list(wcxf.iter_load(s))
+        self.assertEqual(len(wcs), 4)
+        for wc_in, wc_out in zip(self.wcs, wcs):
+            self.assertEqual(wc_in.dump(), wc_out.dump())
+        wcs = list(wcxf.iter_load(io.StringIO(s), array=True))
+        self.assertEqual(wcs[1].dict, self.wcs[1].dict)
+        # without header
+        s = wcxf.dump_many(self.wcs, header=False)
+        self.assertEqual(len(s.splitlines()), 4)
+        stream = io.StringIO()
+        wcxf.dump_many(self.wcs, stream=stream, header=False)
+        self.assertEqual(stream.getvalue(), s)
+        self.assertEqual([wc.basis for wc in wcxf.iter_load(s)],
+                         ['Warsaw', 'Warsaw', 'Warsaw', 'flavio'])
+
+    def test_lazy(self):
+        def wcs():
+            yield self.wcs[0]
+            raise RuntimeError
+        stream = io.StringIO()
+        with self.assertRaises(RuntimeError):
+            wcxf.dump_many(wcs(), stream=stream)
+        self.assertEqual(len(stream.getvalue().splitlines()), 2)
+        it = wcxf.iter_load(stream.getvalue() + '\n\n{"scale": 1, "values": nonsense}\n')
+        self.assertEqual(next(it).dict, self.wcs[0].dict)
+        with self.assertRaises(ValueError):
+            next(it)
+
+    def test_cli(self):
+        s = wcxf.dump_many(self.wcs[:3]).encode()
+        res = subprocess.run(['wcxf', 'validate', '--lines', 'wc', '-'],
+                             input=s, stdout=subprocess.PIPE)
+        self.assertEqual(res.stdout.decode('utf-8'), "Validation successful.\n")
+        for line in ('{"scale": 1, "values": nonsense}', '{"values": {}}'):
+            res = subprocess.run(['wcxf', 'validate', '--lines', 'wc', '-'],
+                                 input=s + line.encode(),
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            self.assertEqual(res.stdout.decode('utf-8'), "")
+            err = res.stderr.decode('utf-8')
+            self.assertIn("Invalid WCxf-lines input: Line 5:", err)
+            self.assertNotIn("Traceback", err)
+        res = subprocess.run(['wcxf', 'translate', '--lines', 'Warsaw up', '-'],
+                             input=s, stdout=subprocess.PIPE)
+        wcs = list(wcxf.iter_load(res.stdout.decode('utf-8')))
+        self.assertEqual(len(wcs), 3)
+        self.assertEqual(wcs[2].basis, 'Warsaw up')
@@ -0,0 +1,70 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import wcxf
+from wcxf import plugins
+
+
+_module = """import wcxf
+
+@wcxf.translator('MyEFT', 'MyBasis 1', 'MyPluginBasis')
+def f(x, scale, parameters):
+    return x
+"""
+
+_entry_points = """[wcxf.translators]
+MyEFT/MyBasis 1/MyPluginBasis = wcxf_test_plugin
+"""
+
+
+class TestPlugins(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        with open(os.path.join(self.tmpdir, 'wcxf_test_plugin.py'), 'w') as f:
+            f.write(_module)
+        distinfo = os.path.join(self.tmpdir, 'wcxf_test_plugin-0.1.dist-info')
+        os.mkdir(distinfo)
+        with open(os.path.join(distinfo, 'METADATA'), 'w') as f:
+            f.write("Metadata-Version: 2.1\nName: wcxf-test-plugin\nVersion: 0.1\n")
+        with open(os.path.join(distinfo, 'entry_points.txt'), 'w') as f:
+            f.write(_entry_points)
+        sys.path.insert(0, self.tmpdir)
+        plugins.clear_cache()
+
+    def tearDown(self):
+        sys.path.remove(self.tmpdir)
+        sys.modules.pop('wcxf_test_plugin', None)
+        plugins.clear_cache()
+        shutil.rmtree(self.tmpdir)
+        if ('MyEFT', 'MyBasis 1', 'MyPluginBasis') in getattr(wcxf.Translator, 'instances', {}):
+            del wcxf.Translator['MyEFT', 'MyBasis 1', 'MyPluginBasis']
+
+    def test_entry_points(self):
+        eps = plugins.entry_points('wcxf.translators')
+        self.assertIn(('MyEFT', 'MyBasis 1', 'MyPluginBasis'), eps)
+        self.assertNotIn('wcxf_test_plugin', sys.modules)
+        self.assertFalse(plugins.load('wcxf.translators', ('MyEFT', 'a', 'b')))
+
+    def test_lazy_lookup(self):
+        self.assertNotIn('wcxf_test_plugin', sys.modules)
+        translator = wcxf.Translator['MyEFT', 'MyBasis 1', 'MyPluginBasis']
+        self.assertIn('wcxf_test_plugin', sys.modules)
+        self.assertEqual(translator.to_basis, 'MyPluginBasis')
+
+    def test_lazy_function(self):
+        key = ('MyEFT', 'MyBasis 1', 'MyPluginBasis')
+        function = plugins.lazy_function(wcxf.Translator, key, 'wcxf_test_plugin')
+        wcxf.Translator(*key, function)
+        self.assertNotIn('wcxf_test_plugin', sys.modules)
+        self.assertEqual(function({'C': 1}, 10, None), {'C': 1})
+        self.assertIsNot(wcxf.Translator[key].function, function)
+        # the module does not provide the key
+        key = ('MyEFT', 'MyBasis 1', 'MyOtherBasis')
+        function = plugins.lazy_function(wcxf.Translator, key, 'wcxf_test_plugin')
+        wcxf.Translator(*key, function)
+        with self.assertRaises(ValueError):
+            function({'C': 1}, 10, None)
+        # the placeholder has been removed
+        self.assertNotIn(key, wcxf.Translator.instances)
@@ -0,0 +1,65 @@
+import unittest
+import io
+import gzip
+import pkgutil
+import wcxf
+from wcxf import scan
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class TestPeek(unittest.TestCase):
+    def setUp(self):
+        self.wc = wcxf.WC('SMEFT', 'Warsaw', 1000,
+                          {'lq1_1123': {'Re': 1e-8, 'Im': 2e-9},
+                           'G': 1e-7},
+                          metadata={'description': 'a "}" [ü]', 'n': [1, {'x': '{'}]})
+        self.header = {'eft': 'SMEFT', 'basis': 'Warsaw', 'scale': 1000.0}
+
+    def assertPeek(self, s):
+        self.assertEqual(wcxf.peek(s), self.header)
+        d = wcxf.peek(s, metadata=True)
+        self.assertEqual(d['metadata'], self.wc.metadata)
+        stream = io.BytesIO(s if isinstance(s, bytes) else s.encode('utf-8'))
+        self.assertEqual(wcxf.peek(stream, metadata=True), d)
+
+    def test_json(self):
+        self.assertPeek(self.wc.dump())
+        self.assertPeek(self.wc.dump(indent=None))
+
+    def test_yaml(self):
+        self.assertPeek(self.wc.dump(fmt='yaml'))
+        # flow style is loaded completely
+        s = self.wc.dump(fmt='yaml', default_flow_style=True)
+        self.assertEqual(wcxf.peek(s), self.header)
+        d = wcxf.peek(pkgutil.get_data('wcxf', 'data/test.wcs.yml'))
+        self.assertEqual(d, {'eft': 'MyEFT', 'basis': 'MyBasis 1', 'scale': 1e16})
+
+    @unittest.skipIf(msgpack is None, "msgpack not installed")
+    def test_msgpack(self):
+        self.assertPeek(self.wc.dump(fmt='msgpack'))
+
+    def test_chunks(self):
+        chunksize = scan._chunksize
+        try:
+            for n in (1, 2, 7):
+                scan._chunksize = n
+                for fmt in ('json', 'yaml'):
+                    self.assertPeek(self.wc.dump(fmt=fmt))
+        finally:
+            scan._chunksize = chunksize
+
+    def test_early_stop(self):
+        s = self.wc.dump()
+        # values are invalid but not read
+        s = s.replace('"values": {', '"values": {]]', 1)
+        self.assertEqual(wcxf.peek(io.StringIO(s)), self.header)
+        s = self.wc.dump(fmt='yaml') + 'values: [\n'
+        self.assertEqual(wcxf.peek(io.StringIO(s)), self.header)
+
+    def test_compressed(self):
+        s = gzip.compress(self.wc.dump().encode('utf-8'))
+        self.assertPeek(s)
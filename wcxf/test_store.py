@@ -0,0 +1,128 @@
+import unittest
+import os
+import tempfile
+import shutil
+import numpy as np
+import wcxf
+from wcxf.store import EnsembleStore, Catalogue, content_hash
+
+
+class TestEnsembleStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'scan')
+        self.keys = ['C9_bsmumu', 'C10_bsmumu', 'C7_bs']
+        self.wcs = [wcxf.WC('WET', 'flavio', 4.8,
+                            {'C9_bsmumu': {'Re': 0.1 * i, 'Im': 0.2},
+                             'C10_bsmumu': -0.3 * i})
+                    for i in range(1, 8)]
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_store(self):
+        store = EnsembleStore.create(self.path, 'WET', 'flavio', keys=self.keys,
+                                     chunk_size=3)
+        store.extend(self.wcs[:2])
+        store.append(self.wcs[2])
+        store.append_array(5, np.ones((4, 3)))
+        self.assertEqual(len(store), 7)
+        store.close()
+        # 3 chunks
+        self.assertTrue(os.path.exists(os.path.join(self.path, 'values-00002.npy')))
+        self.assertFalse(os.path.exists(os.path.join(self.path, 'values-00003.npy')))
+        store = EnsembleStore(self.path)
+        self.assertEqual(len(store), 7)
+        for i in range(3):
+            self.assertEqual(store[i].dict, self.wcs[i].dict)
+            self.assertEqual(store[i].scale, 4.8)
+        self.assertEqual(store[-1].scale, 5)
+        self.assertEqual(store[-1].dict, {k: 1 for k in self.keys})
+        with self.assertRaises(IndexError):
+            store[7]
+        with self.assertRaises(IOError):
+            store.append(self.wcs[0])
+        ensemble = store[1:5]
+        self.assertEqual(len(ensemble), 4)
+        np.testing.assert_array_equal(ensemble.values[0], store.get_array(1)[1])
+        self.assertEqual(len(list(store)), 7)
+        # appending to an existing store
+        with EnsembleStore(self.path, mode='r+') as store:
+            store.extend(self.wcs[3:])
+            self.assertEqual(len(store), 11)
+        store = EnsembleStore(self.path)
+        self.assertEqual(store[10].dict, self.wcs[6].dict)
+
+    def test_chunk_size(self):
+        # chunk files only hold the points written so far
+        store = EnsembleStore.create(self.path, 'WET', 'flavio', keys=self.keys)
+        values_file = os.path.join(self.path, 'values-00000.npy')
+        store.append(self.wcs[0])
+        self.assertEqual(np.load(values_file).shape, (1, 3))
+        for wc in self.wcs[1:]:
+            store.append(wc)
+        self.assertEqual(np.load(values_file).shape, (8, 3))
+        store.close()
+        store = EnsembleStore(self.path)
+        self.assertEqual(len(store), 7)
+        for i, wc in enumerate(self.wcs):
+            self.assertEqual(store[i].dict, wc.dict)
+
+    def test_errors(self):
+        store = EnsembleStore.create(self.path, 'WET', 'flavio', keys=self.keys)
+        with self.assertRaises(ValueError):
+            EnsembleStore.create(self.path, 'WET', 'flavio', keys=self.keys)
+        with self.assertRaises(ValueError):
+            store.append(wcxf.WC('WET', 'flavio', 4.8, {'C9_bsee': 1}))
+        with self.assertRaises(ValueError):
+            store.append(wcxf.WC('WET', 'EOS', 4.8, {}))
+        self.assertEqual(len(store), 0)
+
+
+class TestCatalogue(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.wcs = [wcxf.WC('SMEFT', 'Warsaw', 1000 * (1 + i % 2),
+                            {'lq1_1123': 1e-8 * (i % 3),
+                             'G': {'Re': 1e-7, 'Im': 1e-9 * i},
+                             'unknown': 1.5},
+                            metadata={'i': i})
+                    for i in range(10)]
+        self.wcs.append(wcxf.WC('WET', 'flavio', 4.8, {'C9_bsmumu': -1}))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_catalogue(self):
+        path = os.path.join(self.dir, 'points.sqlite')
+        files = []
+        for i, wc in enumerate(self.wcs[:3]):
+            files.append(os.path.join(self.dir, '{}.json.gz'.format(i)))
+            with open(files[-1], 'w') as f:
+                wc.dump(f)
+        with Catalogue(path) as cat:
+            self.assertEqual(cat.extend(self.wcs), 11)
+            self.assertEqual(cat.extend(files, skip_duplicates=True), 0)
+            self.assertEqual(cat.add(self.wcs[0]), 1)
+        cat = Catalogue(path)
+        self.assertEqual(len(cat), 12)
+        wcs = list(cat.query(basis='Warsaw', scale=1000, nonzero='lq1_1123'))
+        self.assertEqual([wc.metadata['i'] for wc in wcs], [2, 4, 8])
+        self.assertEqual(wcs[0].dict, self.wcs[2].dict)
+        self.assertEqual(cat.count(nonzero=['G', 'unknown']), 11)
+        self.assertEqual(cat.count(nonzero='C9_bsmumu'), 1)
+        # points with a non-zero coefficient are found by index
+        where, parameters = cat._where(nonzero='lq1_1123')
+        plan = ' '.join(str(r) for r in cat.connection.execute(
+            'EXPLAIN QUERY PLAN SELECT id FROM points' + where, parameters))
+        self.assertIn('nonzero_position', plan)
+        self.assertNotIn('SCAN', plan)
+        self.assertEqual(cat.count(eft='SMEFT', scale_range=(900, 1100)), 6)
+        self.assertEqual(cat.count(hash=content_hash(self.wcs[0])), 2)
+        self.assertTrue(cat.contains_hash(content_hash(self.wcs[10])))
+        # zeros are not stored
+        wc = next(cat.query(eft='SMEFT'))
+        self.assertEqual(wc.dict, {'G': 1e-7, 'unknown': 1.5})
+        wc = next(cat.query(eft='WET'))
+        self.assertEqual(wc.dict, self.wcs[10].dict)
+        cat.close()
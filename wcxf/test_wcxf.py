@@ -4,7 +4,20 @@ import numpy.testing as npt
 import yaml
 import json
 import pkgutil
+import io
+import subprocess
+import sys
+import os
+import tempfile
+import shutil
+import gzip
 import wcxf
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+from collections import OrderedDict, defaultdict
 from wcxf import translators
 
 class TestBasis(unittest.TestCase):
@@ -99,3 +112,252 @@ class TestBasis(unittest.TestCase):
         self.assertEqual(set(parent.sectors.keys()), set(child.sectors.keys()))
         self.assertEqual(set(parent.sectors['My Sector 1'].keys()), {'C_1', 'C_2'})
         self.assertEqual(set(child.sectors['My Sector 1'].keys()), {'C_1'})
+
+    def test_lazy_imports(self):
+        res = subprocess.run([sys.executable, '-c',
+                              'import sys, wcxf, wcxf.cli; '
+                              'print("pandas" in sys.modules, "wilson" in sys.modules)'],
+                             stdout=subprocess.PIPE)
+        self.assertEqual(res.stdout.decode('utf-8').strip(), 'False False')
+        # lazy module attributes
+        import wilson.util
+        self.assertIs(wcxf.util, wilson.util)
+        self.assertIs(wcxf.Ensemble, wcxf.ensemble.Ensemble)
+        with self.assertRaises(AttributeError):
+            wcxf.no_such_attribute
+        # looking up a translator or matcher of wilson does not import it
+        res = subprocess.run([sys.executable, '-c',
+                              'import sys, wcxf; '
+                              'wcxf.Translator["SMEFT", "Warsaw", "Warsaw up"]; '
+                              'wcxf.Matcher["SMEFT", "Warsaw", "WET", "JMS"]; '
+                              'print("wilson" in sys.modules)'],
+                             stdout=subprocess.PIPE)
+        self.assertEqual(res.stdout.decode('utf-8').strip(), 'False')
+        # ... but using it does
+        translator = wcxf.Translator['SMEFT', 'Warsaw', 'Warsaw up']
+        self.assertIsInstance(translator, wcxf.Translator)
+        wc = wcxf.WC('SMEFT', 'Warsaw', 1000, {'phiq1_12': {'Re': 1e-7, 'Im': 0}})
+        self.assertEqual(translator.translate(wc).dict,
+                         wc.translate('Warsaw up').dict)
+        # the placeholders are replaced by the translators and matchers of wilson
+        self.assertEqual(wcxf.Translator['SMEFT', 'Warsaw', 'Warsaw up'].function.__module__,
+                         'wilson.translate')
+        self.assertEqual(wcxf.Matcher['SMEFT', 'Warsaw', 'WET', 'JMS'].function.__module__,
+                         'wilson.match')
+
+    def test_wilson_tables(self):
+        # the static tables agree with the translators and matchers of wilson
+        import wilson
+        for cls, table in ((wcxf.Translator, wcxf.translators.WILSON),
+                           (wcxf.Matcher, wcxf.matchers.WILSON)):
+            provided = {k for k, v in cls.instances.items()
+                        if v.function.__module__.split('.')[0] == 'wilson'}
+            self.assertEqual(provided, set(table))
+
+    def test_yaml(self):
+        f = pkgutil.get_data('wcxf', 'data/test.wcs.yml')
+        wc = wcxf.WC.load(f.decode('utf-8'))
+        self.assertIsInstance(wc.values, OrderedDict)
+        wc.metadata = OrderedDict([('b', None), ('a', (1, 2))])
+        s = wc.dump(fmt='yaml')
+        self.assertIn('metadata:\n  b:\n  a:\n  - 1\n  - 2\n', s)
+        wc2 = wcxf.WC.load(s)
+        self.assertEqual(wc2.dict, wc.dict)
+        self.assertEqual(list(wc2.metadata), ['b', 'a'])
+        # NumPy scalars and defaultdicts
+        metadata = defaultdict(list)
+        metadata['n'] = np.int64(3)
+        wc = wcxf.WC('SMEFT', 'Warsaw', np.float64(1000),
+                     {'G': np.float64(1e-7),
+                      'phiq1_12': {'Re': np.float32(0.5), 'Im': np.float64(-1)}},
+                     metadata=metadata)
+        s = wc.dump(fmt='yaml')
+        self.assertIn('metadata:\n  n: 3\n', s)
+        self.assertIn('scale: 1000.0\n', s)
+        self.assertEqual(wcxf.WC.load(s).dict, {'G': 1e-7, 'phiq1_12': 0.5 - 1j})
+        with self.assertRaises(yaml.representer.RepresenterError):
+            yaml.dump(object(), Dumper=wcxf.classes.YAMLDumper)
+        # PyYAML's default loader and dumper are not modified
+        self.assertEqual(yaml.dump(None), 'null\n...\n')
+        self.assertIsInstance(yaml.safe_load('a: 1'), dict)
+        self.assertNotIsInstance(yaml.safe_load('a: 1'), OrderedDict)
+
+    def test_load_formats(self):
+        f = pkgutil.get_data('wcxf', 'data/test.wcs.yml')
+        wc = wcxf.WC.load(f.decode('utf-8'))
+        s_json = wc.dump(fmt='json')
+        s_yaml = wc.dump(fmt='yaml')
+        self.assertEqual(wcxf.classes._sniff_format('  \n' + s_json), 'json')
+        self.assertEqual(wcxf.classes._sniff_format(s_yaml), 'yaml')
+        self.assertEqual(wcxf.classes._sniff_format(b' [1]'), 'json')
+        self.assertIsNone(wcxf.classes._sniff_format(' \n'))
+        for s in [s_json, s_yaml, s_json.encode(), f,
+                  io.StringIO(s_json), io.StringIO(s_yaml),
+                  io.BytesIO(s_yaml.encode()),
+                  io.StringIO(2000 * '\n' + s_yaml),
+                  # YAML flow mapping that is not valid JSON
+                  "{eft: MyEFT, basis: MyBasis 1, scale: 1e16, "
+                  "values: {C_1: 0.12, C_2: {Re: 0.3156, Im: -0.53}, C_4: 0.32}}"]:
+            self.assertEqual(wcxf.WC.load(s).dict, wc.dict)
+        # the file name extension takes precedence
+        stream = io.StringIO(s_yaml)
+        stream.name = 'test.yml'
+        self.assertEqual(wcxf.WC.load(stream).dict, wc.dict)
+        stream = io.StringIO(s_json)
+        stream.name = 'test.json'
+        self.assertEqual(wcxf.WC.load(stream).dict, wc.dict)
+        self.assertEqual(wcxf.WC.load(s_json, fmt='yaml').dict, wc.dict)
+        # malformed JSON: the JSON error is raised if the format is declared
+        # or detected from the extension, and if the YAML fallback fails
+        broken = s_json.replace(':', ';', 1)
+        stream = io.StringIO(broken)
+        stream.name = 'q.json'
+        for args, kwargs in (((stream,), {}), ((broken,), {'fmt': 'json'}),
+                             ((broken,), {}), (('{"eft": [}',), {})):
+            with self.assertRaises(ValueError) as cm:
+                wcxf.WC.load(*args, **kwargs)
+            self.assertNotIsInstance(cm.exception, yaml.YAMLError)
+
+    def test_compression(self):
+        f = pkgutil.get_data('wcxf', 'data/test.wcs.yml')
+        wc = wcxf.WC.load(f.decode('utf-8'))
+        tmpd = tempfile.mkdtemp()
+        try:
+            for ext in ('.gz', '.bz2', '.xz'):
+                for fmt in ('json', 'yaml'):
+                    fn = os.path.join(tmpd, 'wcs.' + fmt + ext)
+                    with open(fn, 'w') as f:
+                        wc.dump(f, fmt=fmt)
+                    with open(fn, 'rb') as f:
+                        s = f.read()
+                    self.assertNotIn(b'values', s)
+                    # by file name, magic bytes, from bytes and a non-seekable stream
+                    with open(fn, 'r') as f:
+                        self.assertEqual(wcxf.WC.load(f).dict, wc.dict)
+                    with open(fn, 'rb') as f:
+                        self.assertEqual(wcxf.WC.load(f).dict, wc.dict)
+                    self.assertEqual(wcxf.WC.load(s).dict, wc.dict)
+                    self.assertEqual(wcxf.WC.load(io.BufferedReader(io.BytesIO(s))).dict,
+                                     wc.dict)
+                    with wcxf.open_file(fn) as f:
+                        self.assertEqual(wcxf.WC.load(f).dict, wc.dict)
+                    # open_file compresses by extension
+                    with wcxf.open_file(fn, 'w') as f:
+                        f.write(wc.dump(fmt=fmt))
+                    with open(fn, 'rb') as f:
+                        self.assertEqual(f.read(), s)
+            fn = os.path.join(tmpd, 'wcs.json')
+            with open(fn, 'w') as f:
+                wc.dump(f)
+            with wcxf.open_file(fn, 'rb') as f:
+                self.assertEqual(f.read(1), b'{')
+            basis = os.path.join(tmpd, 'basis.yml.gz')
+            with gzip.open(basis, 'wb') as f:
+                f.write(pkgutil.get_data('wcxf', 'data/test.basis1.yml'))
+            with open(basis, 'r') as f:
+                self.assertEqual(wcxf.Basis.load(f).basis, 'MyBasis 1')
+            # YAML in a file named as JSON is a JSON error
+            os.rename(basis, os.path.join(tmpd, 'basis.json.gz'))
+            with open(os.path.join(tmpd, 'basis.json.gz'), 'r') as f:
+                with self.assertRaises(ValueError):
+                    wcxf.Basis.load(f)
+        finally:
+            shutil.rmtree(tmpd)
+
+    @unittest.skipIf(msgpack is None, "msgpack not installed")
+    def test_msgpack(self):
+        wc = wcxf.WC('SMEFT', 'Warsaw', 1000,
+                     {'lq1_1123': {'Re': 1e-8, 'Im': -2.5e-9},
+                      'G': 3e-7,
+                      'phiq1_12': {'Re': 1, 'Im': 0.5},
+                      'unknown': {'Re': 1.5}},
+                     metadata={'description': 'ü'})
+        s = wc.dump(fmt='msgpack')
+        self.assertIsInstance(s, bytes)
+        # names are interned, except unknown ones
+        self.assertNotIn(b'lq1_1123', s)
+        self.assertIn(b'unknown', s)
+        for wc_loaded in (wcxf.WC.load(s), wcxf.WC.load(io.BytesIO(s)),
+                          wcxf.WC.load(s, fmt='msgpack')):
+            self.assertEqual(wc_loaded.dump(), wc.dump())
+            self.assertEqual(wc_loaded.dump(fmt='yaml'), wc.dump(fmt='yaml'))
+            self.assertEqual(wc_loaded.dump(fmt='msgpack'), s)
+        self.assertEqual(wcxf.WC.load(s, array=True).dict['lq1_1123'],
+                         1e-8 - 2.5e-9j)
+        stream = io.BytesIO()
+        wc.dump(stream, fmt='msgpack')
+        self.assertEqual(stream.getvalue(), s)
+        eft = wcxf.EFT['WET']
+        self.assertEqual(wcxf.EFT.load(eft.dump(fmt='msgpack')).dump(), eft.dump())
+        wcxf.EFT.load(eft.dump())
+        # values with the keys in reversed order are kept as dicts
+        wc = wcxf.WC('SMEFT', 'Warsaw', 1000,
+                     {'lq1_1123': {'Im': -2.5e-9, 'Re': 1e-8}})
+        s = wc.dump(fmt='msgpack')
+        wc_loaded = wcxf.WC.load(s)
+        self.assertEqual(list(wc_loaded.values['lq1_1123']), ['Im', 'Re'])
+        self.assertEqual(wc_loaded.dump(fmt='msgpack'), s)
+        self.assertEqual(wc_loaded.dump(), wc.dump())
+        # unknown basis with interned names
+        s = wcxf.WC('SMEFT', 'Warsaw', 1000, {'G': 1e-7}).dump(fmt='msgpack')
+        with self.assertRaises(ValueError):
+            wcxf.WC.load(s.replace(b'Warsaw', b'Wxrsaw'))
+
+    def test_json_backend(self):
+        f = pkgutil.get_data('wcxf', 'data/test.wcs.yml')
+        wc = wcxf.WC.load(f.decode('utf-8'))
+        wc.metadata = {'description': 'a/b ü', 'x': 1e-05}
+        s_std = json.dumps({k: v for k, v in wc.__dict__.items() if k[0] != '_'},
+                           indent=2)
+        # the default mode is byte-compatible with the standard library
+        self.assertEqual(wc.dump(fmt='json'), s_std)
+        with self.assertRaises(ValueError):
+            wcxf.set_json_backend('nonexistent')
+        try:
+            for backend in ('json', 'orjson', 'simdjson', 'ujson'):
+                try:
+                    wcxf.set_json_backend(backend)
+                except ValueError:  # not installed
+                    continue
+                s = wc.dump(fmt='json')
+                self.assertEqual(json.loads(s), json.loads(s_std))
+                wc2 = wcxf.WC.load(s_std)
+                self.assertEqual(wc2.dict, wc.dict)
+                self.assertEqual(wc2.metadata, wc.metadata)
+        finally:
+            wcxf.set_json_backend('auto')
+
+    def test_array(self):
+        f = pkgutil.get_data('wcxf', 'data/test.eft.yml')
+        wcxf.EFT.load(f.decode('utf-8'))
+        f = pkgutil.get_data('wcxf', 'data/test.basis1.yml')
+        basis = wcxf.Basis.load(f.decode('utf-8'))
+        f = pkgutil.get_data('wcxf', 'data/test.wcs.yml')
+        wc = wcxf.WC.load(f.decode('utf-8'))
+        wc_arr = wcxf.WC.load(f.decode('utf-8'), array=True)
+        self.assertNotIn('values', wc_arr.__dict__)
+        self.assertEqual(wc_arr.dict, wc.dict)
+        npt.assert_array_equal(wc_arr.to_array(), wc.to_array())
+        self.assertEqual(len(wc.to_array()), len(basis.all_wcs))
+        self.assertEqual(wc.to_array()[basis.wc_index['C_2']], 0.3156-0.53j)
+        npt.assert_array_equal(wc_arr.to_array(['C_2', 'C_1', 'C_3']),
+                               [0.3156-0.53j, 0.12, 0])
+        self.assertEqual(wc_arr.dump(), wc.dump())
+        self.assertEqual(wc_arr.values, wc.values)
+        npt.assert_array_equal(wc_arr.df.values, wc.df.values)
+        wc2 = wcxf.WC.from_array('MyEFT', 'MyBasis 1', 100, wc.to_array())
+        self.assertEqual(wc2.dict, wc.dict)
+        self.assertEqual(wc2.scale, 100)
+        with self.assertRaises(ValueError):
+            wcxf.WC.from_array('MyEFT', 'MyBasis 1', 100, [1, 2])
+        # values are converted as without `array`
+        values = {'C_1': '1e-3', 'C_2': {'Re': 0.5, 'Im': 0},
+                  'C_3': {'Re': '2', 'Im': '-1'}}
+        for fmt in ('json', 'yaml'):
+            f = wcxf.WC('MyEFT', 'MyBasis 1', 100, values).dump(fmt=fmt)
+            wc = wcxf.WC.load(f)
+            wc_arr = wcxf.WC.load(f, array=True)
+            self.assertEqual(wc_arr.dict, {'C_1': 1e-3, 'C_2': 0.5 + 0j,
+                                           'C_3': 2 - 1j})
+            self.assertEqual([(k, type(v)) for k, v in wc_arr.dict.items()],
+                             [(k, type(v)) for k, v in wc.dict.items()])
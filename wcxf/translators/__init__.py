@@ -1,3 +1,62 @@
-# Import translators from the wilson package
+# Translators are registered when the modules defining them are imported.
+# Since this is expensive, it is only done by `load`, which is called on the
+# first lookup of a translator that is not registered yet:
+#
+# - modules declared in the `wcxf.translators` entry point group (see
+#   `wcxf.plugins`) are imported only for the keys they declare;
+# - the translators of the wilson package, which declares no entry points, are
+#   listed in `WILSON` and registered with a placeholder function that only
+#   imports `wilson.translate` when it is called (see `plugins.lazy_function`);
+# - for any other key, wilson is imported, since it might be provided by a
+#   wilson version newer than `WILSON` (`test_wcxf.py` checks `WILSON`
+#   against the translators registered by the installed wilson);
+# - if all translators are requested, all entry points and wilson are imported.
 
-import wilson
+from wcxf import plugins
+
+
+# keys of the translators defined in the module `wilson.translate`
+WILSON = [
+    ('SMEFT', 'Warsaw', 'Warsaw mass'),
+    ('SMEFT', 'Warsaw', 'Warsaw up'),
+    ('SMEFT', 'Warsaw up', 'Warsaw'),
+    ('WET', 'flavio', 'JMS'),
+    ('WET-4', 'flavio', 'JMS'),
+    ('WET-3', 'flavio', 'JMS'),
+    ('WET', 'JMS', 'flavio'),
+    ('WET-4', 'JMS', 'flavio'),
+    ('WET-3', 'JMS', 'flavio'),
+    ('WET', 'Bern', 'flavio'),
+    ('WET', 'flavio', 'Bern'),
+    ('WET-4', 'Bern', 'flavio'),
+    ('WET-4', 'flavio', 'Bern'),
+    ('WET-3', 'Bern', 'flavio'),
+    ('WET-3', 'flavio', 'Bern'),
+    ('WET', 'JMS', 'EOS'),
+    ('WET', 'JMS', 'Bern'),
+    ('WET-4', 'JMS', 'Bern'),
+    ('WET-3', 'JMS', 'Bern'),
+    ('WET', 'Bern', 'JMS'),
+    ('WET-4', 'Bern', 'JMS'),
+    ('WET-3', 'Bern', 'JMS'),
+    ('WET', 'JMS', 'formflavor'),
+    ('WET', 'FlavorKit', 'JMS'),
+    ('WET', 'JMS', 'FlavorKit'),
+    ('WET', 'FlavorKit', 'flavio'),
+]
+
+
+def load(key=None):
+    """Import the modules providing the translator with the key
+    `(eft, from_basis, to_basis)`, or all translators if `key` is None."""
+    if key is None:
+        plugins.load_all('wcxf.translators')
+        import wilson
+    elif plugins.load('wcxf.translators', key):
+        pass
+    elif tuple(key) in WILSON:
+        from wcxf.classes import Translator
+        key = tuple(key)
+        Translator(*key, plugins.lazy_function(Translator, key, 'wilson.translate'))
+    else:
+        import wilson